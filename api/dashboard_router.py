@@ -3,31 +3,33 @@
 """
 from fastapi import APIRouter, HTTPException
 
-from config import logger
+from core.logger import get_logger
 from api.schema.aggs_request import AggsRequest
 from api.schema.aggs_response import TotalCountResponse, AggsResponse
 from service.dashboard.aggs_service import AggsService
 
+logger = get_logger("search_api.api")
+
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 service = AggsService()
 
 
 @router.get("/total", response_model=TotalCountResponse)
-def get_total_count() -> TotalCountResponse:
+async def get_total_count() -> TotalCountResponse:
     """전체 회사 수 조회"""
     try:
         logger.info("[집계] 전체 회사 수 조회")
-        result = service.get_total_count()
-        logger.info(f"[집계] 전체 회사 수: {result.total}")
+        result = await service.get_total_count_async()
+        logger.info("[집계] 전체 회사 수: %s", result.total)
         return result
     except Exception as e:
-        logger.error(f"[집계] 오류: {e}")
+        logger.error("[집계] 오류: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/aggs", response_model=AggsResponse, response_model_exclude_none=True)
-def get_aggs(request: AggsRequest) -> AggsResponse:
+async def get_aggs(request: AggsRequest) -> AggsResponse:
     """
     집계 조회 (옵션에 따라 국가별/연도별 선택)
     
@@ -38,12 +40,13 @@ def get_aggs(request: AggsRequest) -> AggsResponse:
     """
     try:
         logger.info(
-            f"[집계] include_country={request.include_country}, "
-            f"include_year={request.include_year}"
+            "[집계] include_country=%s, include_year=%s",
+            request.include_country,
+            request.include_year
         )
-        result = service.get_aggs(request)
-        logger.info(f"[집계] 결과: total={result.total}")
+        result = await service.get_aggs_async(request)
+        logger.info("[집계] 결과: total=%s", result.total)
         return result
     except Exception as e:
-        logger.error(f"[집계] 오류: {e}")
+        logger.error("[집계] 오류: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,37 @@
+"""
+주가 API Router
+"""
+from fastapi import APIRouter, HTTPException
+
+from core.logger import get_logger
+from api.schema.price_request import PriceTicksRequest
+from api.schema.price_response import PriceTicksResponse
+from service.price.price_service import PriceUpdateService
+
+logger = get_logger("search_api.api")
+
+
+router = APIRouter(prefix="/prices", tags=["Prices"])
+service = PriceUpdateService()
+
+
+@router.post("/ticks", response_model=PriceTicksResponse)
+async def receive_ticks(request: PriceTicksRequest) -> PriceTicksResponse:
+    """
+    주가 틱 수신
+    
+    - 같은 회사의 틱은 병합하여 짧은 주기(PRICE_FLUSH_INTERVAL)마다 now_stock_price만 부분 업데이트
+    - 응답은 반영 전에 반환 (반영 지연은 /metrics의 search_api_price_update_lag_seconds)
+    """
+    try:
+        pending = service.submit(request.ticks)
+        return PriceTicksResponse(accepted=len(request.ticks), pending=pending)
+    except Exception as e:
+        logger.error("[주가] 오류: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def get_price_stats() -> dict:
+    """주가 반영 대기/반영 현황"""
+    return service.get_stats()
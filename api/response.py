@@ -0,0 +1,22 @@
+"""
+API 응답 클래스
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from core.metrics import stage_timer
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson 직렬화 응답
+    
+    - 라우터가 이 응답을 반환하면 FastAPI의 response_model 재검증을 건너뜀
+    - 서비스가 스키마 구조 그대로 만든 dict를 내보낼 때 사용 (기본 JSONResponse와 같은 compact UTF-8 JSON)
+    """
+    
+    def render(self, content: Any) -> bytes:
+        with stage_timer("serialize"):
+            return orjson.dumps(content)
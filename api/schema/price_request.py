@@ -0,0 +1,24 @@
+"""
+주가 틱 요청 스키마
+"""
+from typing import Optional, List
+from pydantic import BaseModel, Field
+
+
+class PriceTick(BaseModel):
+    """주가 틱 (회사 하나의 실시간 주가)"""
+    id: int = Field(description="회사 ID")
+    now_stock_price: float = Field(description="실시간 주가")
+    ts: Optional[float] = Field(
+        default=None,
+        description="틱 발생 시각 (epoch 초, 미지정 시 수신 시각)"
+    )
+
+
+class PriceTicksRequest(BaseModel):
+    """주가 틱 묶음"""
+    ticks: List[PriceTick] = Field(
+        min_length=1,
+        max_length=10000,
+        description="주가 틱 목록 (같은 id는 가장 최근 틱만 반영)"
+    )
@@ -0,0 +1,10 @@
+"""
+주가 틱 응답 스키마
+"""
+from pydantic import BaseModel, Field
+
+
+class PriceTicksResponse(BaseModel):
+    """주가 틱 수신 응답"""
+    accepted: int = Field(description="수신한 틱 수")
+    pending: int = Field(description="반영 대기 중인 회사 수")
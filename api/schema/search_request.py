@@ -1,7 +1,7 @@
 """
 검색 요청 스키마
 """
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, get_args
 from pydantic import BaseModel, Field
 
 
@@ -40,9 +40,83 @@ class OrderSchema(BaseModel):
     sortOrder: Literal["asc", "desc"] = Field(default="asc", description="정렬 순서")
 
 
+# 응답에서 선택 가능한 회사 필드 (id는 항상 포함)
+CompanyField = Literal[
+    "company_name",
+    "founded_date",
+    "country",
+    "company_type",
+    "last_week_stock_price",
+    "now_stock_price",
+    "main_pipeline"
+]
+
+
 class SearchRequest(BaseModel):
     """검색 요청 스키마"""
     page: int = Field(default=1, ge=1, description="페이지 번호")
     size: int = Field(default=20, ge=1, le=100, description="페이지당 개수")
     filter: Optional[FilterSchema] = Field(default=None, description="필터")
     order: Optional[List[OrderSchema]] = Field(default=[], description="정렬")
+    pagination: Literal["page", "cursor"] = Field(
+        default="page",
+        description="페이지네이션 방식: page(from/size), cursor(search_after + PIT)"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="커서 (이전 응답의 next_cursor, 지정 시 cursor 모드)"
+    )
+    
+    fields: Optional[List[CompanyField]] = Field(
+        default=None,
+        description="응답에 포함할 필드 (미지정 시 전체, id는 항상 포함)"
+    )
+    compact: bool = Field(
+        default=False,
+        description="main_pipeline 제외 (목록 화면용)"
+    )
+    facets: bool = Field(
+        default=False,
+        description="국가/회사 분류/파이프라인 단계별 회사 수 포함 (각 패싯은 자기 필터 제외)"
+    )
+    track_total_hits: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=1000000,
+        description="정확히 셀 최대 결과 수 (미지정 시 서버 설정, 넘으면 total은 하한값이고 total_relation=gte)"
+    )
+    
+    def is_cursor_mode(self) -> bool:
+        """커서 페이지네이션 여부"""
+        return self.pagination == "cursor" or self.cursor is not None
+    
+    def get_source_fields(self) -> Optional[List[str]]:
+        """응답에 포함할 필드 목록 (None이면 전체)"""
+        if self.fields is None and not self.compact:
+            return None
+        
+        fields = ["id"]
+        selected = self.fields if self.fields is not None else list(get_args(CompanyField))
+        for name in selected:
+            if name not in fields and not (self.compact and name == "main_pipeline"):
+                fields.append(name)
+        return fields
+
+
+class SearchBatchRequest(BaseModel):
+    """배치 검색 요청 (여러 검색을 한 번에, page 모드만)"""
+    requests: List[SearchRequest] = Field(
+        min_length=1,
+        max_length=20,
+        description="검색 요청 목록 (응답은 같은 순서)"
+    )
+
+
+class SuggestRequest(BaseModel):
+    """자동완성 요청 (검색창 입력 중 접두어 조회)"""
+    type: Literal["company_name", "drug_name", "indication"] = Field(
+        default="company_name",
+        description="자동완성 대상: company_name, drug_name, indication"
+    )
+    prefix: str = Field(min_length=1, max_length=50, description="입력 중인 접두어 (단어별 접두어 일치)")
+    size: int = Field(default=10, ge=1, le=20, description="최대 후보 수")
@@ -1,7 +1,7 @@
 """
 검색 응답 스키마
 """
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from pydantic import BaseModel, Field
 
 
@@ -13,22 +13,69 @@ class PipelineInfo(BaseModel):
 
 
 class CompanyData(BaseModel):
-    """회사 데이터"""
+    """
+    회사 데이터
+    
+    - 요청에서 fields/compact로 선택하지 않은 필드는 응답에서 빠짐
+    """
     id: int = Field(description="회사 ID")
-    company_name: str = Field(description="회사명")
+    company_name: Optional[str] = Field(None, description="회사명")
     founded_date: Optional[str] = Field(None, description="설립일 (yyyy.MM.dd)")
-    country: str = Field(description="국가")
-    company_type: str = Field(description="회사 분류")
-    last_week_stock_price: float = Field(description="지난주 주가")
-    now_stock_price: float = Field(description="실시간 주가")
+    country: Optional[str] = Field(None, description="국가")
+    company_type: Optional[str] = Field(None, description="회사 분류")
+    last_week_stock_price: Optional[float] = Field(None, description="지난주 주가")
+    now_stock_price: Optional[float] = Field(None, description="실시간 주가")
     main_pipeline: List[PipelineInfo] = Field(default=[], description="주요 파이프라인")
 
 
+class FacetBucket(BaseModel):
+    """패싯 값별 회사 수"""
+    value: str = Field(description="값")
+    count: int = Field(description="회사 수")
+
+
 class SearchResponse(BaseModel):
     """검색 응답 스키마"""
     page: int = Field(description="현재 페이지")
     size: int = Field(description="페이지당 개수")
-    totalPages: int = Field(description="전체 페이지 수")
-    total: int = Field(description="전체 검색 결과 수")
+    totalPages: int = Field(description="전체 페이지 수 (total_relation=gte면 하한값)")
+    total: int = Field(description="전체 검색 결과 수 (total_relation=gte면 하한값)")
+    total_relation: Literal["eq", "gte"] = Field(
+        default="eq",
+        description="total 정확도: eq(정확), gte(track_total_hits를 넘어 하한값, 예: 10,000+)"
+    )
     data: List[CompanyData] = Field(description="회사 데이터 리스트")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="다음 페이지 커서 (cursor 모드, 마지막 페이지면 null)"
+    )
+    facets: Optional[Dict[str, List[FacetBucket]]] = Field(
+        default=None,
+        description="패싯 (facets 요청 시 country/company_type/stage, 커서 모드는 첫 페이지만)"
+    )
+
+
+class SearchBatchItem(BaseModel):
+    """배치 검색 항목 결과"""
+    status: int = Field(description="항목 상태 코드 (200 성공)")
+    response: Optional[SearchResponse] = Field(default=None, description="검색 응답 (실패 시 null)")
+    error: Optional[str] = Field(default=None, description="오류 내용 (성공 시 null)")
+
+
+class SearchBatchResponse(BaseModel):
+    """배치 검색 응답"""
+    responses: List[SearchBatchItem] = Field(description="요청 순서대로 항목 결과")
+
+
+class SuggestItem(BaseModel):
+    """자동완성 후보"""
+    text: str = Field(description="표시 문자열")
+    id: Optional[int] = Field(default=None, description="회사 ID (company_name 자동완성)")
+    count: Optional[int] = Field(default=None, description="해당 값을 가진 파이프라인 수 (drug_name/indication 자동완성)")
+
 
+class SuggestResponse(BaseModel):
+    """자동완성 응답"""
+    type: str = Field(description="자동완성 대상")
+    prefix: str = Field(description="요청 접두어")
+    suggestions: List[SuggestItem] = Field(description="후보 목록 (관련도 순)")
@@ -1,40 +1,106 @@
 """
 검색 API Router
 """
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
 
-from config import logger
-from api.schema.search_request import SearchRequest
-from api.schema.search_response import SearchResponse
+from fastapi import APIRouter, HTTPException, Query
+
+from core.logger import get_logger
+from core.opensearch import PitExpiredError, PitLimitError
+from api.schema.search_request import SearchRequest, SearchBatchRequest, SuggestRequest
+from api.schema.search_response import SearchResponse, SearchBatchResponse, SuggestResponse
+from api.response import FastJSONResponse
 from service.search.search_service import SearchService
+from service.search.suggest_service import SuggestService
+
+logger = get_logger("search_api.api")
 
 
 router = APIRouter(prefix="/search", tags=["Search"])
 service = SearchService()
+suggest_service = SuggestService()
 
 
-@router.post("/companies", response_model=SearchResponse)
-def search_companies(request: SearchRequest) -> SearchResponse:
+@router.post("/companies", response_model=SearchResponse, response_class=FastJSONResponse)
+async def search_companies(request: SearchRequest):
     """
     회사 검색 API
     
     - 일반 검색: 회사명, 약물명, 적응증
     - 필터: 국가, 회사 분류, 파이프라인 단계
     - 정렬: 회사명, 주가
+    - 필드 선택: fields(포함할 필드), compact(main_pipeline 제외)
+    - 커서 모드: 커서는 마지막 요청 후 1분 동안 유효
+      만료된 커서는 410, 열린 커서가 너무 많으면 429 (둘 다 첫 페이지부터 다시 요청)
     """
     try:
-        logger.info(f"[검색] page={request.page}, size={request.size}")
+        logger.info("[검색] page=%s, size=%s", request.page, request.size)
         
         if request.filter and request.filter.search:
             logger.info(
-                f"[검색] type={request.filter.search.type}, "
-                f"keyword={request.filter.search.keyword}"
+                "[검색] type=%s, keyword=%s",
+                request.filter.search.type,
+                request.filter.search.keyword
             )
         
-        result = service.search(request)
-        logger.info(f"[검색] 결과: total={result.total}")
+        result = await service.search_async(request)
+        logger.info("[검색] 결과: total=%s", result['total'])
         
-        return result
+        # 서비스가 스키마 구조로 만든 dict를 재검증 없이 직렬화
+        return FastJSONResponse(result)
+    except PitExpiredError as e:
+        logger.info("[검색] 커서 만료: %s", e)
+        raise HTTPException(status_code=410, detail=str(e))
+    except PitLimitError as e:
+        logger.warning("[검색] 커서 수 제한: %s", e)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "60"})
+    except ValueError as e:
+        logger.warning("[검색] 잘못된 요청: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("[검색] 오류: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/companies/batch", response_model=SearchBatchResponse, response_class=FastJSONResponse)
+async def search_companies_batch(request: SearchBatchRequest):
+    """
+    회사 배치 검색 API (화면의 여러 패널을 한 번에)
+    
+    - 요청마다 /search/companies와 같은 검색을 _msearch 한 번으로 실행
+    - 항목별 status/response/error (한 항목이 실패해도 나머지는 응답)
+    - page 모드만 지원 (cursor 모드 항목은 400 오류)
+    """
+    try:
+        logger.info("[검색] 배치: %s건", len(request.requests))
+        items = await service.search_batch_async(request.requests)
+        return FastJSONResponse({"responses": items})
+    except ValueError as e:
+        logger.warning("[검색] 잘못된 요청: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"[검색] 오류: {e}")
+        logger.error("[검색] 오류: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/suggest", response_model=SuggestResponse, response_class=FastJSONResponse)
+async def suggest(request: Annotated[SuggestRequest, Query()]):
+    """
+    자동완성 API (검색창 입력 중 호출)
+    
+    - company_name: 회사 id + 회사명
+    - drug_name/indication: 약물명/적응증 + 해당 파이프라인 수
+    - 문서 본문(_source) 없이 접두어 필드만 조회하고, 같은 접두어는 짧게 캐시
+    """
+    try:
+        result = await suggest_service.suggest_async(request)
+        return FastJSONResponse(result)
+    except Exception as e:
+        logger.error("[자동완성] 오류: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> dict:
+    """검색 결과 캐시 통계 (hit/miss/eviction)"""
+    return {**service.get_cache_stats(), "suggest": suggest_service.get_cache_stats()}
@@ -0,0 +1,139 @@
+"""
+API 핫패스 마이크로 벤치마크 (opensearch 없이 실행)
+
+- SearchRepository.build_query
+- SearchService.transform_response (20~100 hits, 긴 main_pipeline)
+- AggsService.transform_year_aggs
+- 메모리 인덱스 검색/집계 (SEARCH_BACKEND=memory, 합성 문서)
+
+사용법:
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --hits 20 50 100 --pipelines 30 --repeat 500 --output micro.json
+"""
+import argparse
+import json
+import statistics
+import time
+
+from api.schema.search_request import SearchRequest
+from config import OPENSEARCH_MAPPINGS
+from core.memory_index import Analyzer, ColumnarIndex
+from repository.aggs_repository import AggsRepository
+from repository.search_repository import SearchRepository, get_search_options
+from service.dashboard.aggs_service import AggsService
+from service.search.search_service import SearchService
+from benchmarks.payloads import make_source, make_search_result, make_aggs_result, make_search_requests
+from benchmarks.report import write_report
+
+
+def measure(func, repeat: int, rounds: int = 5) -> dict:
+    """rounds번 반복 측정한 1회 실행 시간 (중앙값/최소, 마이크로초)"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        samples.append((time.perf_counter() - start) / repeat * 1e6)
+    return {
+        "median_us": round(statistics.median(samples), 2),
+        "min_us": round(min(samples), 2)
+    }
+
+
+def bench_build_query(repeat: int) -> list:
+    """요청 구성별 쿼리 빌드"""
+    repository = SearchRepository.__new__(SearchRepository)
+    repository.options = get_search_options()
+    requests = [SearchRequest(**r) for r in make_search_requests(200)]
+    result = measure(lambda: [repository.build_query(r) for r in requests], max(repeat // 20, 1))
+    return [{
+        "name": "search.build_query",
+        "requests": len(requests),
+        "median_us": round(result["median_us"] / len(requests), 2),
+        "min_us": round(result["min_us"] / len(requests), 2)
+    }]
+
+
+def bench_transform_response(hit_counts, pipelines: int, repeat: int) -> list:
+    """검색 응답 변환"""
+    service = SearchService.__new__(SearchService)
+    results = []
+    for hits in hit_counts:
+        result = make_search_result(hits, pipelines)
+        request = SearchRequest(size=hits)
+        measured = measure(lambda: service.transform_response(result, request), repeat)
+        results.append({
+            "name": "search.transform_response",
+            "hits": hits,
+            "pipelines_per_hit": pipelines,
+            **measured,
+            "us_per_hit": round(measured["median_us"] / hits, 2)
+        })
+    return results
+
+
+def bench_transform_year_aggs(repeat: int) -> list:
+    """연도별 집계 변환"""
+    service = AggsService.__new__(AggsService)
+    result = make_aggs_result()
+    years = len(result["aggregations"]["by_founded_year"]["buckets"])
+    return [{
+        "name": "aggs.transform_year_aggs",
+        "years": years,
+        **measure(lambda: service.transform_year_aggs(result), repeat)
+    }]
+
+
+def bench_memory_index(docs: int, pipelines: int, repeat: int) -> list:
+    """메모리 인덱스 검색(요청 구성별)과 집계"""
+    with open(OPENSEARCH_MAPPINGS, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)['companies']
+    start = time.perf_counter()
+    index = ColumnarIndex(
+        'companies',
+        [(i, make_source(i, pipelines)) for i in range(docs)],
+        mappings,
+        Analyzer()
+    )
+    build_ms = round((time.perf_counter() - start) * 1000, 1)
+    
+    repository = SearchRepository.__new__(SearchRepository)
+    repository.options = get_search_options()
+    queries = [repository.build_query(SearchRequest(**r)) for r in make_search_requests(200)]
+    search = measure(lambda: [index.search(q) for q in queries], max(repeat // 20, 1))
+    aggs_query = AggsRepository.__new__(AggsRepository).build_query(True, True)
+    return [
+        {
+            "name": "memory.search",
+            "docs": docs,
+            "build_ms": build_ms,
+            "median_us": round(search["median_us"] / len(queries), 2),
+            "min_us": round(search["min_us"] / len(queries), 2)
+        },
+        {
+            "name": "memory.aggs",
+            "docs": docs,
+            **measure(lambda: index.search(aggs_query), repeat)
+        }
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 핫패스 마이크로 벤치마크")
+    parser.add_argument("--hits", type=int, nargs="+", default=[20, 50, 100])
+    parser.add_argument("--pipelines", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--docs", type=int, default=5000, help="메모리 인덱스 합성 문서 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    
+    results = []
+    results += bench_build_query(args.repeat)
+    results += bench_transform_response(args.hits, args.pipelines, args.repeat)
+    results += bench_transform_year_aggs(args.repeat)
+    results += bench_memory_index(args.docs, args.pipelines, args.repeat)
+    write_report("micro", results, vars(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+검색 응답 직렬화 벤치마크 (Pydantic 검증 2회 경로 vs dict + orjson 경로)
+
+사용법:
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --hits 20 100 --pipelines 10 --repeat 200 --output result.json
+"""
+import argparse
+import json
+import time
+
+from api.response import FastJSONResponse
+from api.schema.search_request import SearchRequest
+from api.schema.search_response import SearchResponse, CompanyData, PipelineInfo
+from service.search.search_service import SearchService
+from benchmarks.payloads import make_search_result
+from benchmarks.report import write_report
+
+
+def legacy_render(result: dict, request: SearchRequest) -> bytes:
+    """
+    기존 경로: 검증하며 모델 생성 → response_model 재검증 → dict → json.dumps
+    """
+    hits = result['hits']
+    data = [
+        CompanyData(
+            id=h['_source'].get('id', 0),
+            company_name=h['_source'].get('company_name', ''),
+            founded_date=h['_source'].get('founded_date'),
+            country=h['_source'].get('country', ''),
+            company_type=h['_source'].get('company_type', ''),
+            last_week_stock_price=h['_source'].get('last_week_stock_price', 0.0),
+            now_stock_price=h['_source'].get('now_stock_price', 0.0),
+            main_pipeline=[
+                PipelineInfo(
+                    drug_name=p.get('drug_name', ''),
+                    indication=p.get('indication', ''),
+                    stage=p.get('stage', '')
+                )
+                for p in h['_source'].get('main_pipeline', [])
+            ]
+        )
+        for h in hits['hits']
+    ]
+    total = hits['total']['value']
+    response = SearchResponse(
+        page=request.page,
+        size=request.size,
+        totalPages=-(-total // request.size),
+        total=total,
+        data=data,
+        next_cursor=None
+    )
+    # FastAPI response_model 재검증 + 직렬화
+    validated = SearchResponse.model_validate(response.model_dump())
+    content = validated.model_dump(mode='json', exclude_unset=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode('utf-8')
+
+
+def fast_render(service: SearchService, result: dict, request: SearchRequest) -> bytes:
+    """현재 경로: 스키마 구조 dict → FastJSONResponse(orjson)"""
+    response = service.transform_response(result, request)
+    return FastJSONResponse(response).body
+
+
+def measure(func, repeat: int) -> float:
+    """1회 평균 실행 시간(초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(hit_counts, pipelines: int, repeat: int) -> list:
+    """벤치마크 실행"""
+    service = SearchService.__new__(SearchService)
+    results = []
+    for hits in hit_counts:
+        result = make_search_result(hits, pipelines)
+        request = SearchRequest(size=hits)
+        
+        # 응답 바이트가 동일해야 함
+        if legacy_render(result, request) != fast_render(service, result, request):
+            raise AssertionError("직렬화 결과가 기존 경로와 다릅니다.")
+        
+        legacy = measure(lambda: legacy_render(result, request), repeat)
+        fast = measure(lambda: fast_render(service, result, request), repeat)
+        results.append({
+            "hits": hits,
+            "pipelines_per_hit": pipelines,
+            "legacy_us_per_hit": round(legacy / hits * 1e6, 2),
+            "fast_us_per_hit": round(fast / hits * 1e6, 2),
+            "speedup": round(legacy / fast, 2)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 응답 직렬화 벤치마크")
+    parser.add_argument("--hits", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--pipelines", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    
+    results = run(args.hits, args.pipelines, args.repeat)
+    write_report("serialization", results, vars(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+opensearch ↔ 메모리 인덱스 결과 비교 (SEARCH_BACKEND=memory 전환 전 확인용)
+
+같은 요청 구성으로 두 백엔드를 호출하여 total, 결과 id 순서, 집계 버킷을 비교
+- 점수 정렬(검색어)은 샤드별 통계 차이로 동점 근처 순서가 다를 수 있어 id 집합도 함께 기록
+
+사용법:
+    python -m benchmarks.compare_backends --requests 200 --output compare.json
+"""
+import argparse
+
+from api.schema.search_request import SearchRequest
+from core.memory_client import MemorySearchClient
+from core.opensearch import get_opensearch_client
+from repository.aggs_repository import AggsRepository
+from repository.search_repository import SearchRepository
+from benchmarks.payloads import make_search_requests
+from benchmarks.report import write_report
+
+
+def hit_ids(result: dict) -> list:
+    """결과 문서 id 순서"""
+    return [hit['_id'] for hit in result['hits']['hits']]
+
+
+def compare_search(os_client, memory, index_name: str, bodies: list) -> list:
+    """검색 요청별 비교 (일치하지 않는 요청만 반환)"""
+    repository = SearchRepository.__new__(SearchRepository)
+    mismatches = []
+    for body in bodies:
+        query = repository.build_query(SearchRequest(**body))
+        expected = os_client.search(index_name, query)
+        actual = memory.search(index_name, query)
+        
+        expected_ids, actual_ids = hit_ids(expected), hit_ids(actual)
+        same_total = expected['hits']['total'] == actual['hits']['total']
+        if same_total and expected_ids == actual_ids:
+            continue
+        mismatches.append({
+            "request": body,
+            "total": [expected['hits']['total'], actual['hits']['total']],
+            "same_ids": sorted(expected_ids) == sorted(actual_ids),
+            "expected_ids": expected_ids,
+            "actual_ids": actual_ids
+        })
+    return mismatches
+
+
+def compare_aggs(os_client, memory, index_name: str) -> list:
+    """집계 비교 (버킷 키/문서 수, 평균은 소수 6자리)"""
+    query = AggsRepository.__new__(AggsRepository).build_query(True, True)
+    expected = os_client.search(index_name, query)['aggregations']
+    actual = memory.search(index_name, query)['aggregations']
+    
+    def normalize(aggs: dict) -> dict:
+        return {
+            "country": [
+                (b['key'], b['doc_count'], round(b['avg_last_week_stock']['value'] or 0, 6))
+                for b in aggs['by_country']['buckets']
+            ],
+            "year": [
+                (b['key_as_string'], b['doc_count'],
+                 [(t['key'], t['doc_count']) for t in b['company_type_distribution']['buckets']])
+                for b in aggs['by_founded_year']['buckets']
+            ]
+        }
+    
+    expected, actual = normalize(expected), normalize(actual)
+    return [
+        {"aggregation": name, "expected": expected[name], "actual": actual[name]}
+        for name in expected
+        if expected[name] != actual[name]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="opensearch ↔ 메모리 인덱스 결과 비교")
+    parser.add_argument("--index", default="companies")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    
+    os_client = get_opensearch_client()
+    memory = MemorySearchClient(args.index, source='opensearch')
+    memory.load()
+    
+    bodies = make_search_requests(args.requests, args.seed)
+    search_mismatches = compare_search(os_client, memory, args.index, bodies)
+    aggs_mismatches = compare_aggs(os_client, memory, args.index)
+    
+    write_report("compare_backends", {
+        "requests": len(bodies),
+        "search_mismatches": len(search_mismatches),
+        "search_order_only": sum(1 for m in search_mismatches if m["same_ids"] and m["total"][0] == m["total"][1]),
+        "aggs_mismatches": len(aggs_mismatches),
+        "details": search_mismatches + aggs_mismatches
+    }, vars(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
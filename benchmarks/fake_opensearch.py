@@ -0,0 +1,150 @@
+"""
+벤치마크용 opensearch 대역 서버 (HTTP, 고정 지연)
+
+클러스터 없이 API 전체 경로(라우터 → 서비스 → 리포지토리 → 클라이언트)를 측정하기 위해
+검색/집계/count/PIT 요청에 합성 응답을 돌려줌 (_bulk는 모든 항목을 성공으로 응답, _msearch는 검색마다 같은 합성 응답)
+
+사용법:
+    python -m benchmarks.fake_opensearch --port 9299 --latency-ms 5
+"""
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.payloads import make_search_result, make_aggs_result
+
+# 응답 캐시 (size별로 한 번만 생성)
+_search_bodies = {}
+_aggs_body = None
+
+
+def search_body(size: int, pipelines: int, total: int) -> bytes:
+    """size개 hit의 검색 응답"""
+    body = _search_bodies.get(size)
+    if body is None:
+        body = _search_bodies[size] = json.dumps(
+            make_search_result(size, pipelines, total), ensure_ascii=False
+        ).encode('utf-8')
+    return body
+
+
+def aggs_body() -> bytes:
+    """집계 응답"""
+    global _aggs_body
+    if _aggs_body is None:
+        _aggs_body = json.dumps(make_aggs_result(), ensure_ascii=False).encode('utf-8')
+    return _aggs_body
+
+
+class FakeOpenSearchHandler(BaseHTTPRequestHandler):
+    """opensearch REST API 중 API 서버가 쓰는 엔드포인트만 흉내냄"""
+    
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    pipelines = 5
+    total = 10000
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def read_raw(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+    
+    def bulk_body(self, raw: bytes) -> bytes:
+        """_bulk 응답 (액션 줄마다 성공 항목)"""
+        items = []
+        lines = [line for line in raw.splitlines() if line.strip()]
+        i = 0
+        while i < len(lines):
+            (op, meta), = json.loads(lines[i]).items()
+            items.append({op: {"_index": meta.get('_index'), "_id": str(meta.get('_id')), "status": 200, "result": "updated"}})
+            i += 1 if op == 'delete' else 2
+        return json.dumps({"took": 1, "errors": False, "items": items}).encode('utf-8')
+    
+    def reply(self, body: bytes, status: int = 200):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def search_result(self, request: dict) -> bytes:
+        """검색/집계 응답"""
+        if 'aggs' in request or 'aggregations' in request:
+            return aggs_body()
+        size = min(int(request.get('size', 10)), 100)
+        return search_body(size, self.pipelines, self.total)
+    
+    def msearch_body(self, raw: bytes) -> bytes:
+        """_msearch 응답 (헤더 + 쿼리 줄마다 검색 응답)"""
+        lines = [line for line in raw.splitlines() if line.strip()]
+        responses = [self.search_result(json.loads(query)) for query in lines[1::2]]
+        return b'{"took":1,"responses":[' + b','.join(responses) + b']}'
+    
+    def route(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        raw = self.read_raw()
+        if path.endswith('/_bulk'):
+            return self.reply(self.bulk_body(raw))
+        if path.endswith('/_msearch'):
+            return self.reply(self.msearch_body(raw))
+        request = json.loads(raw) if raw else {}
+        
+        if path == '':
+            return self.reply(json.dumps({
+                "name": "fake-node",
+                "cluster_name": "benchmark",
+                "version": {"distribution": "opensearch", "number": "2.11.0"}
+            }).encode('utf-8'))
+        if path.endswith('/_search/point_in_time'):
+            if self.command == 'DELETE':
+                return self.reply(b'{"pits":[]}')
+            return self.reply(json.dumps({
+                "pit_id": f"pit-{time.monotonic_ns()}",
+                "creation_time": int(time.time() * 1000)
+            }).encode('utf-8'))
+        if path.endswith('/_count'):
+            return self.reply(json.dumps({"count": self.total}).encode('utf-8'))
+        if path.endswith('/_search'):
+            return self.reply(self.search_result(request))
+        return self.reply(b'{"error":"not found"}', status=404)
+    
+    do_GET = do_POST = do_HEAD = do_DELETE = route
+
+
+def create_server(host: str, port: int, latency_ms: float, pipelines: int = 5) -> ThreadingHTTPServer:
+    """대역 서버 생성 (serve_forever는 호출하는 쪽에서)"""
+    handler = type('Handler', (FakeOpenSearchHandler,), {
+        'latency': latency_ms / 1000,
+        'pipelines': pipelines
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 opensearch 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9299)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="응답마다 추가할 지연(ms)")
+    parser.add_argument("--pipelines", type=int, default=5, help="문서당 main_pipeline 개수")
+    args = parser.parse_args()
+    
+    server = create_server(args.host, args.port, args.latency_ms, args.pipelines)
+    print(f"fake opensearch: http://{args.host}:{args.port} (latency {args.latency_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+API 부하 테스트 (엔드투엔드)
+
+검색/대시보드 요청을 섞어 동시 요청을 보내고 엔드포인트별 처리량과 p50/p95/p99 지연 시간을 기록
+
+사용법:
+    # 실행 중인 API 서버 대상
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 32 --duration 30
+    
+    # opensearch 대역 서버 + API 서버를 직접 띄워서 측정 (클러스터 불필요)
+    python -m benchmarks.load_test --with-standin --latency-ms 5 --workers 2 --output load.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import aiohttp
+
+from benchmarks.fake_opensearch import create_server
+from benchmarks.payloads import make_search_requests
+from benchmarks.report import write_report
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# (이름, 메서드, 경로, 비중)
+ENDPOINTS = [
+    ("search", "POST", "/search/companies", 0.8),
+    ("dashboard_aggs", "POST", "/dashboard/aggs", 0.1),
+    ("dashboard_total", "GET", "/dashboard/total", 0.1)
+]
+
+
+def percentile(values: list, p: float) -> float:
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not values:
+        return 0.0
+    index = max(int(round(p / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def summarize(name: str, latencies: list, errors: int, elapsed: float) -> dict:
+    """엔드포인트별 결과 요약 (지연 시간 ms)"""
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0
+    }
+
+
+async def worker(session, base_url: str, deadline: float, rng: random.Random,
+                 bodies: dict, latencies: dict, errors: dict):
+    """deadline까지 요청 반복"""
+    names = [e[0] for e in ENDPOINTS]
+    weights = [e[3] for e in ENDPOINTS]
+    routes = {e[0]: (e[1], e[2]) for e in ENDPOINTS}
+    
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path = routes[name]
+        kwargs = {"json": rng.choice(bodies[name])} if method == "POST" else {}
+        start = time.perf_counter()
+        try:
+            async with session.request(method, base_url + path, **kwargs) as response:
+                await response.read()
+                ok = response.status == 200
+        except aiohttp.ClientError:
+            ok = False
+        if ok:
+            latencies[name].append(time.perf_counter() - start)
+        else:
+            errors[name] += 1
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, warmup: float, seed: int) -> list:
+    """동시 요청 실행 후 엔드포인트별 요약 반환"""
+    bodies = {
+        "search": make_search_requests(1000, seed),
+        "dashboard_aggs": [
+            {"include_country": True, "include_year": True},
+            {"include_country": True, "include_year": False},
+            {"include_country": False, "include_year": True}
+        ]
+    }
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def phase(seconds: float) -> tuple:
+            latencies = {e[0]: [] for e in ENDPOINTS}
+            errors = {e[0]: 0 for e in ENDPOINTS}
+            deadline = time.perf_counter() + seconds
+            await asyncio.gather(*[
+                worker(session, base_url, deadline, random.Random(seed + i), bodies, latencies, errors)
+                for i in range(concurrency)
+            ])
+            return latencies, errors
+        
+        if warmup > 0:
+            await phase(warmup)
+        start = time.perf_counter()
+        latencies, errors = await phase(duration)
+        elapsed = time.perf_counter() - start
+    
+    results = [summarize(name, latencies[name], errors[name], elapsed) for name in latencies]
+    results.append(summarize("all", sum(latencies.values(), []), sum(errors.values()), elapsed))
+    return results
+
+
+def start_standin(args) -> tuple:
+    """opensearch 대역 서버 + API 서버(uvicorn) 실행"""
+    server = create_server("127.0.0.1", args.standin_port, args.latency_ms, args.pipelines)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    env = dict(
+        os.environ,
+        OPENSEARCH_HOST="127.0.0.1",
+        OPENSEARCH_PORT=str(args.standin_port),
+        OPENSEARCH_HOSTS="",
+        OPENSEARCH_USE_SSL="false",
+        OPENSEARCH_PASSWORD=os.getenv("OPENSEARCH_PASSWORD", "benchmark"),
+        OPENSEARCH_SNIFF="false"
+    )
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(args.api_port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT_DIR, env=env
+    )
+    return server, api
+
+
+async def wait_ready(base_url: str, timeout: float = 30):
+    """API 서버 응답 대기"""
+    deadline = time.perf_counter() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.perf_counter() < deadline:
+            try:
+                async with session.get(base_url + "/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"API 서버가 응답하지 않음: {base_url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8000", help="API 서버 주소")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=3, help="워밍업 시간(초, 결과 제외)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--with-standin", action="store_true", help="opensearch 대역 + API 서버를 직접 실행")
+    parser.add_argument("--standin-port", type=int, default=9299)
+    parser.add_argument("--api-port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="대역 서버 응답 지연(ms)")
+    parser.add_argument("--pipelines", type=int, default=5, help="대역 서버 문서당 main_pipeline 개수")
+    parser.add_argument("--workers", type=int, default=1, help="API 서버 워커 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    
+    server = api = None
+    base_url = args.url.rstrip('/')
+    if args.with_standin:
+        server, api = start_standin(args)
+        base_url = f"http://127.0.0.1:{args.api_port}"
+    
+    try:
+        asyncio.run(wait_ready(base_url))
+        results = asyncio.run(run_load(base_url, args.concurrency, args.duration, args.warmup, args.seed))
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+    
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    write_report("load", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
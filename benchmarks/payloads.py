@@ -0,0 +1,112 @@
+"""
+벤치마크용 합성 데이터 (opensearch 응답 형태)
+"""
+import random
+
+COUNTRIES = ["대한민국", "미국", "중국", "일본", "독일", "영국", "스위스", "프랑스"]
+COMPANY_TYPES = ["Biotech", "Pharma", "CRO", "CDMO", "Medtech"]
+STAGES = ["Preclinical", "Phase 1", "Phase 2", "Phase 3", "Approved"]
+INDICATIONS = ["Osteoporosis", "Atrial Fibrillation", "NSCLC", "Alzheimer's Disease", "Obesity"]
+
+
+def make_source(i: int, pipelines: int) -> dict:
+    """합성 회사 문서"""
+    return {
+        "id": i,
+        "company_name": f"바이오 컴퍼니 {i}",
+        "founded_date": f"{1990 + i % 35}.03.15",
+        "country": COUNTRIES[i % len(COUNTRIES)],
+        "company_type": COMPANY_TYPES[i % len(COMPANY_TYPES)],
+        "last_week_stock_price": 1234.5 + i,
+        "now_stock_price": 1240.25 + i,
+        "main_pipeline": [
+            {
+                "drug_name": f"ZL-{i}{j}",
+                "indication": INDICATIONS[(i + j) % len(INDICATIONS)],
+                "stage": STAGES[(i + j) % len(STAGES)]
+            }
+            for j in range(pipelines)
+        ]
+    }
+
+
+def make_search_result(hits: int, pipelines: int, total: int = None) -> dict:
+    """합성 검색 응답"""
+    return {
+        "took": 3,
+        "hits": {
+            "total": {"value": total if total is not None else hits * 10, "relation": "eq"},
+            "hits": [
+                {
+                    "_id": str(i),
+                    "_source": make_source(i, pipelines),
+                    "sort": [f"바이오 컴퍼니 {i}", i]
+                }
+                for i in range(hits)
+            ]
+        }
+    }
+
+
+def make_aggs_result(countries: int = len(COUNTRIES), years: int = 35) -> dict:
+    """합성 집계 응답 (국가별 + 연도별)"""
+    return {
+        "took": 5,
+        "hits": {"total": {"value": 10000, "relation": "eq"}, "hits": []},
+        "aggregations": {
+            "by_country": {
+                "buckets": [
+                    {
+                        "key": COUNTRIES[i % len(COUNTRIES)],
+                        "doc_count": 1000 - i,
+                        "avg_last_week_stock": {"value": 1234.567 + i}
+                    }
+                    for i in range(countries)
+                ]
+            },
+            "by_founded_year": {
+                "buckets": [
+                    {
+                        "key_as_string": str(1990 + y),
+                        "doc_count": 300 - y,
+                        "company_type_distribution": {
+                            "buckets": [
+                                {"key": t, "doc_count": 60 - y}
+                                for t in COMPANY_TYPES
+                            ]
+                        }
+                    }
+                    for y in range(years)
+                ]
+            }
+        }
+    }
+
+
+def make_search_requests(count: int, seed: int = 0) -> list:
+    """
+    현실적인 검색 요청 구성
+    
+    - 절반은 기본 목록 첫 페이지, 나머지는 필터/검색어/정렬/페이지 조합
+    """
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.5:
+            requests.append({"page": 1, "size": 20})
+            continue
+        request = {"page": rng.choice([1, 1, 2, 3, 5]), "size": rng.choice([20, 50, 100]), "filter": {}}
+        if roll < 0.7:
+            request["filter"]["country"] = rng.sample(COUNTRIES, rng.randint(1, 3))
+        if roll < 0.8:
+            request["filter"]["stage"] = rng.sample(STAGES, rng.randint(1, 2))
+        if roll >= 0.8:
+            request["filter"]["search"] = {
+                "type": rng.choice(["company_name", "drug_name", "indication"]),
+                "keyword": rng.choice(INDICATIONS + ["바이오", "ZL"])
+            }
+        if rng.random() < 0.3:
+            request["order"] = [{"sortBy": "now_stock_price", "sortOrder": "desc"}]
+        requests.append(request)
+    return requests
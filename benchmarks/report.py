@@ -0,0 +1,45 @@
+"""
+벤치마크 결과 출력 (커밋 간 비교용 JSON)
+"""
+import json
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def get_commit() -> str:
+    """현재 git 커밋 (없으면 unknown)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(benchmark: str, results, params: dict = None, output: str = None) -> dict:
+    """
+    결과를 JSON으로 출력 (output 지정 시 파일에도 저장)
+    
+    :param benchmark: 벤치마크 이름
+    :param results: 측정 결과
+    :param params: 실행 파라미터
+    :param output: 저장할 파일 경로
+    """
+    report = {
+        "benchmark": benchmark,
+        "commit": get_commit(),
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "params": params or {},
+        "results": results
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if output:
+        Path(output).write_text(text + "\n", encoding='utf-8')
+    return report
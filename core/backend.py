@@ -0,0 +1,37 @@
+"""
+검색 백엔드 선택
+
+- SEARCH_BACKEND=opensearch (기본): opensearch 클러스터
+- SEARCH_BACKEND=memory: 프로세스 메모리 컬럼 인덱스 (읽기 위주 배포용)
+"""
+import os
+
+from dotenv import load_dotenv
+
+from core.memory_client import get_memory_client, get_async_memory_client
+from core.opensearch import get_opensearch_client, get_async_opensearch_client
+
+BACKENDS = ('opensearch', 'memory')
+
+
+def get_search_backend() -> str:
+    """설정된 검색 백엔드 이름"""
+    load_dotenv()
+    backend = os.getenv('SEARCH_BACKEND', 'opensearch').lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 SEARCH_BACKEND: {backend} (선택: {', '.join(BACKENDS)})")
+    return backend
+
+
+def get_search_client():
+    """리포지토리용 동기 클라이언트"""
+    if get_search_backend() == 'memory':
+        return get_memory_client()
+    return get_opensearch_client()
+
+
+def get_async_search_client():
+    """리포지토리용 비동기 클라이언트"""
+    if get_search_backend() == 'memory':
+        return get_async_memory_client()
+    return get_async_opensearch_client()
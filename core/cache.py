@@ -0,0 +1,299 @@
+"""
+캐시 모듈
+
+- TTLCache: 프로세스 내 캐시 (TTL + LRU 크기 제한)
+- SqliteCache: 같은 호스트의 uvicorn 워커끼리 공유하는 캐시 (sqlite)
+- TwoTierCache: 프로세스 내 → 공유 캐시 순서로 조회
+- 인덱스 세대(generation): 데이터 로드가 끝나면 증가시켜 모든 캐시를 무효화
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+
+# 캐시 파일 위치
+ROOT_DIR = Path(__file__).parent.parent
+CACHE_DIR = ROOT_DIR / 'cache'
+CACHE_DB = CACHE_DIR / 'cache.sqlite3'
+
+# 세대 값을 프로세스 내에서 재사용하는 시간(초)
+GENERATION_CHECK_INTERVAL = 1.0
+
+# 세대 조회용 프로세스 공용 저장소 (get_generation_store)
+_generation_store = None
+_generation_lock = threading.Lock()
+
+
+def get_cache_ttl(name: str, default: float) -> float:
+    """캐시 TTL(초) 환경 변수 조회"""
+    load_dotenv()
+    return float(os.getenv(name, default))
+
+
+def get_cache_size(name: str, default: int) -> int:
+    """캐시 최대 항목 수 환경 변수 조회"""
+    load_dotenv()
+    return int(os.getenv(name, default))
+
+
+class TTLCache:
+    """프로세스 내 캐시 (TTL 만료 + LRU 제거)"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        # 크기 산정용 카운터
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """조회 (없거나 만료되면 None)"""
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self.data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: str, value: Any, ttl: float = None):
+        """저장 (크기 초과 시 가장 오래 쓰지 않은 항목 제거)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.data[key] = (value, expires_at)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """전체 삭제"""
+        with self.lock:
+            self.data.clear()
+    
+    def stats(self) -> dict:
+        """캐시 통계"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class SqliteCache:
+    """
+    워커 간 공유 캐시 (sqlite, JSON 값)
+    
+    - 만료 시간은 벽시계 기준 (프로세스 간 비교 가능)
+    - 조회는 읽기만 (WAL이라 쓰기 중에도 대기하지 않음, async 라우트에서 호출해도 이벤트 루프를 막지 않도록)
+    - 최대 항목 수를 넘으면 만료 → 만료가 가까운(먼저 저장된) 항목 순으로 제거 (근사 LRU)
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, path: Path = CACHE_DB):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.local = threading.local()
+    
+    def connect(self) -> sqlite3.Connection:
+        """스레드별 커넥션"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # accessed_at: 저장 시각 (조회 시 갱신하지 않음)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self.local.conn = conn
+        return conn
+    
+    def get(self, key: str) -> Optional[Any]:
+        """조회 (없거나 만료되면 None, 만료 항목 삭제는 set에서)"""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+    
+    def get_entry(self, key: str) -> Optional[tuple]:
+        """조회 (값, 만료 시각) (없거나 만료되면 None)"""
+        row = self.connect().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+    
+    def set(self, key: str, value: Any, ttl: float = None):
+        """저장 (크기 초과 시 만료 항목 → 만료가 가까운 항목 순으로 제거)"""
+        conn = self.connect()
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+        )
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self.maxsize:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY expires_at ASC, accessed_at ASC LIMIT "
+                "MAX((SELECT COUNT(*) FROM cache) - ?, 0))",
+                (self.maxsize,)
+            )
+    
+    def clear(self):
+        """전체 삭제"""
+        self.connect().execute("DELETE FROM cache")
+    
+    def get_generation(self) -> int:
+        """인덱스 세대 조회"""
+        row = self.connect().execute(
+            "SELECT value FROM meta WHERE name = 'generation'"
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def bump_generation(self) -> int:
+        """인덱스 세대 증가 (이전 세대 캐시는 모두 삭제)"""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('generation', 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+            )
+            conn.execute("DELETE FROM cache")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get_generation()
+
+
+class IndexGeneration:
+    """
+    인덱스 세대 조회 (GENERATION_CHECK_INTERVAL 동안 재사용)
+    
+    - 세대가 바뀌면 등록된 프로세스 내 캐시를 비움
+    
+    :param store: 세대를 저장한 공유 캐시
+    :param caches: 세대가 바뀌면 비울 객체 (clear()만 있으면 됨: TTLCache, dict 등)
+    """
+    
+    def __init__(self, store: SqliteCache, *caches: Any):
+        self.store = store
+        self.caches = caches
+        self.generation = None
+        self.checked_at = 0.0
+    
+    def current(self) -> int:
+        """현재 세대"""
+        now = time.monotonic()
+        if self.generation is None or now - self.checked_at >= GENERATION_CHECK_INTERVAL:
+            generation = self.store.get_generation()
+            if generation != self.generation:
+                for cache in self.caches:
+                    cache.clear()
+                self.generation = generation
+            self.checked_at = now
+        return self.generation
+
+
+class TwoTierCache:
+    """
+    2단계 캐시 (프로세스 내 → 워커 간 공유)
+    
+    - 키에 인덱스 세대를 붙여 세대가 바뀌면 이전 항목은 자연스럽게 무효화
+    """
+    
+    def __init__(self, namespace: str, local: TTLCache, shared: SqliteCache):
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.generation = IndexGeneration(shared, local)
+    
+    def make_key(self, key: str) -> str:
+        """세대 포함 키"""
+        return f"{self.namespace}:{self.generation.current()}:{key}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        조회 (프로세스 내 캐시 → 공유 캐시)
+        
+        - 공유 캐시 항목을 프로세스 내 캐시에 올릴 때 TTL은 공유 캐시의 남은 시간까지만
+        """
+        full_key = self.make_key(key)
+        value = self.local.get(full_key)
+        if value is not None:
+            return value
+        entry = self.shared.get_entry(full_key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        self.local.set(full_key, value, ttl=min(self.local.ttl, expires_at - time.time()))
+        return value
+    
+    def set(self, key: str, value: Any):
+        """저장 (두 단계 모두)"""
+        full_key = self.make_key(key)
+        self.local.set(full_key, value)
+        self.shared.set(full_key, value)
+    
+    def clear(self):
+        """프로세스 내 캐시 삭제"""
+        self.local.clear()
+
+
+def get_generation_store() -> SqliteCache:
+    """세대 조회용 프로세스 공용 저장소 (캐시 항목 없이 세대만 읽고 쓰는 용도)"""
+    global _generation_store
+    if _generation_store is None:
+        with _generation_lock:
+            if _generation_store is None:
+                _generation_store = SqliteCache(maxsize=0, ttl=0)
+    return _generation_store
+
+
+def get_index_generation() -> int:
+    """현재 인덱스 세대"""
+    return get_generation_store().get_generation()
+
+
+def bump_index_generation() -> int:
+    """
+    인덱스 세대 증가 (데이터 로드/인덱스 재생성 후 호출)
+    
+    같은 호스트의 모든 API 워커 캐시가 무효화됨
+    """
+    return get_generation_store().bump_generation()
@@ -1,10 +1,23 @@
 """
 로깅 설정
+
+- 요청 스레드는 큐에 레코드만 넣고, 포맷/파일 기록은 QueueListener 스레드에서 처리
+- 계층별 로거(search_api.api, search_api.service, ...)는 LOG_LEVEL_<계층>으로 레벨 조정
+- 로그 파일은 프로세스(uvicorn 워커)마다 따로 두고 크기/시간 기준으로 회전 (오래된 파일 자동 삭제)
+  회전 핸들러는 여러 프로세스가 같은 파일을 회전하면 로그가 덮어써지거나 유실되므로 공유하지 않음
 """
+import atexit
 import logging
-from datetime import datetime
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 # 로그 디렉토리 설정
 ROOT_DIR = Path(__file__).parent.parent
 LOGS_DIR = ROOT_DIR / 'logs'
@@ -13,24 +26,126 @@ LOGS_DIR = ROOT_DIR / 'logs'
 LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
 DATE_FORMAT = "%Y.%m.%d %H:%M:%S"
 
+# 최상위 로거 이름 (계층별 로거는 이 로거의 하위)
+ROOT_LOGGER = "search_api"
+
+# 파일 기록 스레드와 큐 핸들러 (프로세스당 하나)
+_listener = None
+_queue_handler = None
+_listener_lock = threading.Lock()
+
+# 샘플링 비율 캐시 (환경 변수는 한 번만 읽음)
+_sample_rates = {}
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    포맷하지 않고 레코드를 그대로 큐에 넣는 핸들러
+    
+    기본 QueueHandler는 큐에 넣기 전에 호출 스레드에서 메시지를 포맷하므로,
+    %-style 인자 포맷을 QueueListener 스레드로 미루기 위해 prepare를 재정의
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 def ensure_logs_dir():
     """logs 디렉토리 생성"""
     LOGS_DIR.mkdir(exist_ok=True)
 
 
-def get_log_filename() -> str:
-    """날짜+시간 기반 로그 파일명 생성 (실행마다 새 파일)"""
-    now = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"{now}.log"
+def get_level(env_name: str, default: str) -> int:
+    """환경 변수의 로그 레벨 이름 → 레벨 값"""
+    load_dotenv()
+    return logging.getLevelName(os.getenv(env_name, default).upper())
+
+
+def create_file_handler() -> logging.Handler:
+    """
+    회전 파일 핸들러 생성
+    
+    - LOG_FILE: 파일명 (logs/ 하위, 기본 search_api.log → search_api.<pid>.log)
+    - LOG_ROTATION=size: LOG_MAX_BYTES 초과 시 회전
+    - LOG_ROTATION=time: LOG_ROTATE_WHEN(기본 midnight) 기준 회전
+    - LOG_BACKUP_COUNT: 보관할 이전 파일 수 (초과분 삭제)
+    - LOG_RETENTION_DAYS: 종료된 프로세스의 로그 파일 보관 일수 (기본 7)
+    """
+    load_dotenv()
+    ensure_logs_dir()
+    name = Path(os.getenv('LOG_FILE', f'{ROOT_LOGGER}.log'))
+    remove_stale_logs(name, float(os.getenv('LOG_RETENTION_DAYS', 7)))
+    log_file = LOGS_DIR / f"{name.stem}.{os.getpid()}{name.suffix}"
+    backup_count = int(os.getenv('LOG_BACKUP_COUNT', 7))
+    
+    if os.getenv('LOG_ROTATION', 'size').lower() == 'time':
+        return TimedRotatingFileHandler(
+            log_file,
+            when=os.getenv('LOG_ROTATE_WHEN', 'midnight'),
+            backupCount=backup_count,
+            encoding='utf-8'
+        )
+    return RotatingFileHandler(
+        log_file,
+        maxBytes=int(os.getenv('LOG_MAX_BYTES', 50 * 1024 * 1024)),
+        backupCount=backup_count,
+        encoding='utf-8'
+    )
+
+
+def remove_stale_logs(name: Path, retention_days: float):
+    """다른(종료된) 프로세스의 로그 파일 중 retention_days 동안 기록이 없는 파일 삭제"""
+    cutoff = time.time() - retention_days * 86400
+    for path in LOGS_DIR.glob(f"{name.stem}.*{name.suffix}*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
 
 
-def setup_logger(name: str = None, level: int = logging.INFO) -> logging.Logger:
+def start_listener() -> QueueHandler:
+    """
+    파일 기록 스레드 시작 후 큐 핸들러 반환 (레벨 판단은 각 로거에서)
+    
+    프로세스당 한 번만 시작하고 이후 호출은 같은 큐 핸들러를 반환
+    """
+    global _listener, _queue_handler
+    
+    with _listener_lock:
+        if _queue_handler is not None:
+            return _queue_handler
+        
+        file_handler = create_file_handler()
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+        
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_listener)
+        
+        _queue_handler = LazyQueueHandler(log_queue)
+        return _queue_handler
+
+
+def stop_listener():
+    """남은 로그를 기록하고 파일 기록 스레드 종료"""
+    global _listener, _queue_handler
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+            _queue_handler = None
+
+
+def setup_logger(name: str = None, level: int = None) -> logging.Logger:
     """
     로거 생성 및 설정
     
     :param name: 로거 이름 (None이면 root logger)
-    :param level: 로깅 레벨
+    :param level: 로깅 레벨 (None이면 LOG_LEVEL, 기본 INFO)
     :return: 설정된 로거
     """
     logger = logging.getLogger(name)
@@ -39,17 +154,10 @@ def setup_logger(name: str = None, level: int = logging.INFO) -> logging.Logger:
     if logger.handlers:
         return logger
     
+    if level is None:
+        level = get_level('LOG_LEVEL', 'INFO')
     logger.setLevel(level)
-    
-    formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    
-    # 파일 핸들러 (날짜+시간별 로그 파일)
-    ensure_logs_dir()
-    log_file = LOGS_DIR / get_log_filename()
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(start_listener())
     
     return logger
 
@@ -58,9 +166,35 @@ def get_logger(name: str) -> logging.Logger:
     """
     모듈용 로거 가져오기
     
+    - search_api 하위 로거는 최상위 로거의 핸들러를 공유하고,
+      LOG_LEVEL_<마지막 이름> (예: LOG_LEVEL_REPOSITORY)이 있으면 그 레벨 사용
+    - 포맷 인자는 %-style로 넘겨 실제 기록될 때만 포맷되도록 함
+    
     사용법:
         from core.logger import get_logger
-        logger = get_logger(__name__)
-        logger.info("메시지")
+        logger = get_logger("search_api.service")
+        logger.info("검색 완료: total=%s", total)
+    """
+    if name == ROOT_LOGGER or not name.startswith(ROOT_LOGGER + '.'):
+        return setup_logger(name)
+    
+    setup_logger(ROOT_LOGGER)
+    logger = logging.getLogger(name)
+    layer = name.rsplit('.', 1)[-1].upper()
+    load_dotenv()
+    if os.getenv(f'LOG_LEVEL_{layer}'):
+        logger.setLevel(get_level(f'LOG_LEVEL_{layer}', 'INFO'))
+    return logger
+
+
+def should_sample(env_name: str, default: float) -> bool:
+    """
+    샘플링 로그 기록 여부 (비율은 환경 변수, 0~1)
+    
+    예: LOG_QUERY_SAMPLE_RATE=0.01 → 약 1%의 요청만 기록
     """
-    return setup_logger(name)
+    rate = _sample_rates.get(env_name)
+    if rate is None:
+        load_dotenv()
+        rate = _sample_rates[env_name] = float(os.getenv(env_name, default))
+    return rate > 0 and random.random() < rate
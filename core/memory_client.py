@@ -0,0 +1,296 @@
+"""
+메모리 인덱스 클라이언트 (SEARCH_BACKEND=memory)
+
+OpenSearchClient/AsyncOpenSearchClient와 같은 search/count/PIT 메서드를 제공하여
+리포지토리 코드를 바꾸지 않고 메모리 컬럼 인덱스(core/memory_index.py)로 검색
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Tuple
+
+from dotenv import load_dotenv
+
+from config import OPENSEARCH_MAPPINGS, OPENSEARCH_SETTINGS, SCHEMA_DIR
+from core.cache import SqliteCache, IndexGeneration
+from core.logger import get_logger
+from core.memory_index import Analyzer, ColumnarIndex
+from core.opensearch import PitExpiredError, get_opensearch_client
+
+logger = get_logger("search_api.memory")
+
+# 다시 읽기에 실패했을 때 재시도 간격(초)
+RELOAD_RETRY_INTERVAL = 10.0
+
+# keep_alive 단위 (초)
+TIME_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# 프로세스 공용 클라이언트
+_shared_client = None
+_shared_async_client = None
+_shared_lock = threading.Lock()
+
+
+def parse_keep_alive(keep_alive: str) -> float:
+    """keep_alive ("1m", "30s") → 초"""
+    for unit in ("ms", "s", "m", "h", "d"):
+        if keep_alive.endswith(unit) and keep_alive[:-len(unit)].isdigit():
+            return int(keep_alive[:-len(unit)]) * TIME_UNITS[unit]
+    raise ValueError(f"잘못된 keep_alive: {keep_alive}")
+
+
+def load_mappings(index_name: str) -> dict:
+    """인덱스 매핑 (schema/opensearch_mappings.json)"""
+    with open(OPENSEARCH_MAPPINGS, 'r', encoding='utf-8') as f:
+        return json.load(f)[index_name]
+
+
+def load_analyzers(index_name: str) -> Tuple[Analyzer, dict]:
+    """기본 분석기(동의어 포함) + settings의 분석기 이름별 Analyzer"""
+    with open(OPENSEARCH_SETTINGS, 'r', encoding='utf-8') as f:
+        analysis = json.load(f)[index_name].get('analysis', {})
+    analyzer = Analyzer.from_file(SCHEMA_DIR / 'synonyms.txt')
+    return analyzer, Analyzer.from_settings(analysis, analyzer)
+
+
+def load_documents(source: str, index_name: str) -> list:
+    """
+    색인할 문서 목록 [(_id, _source)]
+    
+    - opensearch: 인덱스 전체를 scroll로 읽음
+    - *.jsonl: 한 줄에 문서 하나 (_source 또는 {"_id", "_source"})
+    - *.xlsx/*.csv/*.parquet: 원본 파일 (scripts/load_data.py와 같은 변환 규칙)
+    """
+    if source == 'opensearch':
+        return [
+            (hit['_id'], hit['_source'])
+            for hit in get_opensearch_client().scan_documents(index_name)
+        ]
+    
+    path = Path(source)
+    if path.suffix == '.jsonl':
+        documents = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                doc = json.loads(line)
+                if '_source' in doc:
+                    documents.append((doc.get('_id', doc['_source'].get('id')), doc['_source']))
+                else:
+                    documents.append((doc.get('id'), doc))
+        return documents
+    
+    if path.suffix in ('.xlsx', '.csv', '.parquet'):
+        from scripts.document_source import prepare_documents
+        return [(doc['id'], doc) for doc in prepare_documents(path)]
+    
+    raise ValueError(f"지원하지 않는 MEMORY_INDEX_SOURCE: {source}")
+
+
+def get_memory_client() -> 'MemorySearchClient':
+    """프로세스 공용 메모리 인덱스 클라이언트"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = MemorySearchClient()
+    return _shared_client
+
+
+def get_async_memory_client() -> 'AsyncMemorySearchClient':
+    """프로세스 공용 메모리 인덱스 비동기 클라이언트"""
+    global _shared_async_client
+    if _shared_async_client is None:
+        with _shared_lock:
+            if _shared_async_client is None:
+                _shared_async_client = AsyncMemorySearchClient(get_memory_client())
+    return _shared_async_client
+
+
+class MemorySearchClient:
+    """
+    메모리 인덱스 클라이언트
+    
+    - MEMORY_INDEX_SOURCE: opensearch(기본) 또는 .jsonl(문서)/.xlsx/.csv/.parquet(원본) 파일 경로
+    - 인덱스 세대가 바뀌면 백그라운드에서 다시 읽고, 그동안은 이전 스냅샷으로 응답
+    - PIT는 생성 시점의 스냅샷을 keep_alive 동안 보관
+    """
+    
+    def __init__(self, index_name: str = 'companies', source: str = None):
+        load_dotenv()
+        self.index_name = index_name
+        self.source = source or os.getenv('MEMORY_INDEX_SOURCE', 'opensearch')
+        self.index = None
+        self.loaded_generation = None
+        self.generation = IndexGeneration(SqliteCache(maxsize=0, ttl=0))
+        self.lock = threading.Lock()
+        self.reloading = False
+        self.retry_at = 0.0
+        self.pits = {}
+    
+    def load(self) -> ColumnarIndex:
+        """인덱스 읽기 (세대는 읽기 전에 확인하여 읽는 중 바뀌면 다시 읽도록)"""
+        generation = self.generation.current()
+        start = time.perf_counter()
+        documents = load_documents(self.source, self.index_name)
+        analyzer, analyzers = load_analyzers(self.index_name)
+        index = ColumnarIndex(
+            self.index_name,
+            documents,
+            load_mappings(self.index_name),
+            analyzer,
+            analyzers
+        )
+        self.index, self.loaded_generation = index, generation
+        logger.info(
+            "[Memory] 인덱스 로드: %s건, 세대=%s, %.2fs",
+            index.count(), generation, time.perf_counter() - start
+        )
+        return index
+    
+    def get_index(self) -> ColumnarIndex:
+        """현재 스냅샷 (세대가 바뀌었으면 백그라운드 다시 읽기 시작)"""
+        index = self.index
+        if index is None:
+            with self.lock:
+                if self.index is None:
+                    self.load()
+            return self.index
+        
+        if self.generation.current() != self.loaded_generation:
+            self.start_reload()
+        return index
+    
+    def start_reload(self):
+        """백그라운드 다시 읽기 (이미 진행 중이거나 재시도 대기 중이면 스킵)"""
+        with self.lock:
+            if self.reloading or time.monotonic() < self.retry_at:
+                return
+            self.reloading = True
+        threading.Thread(target=self.reload, daemon=True).start()
+    
+    def reload(self):
+        """다시 읽기 (실패하면 이전 스냅샷 유지)"""
+        try:
+            self.load()
+        except Exception as e:
+            logger.warning("[Memory] 인덱스 다시 읽기 실패: %s", e)
+            self.retry_at = time.monotonic() + RELOAD_RETRY_INTERVAL
+        finally:
+            self.reloading = False
+    
+    def check_index(self, index_name: str):
+        """요청 인덱스 확인"""
+        if index_name != self.index_name:
+            raise ValueError(f"메모리 인덱스에 없는 인덱스: {index_name}")
+    
+    def index_exists(self, index_name: str) -> bool:
+        """인덱스 존재 확인"""
+        return index_name == self.index_name
+    
+    def search(self, index_name: str, body: dict) -> dict:
+        """검색 실행 (PIT 검색이면 index_name=None)"""
+        pit = body.get('pit')
+        if pit is None:
+            self.check_index(index_name)
+            return self.get_index().search(body)
+        
+        index = self.get_pit(pit['id'], pit.get('keep_alive'))
+        result = index.search(body)
+        result['pit_id'] = pit['id']
+        return result
+    
+    def msearch(self, index_name: str, bodies: list) -> list:
+        """여러 검색 실행 (_msearch와 같이 실패한 항목만 error/status로 응답)"""
+        responses = []
+        for body in bodies:
+            try:
+                responses.append(self.search(index_name, body))
+            except (ValueError, NotImplementedError) as e:
+                responses.append({
+                    "error": {"type": type(e).__name__, "reason": str(e)},
+                    "status": 400
+                })
+        return responses
+    
+    def create_pit(self, index_name: str, keep_alive: str) -> str:
+        """point-in-time 생성 (현재 스냅샷 고정)"""
+        self.check_index(index_name)
+        now = time.monotonic()
+        # 만료된 PIT 정리
+        for pit_id, (_, expires_at) in list(self.pits.items()):
+            if expires_at <= now:
+                self.pits.pop(pit_id, None)
+        pit_id = uuid.uuid4().hex
+        self.pits[pit_id] = (self.get_index(), now + parse_keep_alive(keep_alive))
+        return pit_id
+    
+    def get_pit(self, pit_id: str, keep_alive: str = None) -> ColumnarIndex:
+        """PIT 스냅샷 (keep_alive가 있으면 연장)"""
+        item = self.pits.get(pit_id)
+        if item is None or item[1] <= time.monotonic():
+            self.pits.pop(pit_id, None)
+            raise PitExpiredError("커서가 만료되었습니다. 첫 페이지부터 다시 요청하세요.")
+        index = item[0]
+        if keep_alive:
+            self.pits[pit_id] = (index, time.monotonic() + parse_keep_alive(keep_alive))
+        return index
+    
+    def delete_pit(self, pit_id: str) -> dict:
+        """point-in-time 삭제"""
+        found = self.pits.pop(pit_id, None) is not None
+        return {"pits": [{"pit_id": pit_id, "successful": found}]}
+    
+    def count(self, index_name: str) -> int:
+        """문서 수 조회"""
+        self.check_index(index_name)
+        return self.get_index().count()
+
+
+class AsyncMemorySearchClient:
+    """
+    메모리 인덱스 비동기 클라이언트
+    
+    - 검색은 CPU 작업이 짧아 이벤트 루프에서 바로 실행
+    - 첫 로드는 preload로 서버 시작 시 스레드에서 미리 수행
+    """
+    
+    def __init__(self, client: MemorySearchClient):
+        self.client = client
+    
+    async def preload(self):
+        """인덱스 미리 읽기"""
+        if self.client.index is None:
+            await asyncio.to_thread(self.client.get_index)
+    
+    async def index_exists(self, index_name: str) -> bool:
+        """인덱스 존재 확인"""
+        return self.client.index_exists(index_name)
+    
+    async def search(self, index_name: str, body: dict) -> dict:
+        """검색 실행 (PIT 검색이면 index_name=None)"""
+        return self.client.search(index_name, body)
+    
+    async def msearch(self, index_name: str, bodies: list) -> list:
+        """여러 검색 실행"""
+        return self.client.msearch(index_name, bodies)
+    
+    async def create_pit(self, index_name: str, keep_alive: str) -> str:
+        """point-in-time 생성"""
+        return self.client.create_pit(index_name, keep_alive)
+    
+    async def delete_pit(self, pit_id: str) -> dict:
+        """point-in-time 삭제"""
+        return self.client.delete_pit(pit_id)
+    
+    async def count(self, index_name: str) -> int:
+        """문서 수 조회"""
+        return self.client.count(index_name)
+    
+    async def close(self):
+        """정리할 연결 없음"""
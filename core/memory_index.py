@@ -0,0 +1,910 @@
+"""
+메모리 컬럼 인덱스 (opensearch 대체 검색 엔진)
+
+인덱스 전체를 프로세스 메모리에 올려 네트워크 없이 검색/집계
+- 인덱스 매핑(schema/opensearch_mappings.json)대로 필드를 구성
+  - keyword/숫자/날짜 필드: NumPy 컬럼
+  - text 필드: 토큰 → 문서 역색인 (BM25 통계 포함)
+  - nested 필드: 하위 문서 공간을 따로 두고 상위 문서 번호로 연결
+- 리포지토리가 만드는 쿼리 DSL을 그대로 해석하여 opensearch와 같은 형태의 응답을 반환
+- 점수는 BM25(k1=1.2, b=0.75)를 인덱스 전체 통계로 계산
+  (샤드별 통계를 쓰는 클러스터와는 점수가 거의 같은 문서끼리 순서가 다를 수 있음)
+"""
+import bisect
+import math
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# BM25 파라미터 (opensearch 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# from + size 최대값 (index.max_result_window 기본값)
+MAX_RESULT_WINDOW = 10000
+
+# track_total_hits 기본 정확도
+DEFAULT_TRACK_TOTAL_HITS = 10000
+
+# standard tokenizer 근사 (단어 내부의 ' . 는 분리하지 않음)
+TOKEN_PATTERN = re.compile(r"\w+(?:['’.]\w+)*")
+
+# 날짜 패턴 (java → strftime)
+DATE_PATTERN_PARTS = (("yyyy", "%Y"), ("MM", "%m"), ("dd", "%d"), ("HH", "%H"), ("mm", "%M"), ("ss", "%S"))
+
+# date_histogram 간격 → NumPy 날짜 단위
+CALENDAR_UNITS = {
+    "year": "Y", "1y": "Y",
+    "month": "M", "1M": "M",
+    "day": "D", "1d": "D"
+}
+
+MILLIS_PER_DAY = 86400000
+
+
+class UnsupportedQueryError(NotImplementedError):
+    """메모리 인덱스가 해석하지 못하는 쿼리/집계"""
+
+
+def to_strftime(pattern: str) -> str:
+    """java 날짜 패턴 → strftime 패턴"""
+    for java, python in DATE_PATTERN_PARTS:
+        pattern = pattern.replace(java, python)
+    return pattern
+
+
+def parse_date(value, formats: List[str]) -> np.datetime64:
+    """날짜 문자열/epoch millis → datetime64[D] (해석할 수 없으면 NaT)"""
+    if value is None:
+        return np.datetime64('NaT')
+    if isinstance(value, (int, float)):
+        return np.datetime64(int(value), 'ms').astype('datetime64[D]')
+    for fmt in formats:
+        try:
+            return np.datetime64(datetime.strptime(value, fmt).date(), 'D')
+        except ValueError:
+            continue
+    return np.datetime64('NaT')
+
+
+class Analyzer:
+    """
+    custom_analyzer 근사 (schema/opensearch_settings.json)
+    
+    - remove_hyphen char filter → standard tokenizer → lowercase → synonym
+    - 동의어는 단일 토큰 규칙만 적용 (같은 위치에 함께 색인)
+    - edge_ngram: 토큰의 접두어를 같은 위치에 색인, max_length: truncate 필터
+    """
+    
+    def __init__(self, synonyms: dict = None, edge_ngram: Tuple[int, int] = None, max_length: int = None):
+        self.synonyms = synonyms or {}
+        self.edge_ngram = edge_ngram
+        self.max_length = max_length
+    
+    @classmethod
+    def from_file(cls, path: Path) -> 'Analyzer':
+        """solr 형식 동의어 파일로 생성 (a, b, c / a => b)"""
+        analyzer = cls()
+        if not path.exists():
+            return analyzer
+        
+        synonyms = {}
+        for line in path.read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if '=>' in line:
+                left, right = line.split('=>', 1)
+                targets = analyzer.single_tokens(right.split(','))
+                for token in analyzer.single_tokens(left.split(',')):
+                    synonyms[token] = targets
+            else:
+                group = analyzer.single_tokens(line.split(','))
+                for token in group:
+                    synonyms[token] = [token] + [t for t in group if t != token]
+        analyzer.synonyms = synonyms
+        return analyzer
+    
+    @classmethod
+    def from_settings(cls, analysis: dict, synonyms: 'Analyzer') -> dict:
+        """
+        인덱스 settings의 analysis → 분석기 이름별 Analyzer
+        
+        - 토큰화/lowercase는 공통, filter 목록의 synonym/edge_ngram/truncate만 구분
+        
+        :param synonyms: 동의어를 읽어 둔 분석기 (from_file)
+        """
+        filters = analysis.get('filter', {})
+        analyzers = {}
+        for name, spec in analysis.get('analyzer', {}).items():
+            options = {}
+            for filter_name in spec.get('filter', []):
+                filter_spec = filters.get(filter_name, {})
+                kind = filter_spec.get('type')
+                if kind in ('synonym', 'synonym_graph'):
+                    options['synonyms'] = synonyms.synonyms
+                elif kind == 'edge_ngram':
+                    options['edge_ngram'] = (int(filter_spec.get('min_gram', 1)), int(filter_spec.get('max_gram', 2)))
+                elif kind == 'truncate':
+                    options['max_length'] = int(filter_spec.get('length', 10))
+            analyzers[name] = cls(**options)
+        return analyzers
+    
+    def single_tokens(self, terms: List[str]) -> List[str]:
+        """동의어 항목 중 토큰 하나로 분석되는 것만"""
+        tokens = []
+        for term in terms:
+            analyzed = self.tokenize(term)
+            if len(analyzed) == 1 and analyzed[0] not in tokens:
+                tokens.append(analyzed[0])
+        return tokens
+    
+    def tokenize(self, text: str) -> List[str]:
+        """동의어 적용 전 토큰"""
+        tokens = TOKEN_PATTERN.findall(str(text).replace('-', '').lower())
+        if self.max_length is not None:
+            tokens = [token[:self.max_length] for token in tokens]
+        return tokens
+    
+    def positions(self, text: str) -> List[List[str]]:
+        """위치별 토큰 목록 (동의어/접두어는 같은 위치)"""
+        if self.edge_ngram is not None:
+            low, high = self.edge_ngram
+            return [
+                [token[:n] for n in range(low, min(high, len(token)) + 1)]
+                for token in self.tokenize(text)
+            ]
+        return [self.synonyms.get(token, [token]) for token in self.tokenize(text)]
+
+
+class KeywordColumn:
+    """keyword 필드 (정렬된 사전 + 코드 배열, 코드 순서 = 정렬 순서)"""
+    
+    def __init__(self, values: list):
+        self.vocab = sorted({str(v) for v in values if v is not None})
+        self.lookup = {v: i for i, v in enumerate(self.vocab)}
+        self.codes = np.array(
+            [self.lookup[str(v)] if v is not None else -1 for v in values],
+            dtype=np.int32
+        )
+        
+        # nested 하위 문서 값 → 상위 문서 번호 (처음 쓸 때 생성)
+        self.parent_postings = None
+    
+    def term_codes(self, values: list) -> list:
+        """값 → 코드 (사전에 없는 값은 제외)"""
+        return [self.lookup[str(v)] for v in values if str(v) in self.lookup]
+    
+    def match_terms(self, values: list) -> np.ndarray:
+        """terms 쿼리 (코드별 일치 여부 표로 조회, 마지막 칸은 값 없음)"""
+        table = np.zeros(len(self.vocab) + 1, dtype=bool)
+        table[self.term_codes(values)] = True
+        return table[self.codes]
+    
+    def match_parents(self, values: list, parents: np.ndarray, size: int) -> np.ndarray:
+        """nested 하위 문서의 terms 쿼리 → 일치하는 상위 문서 (점수 불필요할 때)"""
+        if self.parent_postings is None:
+            order = np.argsort(self.codes, kind='stable')
+            bounds = np.searchsorted(self.codes[order], np.arange(len(self.vocab) + 1))
+            self.parent_postings = [
+                np.unique(parents[order[bounds[i]:bounds[i + 1]]])
+                for i in range(len(self.vocab))
+            ]
+        mask = np.zeros(size, dtype=bool)
+        for code in self.term_codes(values):
+            mask[self.parent_postings[code]] = True
+        return mask
+    
+    def sort_values(self, docs: np.ndarray) -> np.ndarray:
+        """정렬 키 (없는 값은 NaN)"""
+        codes = self.codes[docs].astype(np.float64)
+        codes[codes < 0] = np.nan
+        return codes
+    
+    def sort_output(self, docs: np.ndarray) -> list:
+        """응답의 sort 값"""
+        vocab = self.vocab
+        return [vocab[code] if code >= 0 else None for code in self.codes[docs].tolist()]
+    
+    def after_key(self, value) -> float:
+        """search_after 값 → 정렬 키 (사전에 없는 값은 사이 값)"""
+        if value is None:
+            return np.nan
+        value = str(value)
+        i = bisect.bisect_left(self.vocab, value)
+        if i < len(self.vocab) and self.vocab[i] == value:
+            return float(i)
+        return i - 0.5
+
+
+class NumericColumn:
+    """숫자 필드 (float 필드는 색인과 같이 float32 정밀도)"""
+    
+    def __init__(self, values: list, kind: str):
+        self.integer = kind in ('long', 'integer', 'short', 'byte')
+        dtype = np.float32 if kind in ('float', 'half_float') else np.float64
+        self.values = np.array(
+            [np.nan if v is None else v for v in values], dtype=dtype
+        ).astype(np.float64)
+    
+    def match_terms(self, values: list) -> np.ndarray:
+        """terms 쿼리"""
+        return np.isin(self.values, [float(v) for v in values])
+    
+    def match_range(self, bounds: dict) -> np.ndarray:
+        """range 쿼리"""
+        return compare_range(
+            self.values, {k: float(v) for k, v in bounds.items() if k in RANGE_OPERATORS}
+        )
+    
+    def sort_values(self, docs: np.ndarray) -> np.ndarray:
+        """정렬 키 (없는 값은 NaN)"""
+        return self.values[docs]
+    
+    def sort_output(self, docs: np.ndarray) -> list:
+        """응답의 sort 값"""
+        convert = int if self.integer else float
+        return [None if v != v else convert(v) for v in self.values[docs].tolist()]
+    
+    def after_key(self, value) -> float:
+        """search_after 값 → 정렬 키"""
+        return np.nan if value is None else float(value)
+
+
+class DateColumn:
+    """date 필드 (일 단위 datetime64)"""
+    
+    def __init__(self, values: list, fmt: str):
+        self.formats = [to_strftime(f) for f in fmt.split('||') if not f.startswith('epoch')]
+        self.format = self.formats[0]
+        self.days = np.array(
+            [parse_date(v, self.formats) for v in values],
+            dtype='datetime64[D]'
+        )
+        self.truncated = {}
+    
+    def truncate(self, unit: str) -> np.ndarray:
+        """단위(Y/M/D)로 내림한 날짜 (date_histogram 구간)"""
+        truncated = self.truncated.get(unit)
+        if truncated is None:
+            truncated = self.truncated[unit] = self.days.astype(f'datetime64[{unit}]')
+        return truncated
+    
+    def match_range(self, bounds: dict) -> np.ndarray:
+        """range 쿼리 (경계는 필드 형식의 날짜)"""
+        parsed = {k: parse_date(v, self.formats) for k, v in bounds.items() if k in RANGE_OPERATORS}
+        return compare_range(self.days, parsed)
+    
+    def sort_values(self, docs: np.ndarray) -> np.ndarray:
+        """정렬 키 (없는 값은 NaN)"""
+        days = self.days[docs]
+        values = days.astype(np.int64).astype(np.float64)
+        values[np.isnat(days)] = np.nan
+        return values
+    
+    def sort_output(self, docs: np.ndarray) -> list:
+        """응답의 sort 값 (epoch millis)"""
+        values = self.sort_values(docs).tolist()
+        return [None if v != v else int(v) * MILLIS_PER_DAY for v in values]
+    
+    def after_key(self, value) -> float:
+        """search_after 값(epoch millis) → 정렬 키"""
+        return np.nan if value is None else float(value) / MILLIS_PER_DAY
+
+
+class TextColumn:
+    """text 필드 역색인 (토큰 → 문서 번호/빈도)"""
+    
+    def __init__(self, values: list, analyzer: Analyzer, search_analyzer: Analyzer = None):
+        self.analyzer = analyzer
+        self.search_analyzer = search_analyzer or analyzer
+        self.size = len(values)
+        counts = defaultdict(lambda: defaultdict(int))
+        lengths = np.zeros(self.size, dtype=np.float64)
+        total_terms = 0
+        
+        for doc, value in enumerate(values):
+            if value is None:
+                continue
+            texts = value if isinstance(value, list) else [value]
+            for text in texts:
+                positions = analyzer.positions(text)
+                lengths[doc] += len(positions)
+                for tokens in positions:
+                    for token in tokens:
+                        counts[token][doc] += 1
+                        total_terms += 1
+        
+        self.postings = {
+            token: (
+                np.fromiter(freqs.keys(), dtype=np.int32, count=len(freqs)),
+                np.fromiter(freqs.values(), dtype=np.float64, count=len(freqs))
+            )
+            for token, freqs in counts.items()
+        }
+        # 필드 값이 있는 문서 수와 평균 길이 (BM25 정규화)
+        self.doc_count = int(np.count_nonzero(lengths))
+        avgdl = total_terms / self.doc_count if self.doc_count else 1.0
+        self.norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avgdl)
+    
+    def match(self, text: str, operator: str = 'or') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        match 쿼리 (위치별 should 절의 BM25 점수 합)
+        
+        - 같은 위치의 동의어는 하나의 항으로 묶음 (df는 최대값, 빈도는 합)
+        - 점수는 역색인에 있는 문서만 계산
+        """
+        scores = np.zeros(self.size, dtype=np.float64)
+        positions = self.search_analyzer.positions(text)
+        matched_positions = np.zeros(self.size, dtype=np.int32) if operator == 'and' else None
+        
+        for tokens in positions:
+            postings = [self.postings[t] for t in tokens if t in self.postings]
+            if not postings:
+                continue
+            if len(postings) == 1:
+                docs, freqs = postings[0]
+            else:
+                docs, inverse = np.unique(np.concatenate([p[0] for p in postings]), return_inverse=True)
+                freqs = np.bincount(inverse, weights=np.concatenate([p[1] for p in postings]))
+            df = max(len(p[0]) for p in postings)
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            scores[docs] += idf * freqs / (freqs + self.norms[docs])
+            if matched_positions is not None:
+                matched_positions[docs] += 1
+        
+        if matched_positions is None:
+            matched = scores > 0
+        else:
+            matched = (matched_positions == len(positions)) & (len(positions) > 0)
+            scores[~matched] = 0.0
+        return matched, scores
+
+
+RANGE_OPERATORS = {
+    "gt": np.greater,
+    "gte": np.greater_equal,
+    "lt": np.less,
+    "lte": np.less_equal
+}
+
+
+def compare_range(values: np.ndarray, bounds: dict) -> np.ndarray:
+    """range 조건 (없는 값은 제외)"""
+    mask = np.ones(len(values), dtype=bool)
+    for name, bound in bounds.items():
+        operator = RANGE_OPERATORS.get(name)
+        if operator is None or bound is None:
+            continue
+        mask &= operator(values, bound)
+    return mask
+
+
+def make_column(kind: str, values: list, prop: dict, analyzers: dict):
+    """
+    매핑 타입별 컬럼 (지원하지 않는 타입은 None)
+    
+    :param analyzers: 분석기 이름별 Analyzer (None 키는 기본 분석기)
+    """
+    if kind == 'keyword':
+        return KeywordColumn(values)
+    if kind == 'text':
+        return TextColumn(
+            values,
+            analyzers.get(prop.get('analyzer'), analyzers[None]),
+            analyzers.get(prop.get('search_analyzer'))
+        )
+    if kind in ('long', 'integer', 'short', 'byte', 'float', 'half_float', 'double'):
+        return NumericColumn(values, kind)
+    if kind == 'date':
+        return DateColumn(values, prop.get('format', 'yyyy-MM-dd'))
+    return None
+
+
+class DocumentSpace:
+    """
+    문서 공간별 컬럼 (상위 문서 또는 nested 하위 문서)
+    
+    - 필드 이름은 전체 경로 (company_name.keyword, main_pipeline.stage 등)
+    """
+    
+    def __init__(self, sources: list, properties: dict, analyzers: dict, prefix: str = ''):
+        self.size = len(sources)
+        self.fields = {}
+        self.nested = {}
+        
+        for name, prop in properties.items():
+            path = prefix + name
+            values = [source.get(name) for source in sources]
+            kind = prop.get('type', 'object')
+            
+            if kind == 'nested':
+                children, parents = [], []
+                for doc, items in enumerate(values):
+                    for child in items or []:
+                        children.append(child)
+                        parents.append(doc)
+                space = DocumentSpace(children, prop.get('properties', {}), analyzers, path + '.')
+                self.nested[path] = (space, np.array(parents, dtype=np.int32))
+                continue
+            
+            column = make_column(kind, values, prop, analyzers)
+            if column is not None:
+                self.fields[path] = column
+            for sub_name, sub_prop in prop.get('fields', {}).items():
+                column = make_column(sub_prop.get('type'), values, sub_prop, analyzers)
+                if column is not None:
+                    self.fields[f"{path}.{sub_name}"] = column
+    
+    def column(self, field: str):
+        """필드 컬럼 (없으면 UnsupportedQueryError)"""
+        column = self.fields.get(field)
+        if column is None:
+            raise UnsupportedQueryError(f"메모리 인덱스에 없는 필드: {field}")
+        return column
+
+
+def filter_source(source: dict, spec) -> Optional[dict]:
+    """_source 필터링 (최상위 필드 이름 기준)"""
+    if spec is None or spec is True:
+        return source
+    if spec is False:
+        return None
+    if isinstance(spec, (str, list)):
+        spec = {"includes": spec}
+    includes = spec.get('includes') or None
+    excludes = spec.get('excludes') or []
+    if isinstance(includes, str):
+        includes = [includes]
+    if isinstance(excludes, str):
+        excludes = [excludes]
+    
+    if includes is not None:
+        return {k: v for k, v in source.items() if k in includes and k not in excludes}
+    return {k: v for k, v in source.items() if k not in excludes}
+
+
+class ColumnarIndex:
+    """
+    메모리 컬럼 인덱스 (생성 후 변경하지 않는 스냅샷)
+    
+    - 응답 hit의 _source는 색인한 문서를 공유하므로 수정하면 안 됨
+    """
+    
+    def __init__(self, name: str, documents: list, mappings: dict, analyzer: Analyzer, analyzers: dict = None):
+        """
+        :param name: 인덱스 이름 (응답의 _index)
+        :param documents: (_id, _source) 목록
+        :param mappings: 인덱스 매핑 ({"properties": ...})
+        :param analyzer: text 필드 기본 분석기
+        :param analyzers: 매핑의 analyzer/search_analyzer 이름별 분석기 (Analyzer.from_settings)
+        """
+        self.name = name
+        self.ids = [str(doc_id) for doc_id, _ in documents]
+        self.sources = [source for _, source in documents]
+        analyzers = {**(analyzers or {}), None: analyzer}
+        self.root = DocumentSpace(self.sources, mappings.get('properties', {}), analyzers)
+        # 점수를 쓰지 않는 정렬의 전체 문서 순서 캐시
+        self.sort_orders = {}
+    
+    def count(self) -> int:
+        """문서 수"""
+        return self.root.size
+    
+    def search(self, body: dict) -> dict:
+        """검색 + 집계 (opensearch _search 응답 형태)"""
+        start = time.perf_counter()
+        body = body or {}
+        
+        specs = self.parse_sort(body.get('sort'))
+        scoring = self.tracks_score(specs)
+        mask, scores = self.evaluate(body.get('query', {"match_all": {}}), self.root, scoring)
+        aggs_spec = body.get('aggs', body.get('aggregations'))
+        aggregations = self.aggregate(aggs_spec, mask, self.root) if aggs_spec else None
+        if 'post_filter' in body:
+            mask = mask & self.evaluate(body['post_filter'], self.root, False)[0]
+        
+        size = int(body.get('size', 10))
+        offset = int(body.get('from', 0))
+        if offset < 0:
+            offset = 0
+        if offset + size > MAX_RESULT_WINDOW:
+            raise ValueError(
+                f"Result window is too large, from + size must be less than or equal to: [{MAX_RESULT_WINDOW}]"
+            )
+        
+        docs = self.sort_docs(mask, scores, specs)
+        if body.get('search_after') is not None:
+            docs = self.apply_search_after(docs, scores, specs, body['search_after'])
+        page = docs[offset:offset + size] if size > 0 else docs[:0]
+        
+        total = int(np.count_nonzero(mask))
+        hits = {
+            "max_score": float(scores[mask].max()) if scoring and total else None,
+            "hits": self.build_hits(page, scores, specs, body)
+        }
+        total_info = self.build_total(total, body.get('track_total_hits', DEFAULT_TRACK_TOTAL_HITS))
+        if total_info is not None:
+            hits = {"total": total_info, **hits}
+        
+        result = {
+            "took": int((time.perf_counter() - start) * 1000),
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": hits
+        }
+        if aggregations is not None:
+            result["aggregations"] = aggregations
+        return result
+    
+    def build_total(self, total: int, track_total_hits) -> Optional[dict]:
+        """hits.total (track_total_hits 규칙)"""
+        if track_total_hits is False:
+            return None
+        if track_total_hits is True or total <= int(track_total_hits):
+            return {"value": total, "relation": "eq"}
+        return {"value": int(track_total_hits), "relation": "gte"}
+    
+    def build_hits(self, docs: np.ndarray, scores: Optional[np.ndarray], specs: list, body: dict) -> list:
+        """검색 결과 hit 목록 (정렬 조건이 있으면 sort 값, docvalue_fields가 있으면 fields 포함)"""
+        source_spec = body.get('_source')
+        docvalues = {}
+        for spec in body.get('docvalue_fields') or []:
+            field = spec if isinstance(spec, str) else spec['field']
+            docvalues[field] = self.root.column(field).sort_output(docs)
+        page_scores = scores[docs].tolist() if scores is not None else [None] * len(docs)
+        sort_values = None
+        if body.get('sort') is not None:
+            columns = [self.sort_output(docs, field, scores) for field, _, _ in specs]
+            sort_values = [list(values) for values in zip(*columns)]
+        
+        hits = []
+        for i, doc in enumerate(docs.tolist()):
+            hit = {"_index": self.name, "_id": self.ids[doc], "_score": page_scores[i]}
+            source = filter_source(self.sources[doc], source_spec)
+            if source is not None:
+                hit["_source"] = source
+            if sort_values is not None:
+                hit["sort"] = sort_values[i]
+            fields = {field: [values[i]] for field, values in docvalues.items() if values[i] is not None}
+            if fields:
+                hit["fields"] = fields
+            hits.append(hit)
+        return hits
+    
+    def tracks_score(self, specs: list) -> bool:
+        """정렬 조건에 _score가 있는지"""
+        return any(field == '_score' for field, _, _ in specs)
+    
+    def evaluate(self, query: dict, space: DocumentSpace, scoring: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        쿼리 → (일치 여부, 점수)
+        
+        :param scoring: False면 점수 계산 생략 (filter 문맥, 점수는 None)
+        """
+        if len(query) != 1:
+            raise UnsupportedQueryError(f"쿼리 형식 오류: {list(query)}")
+        kind, params = next(iter(query.items()))
+        
+        if kind == 'bool':
+            return self.evaluate_bool(params, space, scoring)
+        if kind == 'nested':
+            return self.evaluate_nested(params, space, scoring)
+        if kind == 'match':
+            field, value = next(iter(params.items()))
+            operator = 'or'
+            if isinstance(value, dict):
+                operator = value.get('operator', 'or').lower()
+                value = value['query']
+            column = space.column(field)
+            if isinstance(column, TextColumn):
+                return column.match(value, operator)
+            mask = column.match_terms([value])
+        elif kind == 'match_all':
+            mask = np.ones(space.size, dtype=bool)
+        elif kind == 'match_none':
+            mask = np.zeros(space.size, dtype=bool)
+        elif kind == 'term':
+            field, value = next(iter(params.items()))
+            if isinstance(value, dict):
+                value = value['value']
+            mask = space.column(field).match_terms([value])
+        elif kind == 'terms':
+            field, values = next((k, v) for k, v in params.items() if k != 'boost')
+            mask = space.column(field).match_terms(values)
+        elif kind == 'range':
+            field, bounds = next(iter(params.items()))
+            mask = space.column(field).match_range(bounds)
+        else:
+            raise UnsupportedQueryError(f"메모리 인덱스가 지원하지 않는 쿼리: {kind}")
+        
+        # term/terms/range/match_all은 점수 1.0 고정
+        return mask, mask.astype(np.float64) if scoring else None
+    
+    def evaluate_bool(self, params: dict, space: DocumentSpace, scoring: bool) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """bool 쿼리 (filter/must_not 절은 점수에 반영하지 않음)"""
+        mask = np.ones(space.size, dtype=bool)
+        scores = np.zeros(space.size, dtype=np.float64) if scoring else None
+        
+        for clause in as_list(params.get('must')):
+            matched, clause_scores = self.evaluate(clause, space, scoring)
+            mask &= matched
+            if scoring:
+                scores += clause_scores
+        for clause in as_list(params.get('filter')):
+            mask &= self.evaluate(clause, space, False)[0]
+        for clause in as_list(params.get('must_not')):
+            mask &= ~self.evaluate(clause, space, False)[0]
+        
+        should = as_list(params.get('should'))
+        if should:
+            any_should = np.zeros(space.size, dtype=bool)
+            for clause in should:
+                matched, clause_scores = self.evaluate(clause, space, scoring)
+                any_should |= matched
+                if scoring:
+                    scores += np.where(matched, clause_scores, 0.0)
+            # must/filter가 없으면 should 중 하나는 일치해야 함
+            if not params.get('must') and not params.get('filter'):
+                mask &= any_should
+        
+        if scoring:
+            scores[~mask] = 0.0
+        return mask, scores
+    
+    def evaluate_nested(self, params: dict, space: DocumentSpace, scoring: bool) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """nested 쿼리 (하위 문서 점수를 score_mode로 합산, 기본 avg)"""
+        path = params['path']
+        if path not in space.nested:
+            raise UnsupportedQueryError(f"메모리 인덱스에 없는 nested 경로: {path}")
+        child_space, parents = space.nested[path]
+        query = params['query']
+        
+        # 점수가 필요 없는 keyword terms는 값별 상위 문서 목록으로 바로 계산
+        kind, inner = next(iter(query.items()))
+        if not scoring and kind in ('term', 'terms'):
+            field, values = next((k, v) for k, v in inner.items() if k != 'boost')
+            column = child_space.column(field)
+            if isinstance(column, KeywordColumn):
+                if kind == 'term':
+                    values = [values['value'] if isinstance(values, dict) else values]
+                return column.match_parents(values, parents, space.size), None
+        
+        child_mask, child_scores = self.evaluate(query, child_space, scoring)
+        matched_parents = parents[child_mask]
+        counts = np.bincount(matched_parents, minlength=space.size)
+        mask = counts > 0
+        if not scoring:
+            return mask, None
+        
+        matched_scores = child_scores[child_mask]
+        mode = params.get('score_mode', 'avg')
+        if mode in ('avg', 'sum'):
+            scores = np.bincount(matched_parents, weights=matched_scores, minlength=space.size)
+            if mode == 'avg':
+                scores = np.divide(scores, counts, out=np.zeros(space.size), where=mask)
+        elif mode in ('max', 'min'):
+            initial = -np.inf if mode == 'max' else np.inf
+            scores = np.full(space.size, initial)
+            reduce = np.maximum if mode == 'max' else np.minimum
+            reduce.at(scores, matched_parents, matched_scores)
+            scores[~mask] = 0.0
+        else:
+            scores = mask.astype(np.float64)
+        return mask, scores
+    
+    def parse_sort(self, sort) -> list:
+        """정렬 조건 → [(필드, asc/desc, missing)]"""
+        if sort is None:
+            return [('_score', 'desc', '_last')]
+        specs = []
+        for item in as_list(sort):
+            if isinstance(item, str):
+                field, options = item, {}
+            else:
+                field, options = next(iter(item.items()))
+                if isinstance(options, str):
+                    options = {"order": options}
+            default_order = 'desc' if field == '_score' else 'asc'
+            specs.append((field, options.get('order', default_order), options.get('missing', '_last')))
+        return specs
+    
+    def sort_keys(self, docs: np.ndarray, scores: np.ndarray, specs: list) -> list:
+        """정렬 조건별 오름차순 키 배열"""
+        keys = []
+        for field, order, missing in specs:
+            if field == '_score':
+                values = scores[docs]
+            else:
+                values = self.root.column(field).sort_values(docs)
+            if order == 'desc':
+                values = -values
+            values = np.where(np.isnan(values), -np.inf if missing == '_first' else np.inf, values)
+            keys.append(values)
+        return keys
+    
+    def sort_docs(self, mask: np.ndarray, scores: np.ndarray, specs: list) -> np.ndarray:
+        """일치 문서를 정렬 순서대로"""
+        if self.tracks_score(specs):
+            docs = np.flatnonzero(mask)
+            keys = self.sort_keys(docs, scores, specs)
+            return docs[np.lexsort(keys[::-1])]
+        
+        # 점수를 쓰지 않는 정렬은 전체 순서를 한 번만 계산하고 일치 문서만 골라냄
+        signature = tuple(specs)
+        order = self.sort_orders.get(signature)
+        if order is None:
+            all_docs = np.arange(self.root.size)
+            order = all_docs[np.lexsort(self.sort_keys(all_docs, scores, specs)[::-1])]
+            self.sort_orders[signature] = order
+        return order[mask[order]]
+    
+    def apply_search_after(self, docs: np.ndarray, scores: np.ndarray, specs: list, after: list) -> np.ndarray:
+        """search_after 값보다 뒤의 문서만"""
+        if len(after) != len(specs):
+            raise ValueError("search_after 값 개수가 정렬 조건 개수와 다릅니다.")
+        
+        keys = self.sort_keys(docs, scores, specs)
+        greater = np.zeros(len(docs), dtype=bool)
+        equal = np.ones(len(docs), dtype=bool)
+        for values, (field, order, missing), value in zip(keys, specs, after):
+            if field == '_score':
+                key = np.nan if value is None else float(value)
+            else:
+                key = self.root.column(field).after_key(value)
+            if order == 'desc':
+                key = -key
+            if np.isnan(key):
+                key = -np.inf if missing == '_first' else np.inf
+            greater |= equal & (values > key)
+            equal &= values == key
+        return docs[greater]
+    
+    def sort_output(self, docs: np.ndarray, field: str, scores: np.ndarray) -> list:
+        """hit의 sort 값 (필드별)"""
+        if field == '_score':
+            return scores[docs].tolist()
+        return self.root.column(field).sort_output(docs)
+    
+    def aggregate(self, spec: dict, mask: np.ndarray, space: DocumentSpace, parent: Optional[tuple] = None) -> dict:
+        """
+        집계 (terms, date_histogram, filter, nested, reverse_nested, avg/sum/min/max/value_count)
+        
+        :param parent: nested 집계 안이면 (상위 문서 공간, 하위 문서별 상위 문서 번호)
+        """
+        result = {}
+        for name, agg in spec.items():
+            sub = agg.get('aggs', agg.get('aggregations'))
+            kind, params = next((k, v) for k, v in agg.items() if k not in ('aggs', 'aggregations', 'meta'))
+            
+            if kind == 'terms':
+                result[name] = self.aggregate_terms(params, sub, mask, space, parent)
+            elif kind == 'date_histogram':
+                result[name] = self.aggregate_date_histogram(params, sub, mask, space, parent)
+            elif kind == 'filter':
+                matched = mask & self.evaluate(params, space, False)[0]
+                bucket = {"doc_count": int(np.count_nonzero(matched))}
+                if sub:
+                    bucket.update(self.aggregate(sub, matched, space, parent))
+                result[name] = bucket
+            elif kind == 'nested':
+                if params['path'] not in space.nested:
+                    raise UnsupportedQueryError(f"메모리 인덱스에 없는 nested 경로: {params['path']}")
+                # 일치한 상위 문서의 하위 문서 전체
+                child_space, parents = space.nested[params['path']]
+                child_mask = mask[parents]
+                bucket = {"doc_count": int(np.count_nonzero(child_mask))}
+                if sub:
+                    bucket.update(self.aggregate(sub, child_mask, child_space, (space, parents)))
+                result[name] = bucket
+            elif kind == 'reverse_nested':
+                if parent is None or params.get('path'):
+                    raise UnsupportedQueryError("reverse_nested는 nested 집계 안에서 상위 문서로만 지원")
+                # 일치한 하위 문서의 상위 문서 (중복 제거)
+                parent_space, parents = parent
+                parent_mask = np.zeros(parent_space.size, dtype=bool)
+                parent_mask[parents[mask]] = True
+                bucket = {"doc_count": int(np.count_nonzero(parent_mask))}
+                if sub:
+                    bucket.update(self.aggregate(sub, parent_mask, parent_space))
+                result[name] = bucket
+            elif kind in ('avg', 'sum', 'min', 'max', 'value_count'):
+                result[name] = self.aggregate_metric(kind, params, mask, space)
+            else:
+                raise UnsupportedQueryError(f"메모리 인덱스가 지원하지 않는 집계: {kind}")
+        return result
+    
+    def aggregate_terms(self, params: dict, sub: Optional[dict], mask: np.ndarray, space: DocumentSpace,
+                        parent: Optional[tuple] = None) -> dict:
+        """terms 집계 (문서 수 내림차순, 같으면 키 오름차순)"""
+        column = space.column(params['field'])
+        if not isinstance(column, KeywordColumn):
+            raise UnsupportedQueryError(f"keyword 필드만 terms 집계 가능: {params['field']}")
+        
+        codes = column.codes[mask]
+        counts = np.bincount(codes[codes >= 0], minlength=len(column.vocab))
+        # 코드 순서 = 키 순서이므로 안정 정렬로 같은 문서 수는 키 오름차순
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] >= params.get('min_doc_count', 1)]
+        size = params.get('size', 10)
+        
+        buckets = []
+        for code in order[:size].tolist():
+            bucket = {"key": column.vocab[code], "doc_count": int(counts[code])}
+            if sub:
+                bucket.update(self.aggregate(sub, mask & (column.codes == code), space, parent))
+            buckets.append(bucket)
+        
+        return {
+            "doc_count_error_upper_bound": 0,
+            "sum_other_doc_count": int(counts[order[size:]].sum()),
+            "buckets": buckets
+        }
+    
+    def aggregate_date_histogram(self, params: dict, sub: Optional[dict], mask: np.ndarray, space: DocumentSpace,
+                                 parent: Optional[tuple] = None) -> dict:
+        """date_histogram 집계 (calendar_interval: year/month/day)"""
+        column = space.column(params['field'])
+        interval = params.get('calendar_interval', params.get('interval'))
+        unit = CALENDAR_UNITS.get(interval)
+        if not isinstance(column, DateColumn) or unit is None:
+            raise UnsupportedQueryError(f"지원하지 않는 date_histogram: {params}")
+        fmt = to_strftime(params['format']) if 'format' in params else column.format
+        
+        truncated = column.truncate(unit)
+        # NaT는 int64 최소값이므로 정수로 다루고 제외
+        units = truncated.view(np.int64)
+        valid = mask & ~np.isnat(truncated)
+        keys, counts = np.unique(units[valid], return_counts=True)
+        min_doc_count = params.get('min_doc_count', 0)
+        if min_doc_count == 0 and len(keys):
+            # 빈 구간도 포함
+            full = np.arange(keys[0], keys[-1] + 1)
+            full_counts = np.zeros(len(full), dtype=np.int64)
+            full_counts[keys - keys[0]] = counts
+            keys, counts = full, full_counts
+        
+        starts = keys.astype(f'datetime64[{unit}]')
+        epoch_millis = starts.astype('datetime64[ms]').astype(np.int64).tolist()
+        buckets = []
+        for i, (start, count) in enumerate(zip(starts.tolist(), counts.tolist())):
+            if count < min_doc_count:
+                continue
+            bucket = {
+                "key_as_string": start.strftime(fmt),
+                "key": epoch_millis[i],
+                "doc_count": count
+            }
+            if sub:
+                bucket.update(self.aggregate(sub, valid & (units == keys[i]), space, parent))
+            buckets.append(bucket)
+        return {"buckets": buckets}
+    
+    def aggregate_metric(self, kind: str, params: dict, mask: np.ndarray, space: DocumentSpace) -> dict:
+        """단일 값 집계 (값이 없으면 None, value_count는 0)"""
+        column = space.column(params['field'])
+        if not isinstance(column, NumericColumn):
+            raise UnsupportedQueryError(f"숫자 필드만 {kind} 집계 가능: {params['field']}")
+        values = column.values[mask]
+        values = values[~np.isnan(values)]
+        
+        if kind == 'value_count':
+            return {"value": int(len(values))}
+        if kind == 'sum':
+            return {"value": float(values.sum())}
+        if not len(values):
+            return {"value": None}
+        reduce = {"avg": np.mean, "min": np.min, "max": np.max}[kind]
+        return {"value": float(reduce(values))}
+
+
+def as_list(value) -> list:
+    """단일 값/목록 → 목록"""
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
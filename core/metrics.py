@@ -0,0 +1,195 @@
+"""
+Prometheus 메트릭
+
+- 라우트별 요청 수/오류 수/지연 시간 (미들웨어에서 기록)
+- 구간별 지연 시간 (쿼리 빌드, opensearch 호출, 응답 변환, 직렬화)
+- opensearch 응답의 took, 커넥션 풀 사용량
+- 주가 틱 반영 (수신/반영 건수, 대기 건수, 반영 지연)
+
+여러 uvicorn 워커를 쓰면 PROMETHEUS_MULTIPROC_DIR을 지정해 워커 합산 값을 노출
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry,
+    Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+REQUEST_COUNT = Counter(
+    "search_api_requests_total",
+    "API 요청 수",
+    ["method", "route", "status"]
+)
+
+REQUEST_LATENCY = Histogram(
+    "search_api_request_duration_seconds",
+    "API 요청 처리 시간",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_LATENCY = Histogram(
+    "search_api_stage_duration_seconds",
+    "요청 처리 구간별 시간",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+OPENSEARCH_TOOK = Histogram(
+    "search_api_opensearch_took_seconds",
+    "opensearch가 보고한 쿼리 실행 시간 (took)",
+    ["operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+# 주가 틱 수신 → 반영 지연 버킷 (초)
+PRICE_LAG_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+PRICE_TICKS = Counter(
+    "search_api_price_ticks_total",
+    "수신한 주가 틱 수"
+)
+
+PRICE_UPDATES = Counter(
+    "search_api_price_updates_total",
+    "주가 부분 업데이트 결과 (applied, noop, retried, failed)",
+    ["result"]
+)
+
+PRICE_PENDING = Gauge(
+    "search_api_price_updates_pending",
+    "반영 대기 중인 회사 수 (id별로 병합된 주가)"
+)
+
+PRICE_LAG = Histogram(
+    "search_api_price_update_lag_seconds",
+    "주가 틱 발생(ts, 없으면 수신 시각)부터 opensearch 반영까지 걸린 시간",
+    buckets=PRICE_LAG_BUCKETS
+)
+
+POOL_CONNECTIONS = Gauge(
+    "search_api_opensearch_pool_connections",
+    "opensearch 커넥션 풀 사용량 (비동기 클라이언트)",
+    ["state"]
+)
+
+# 미리 만들어 둔 라벨별 메트릭 (요청마다 labels() 조회를 피함)
+_stages = {}
+_tooks = {}
+
+
+def stage(name: str):
+    """구간 히스토그램"""
+    metric = _stages.get(name)
+    if metric is None:
+        metric = _stages[name] = STAGE_LATENCY.labels(name)
+    return metric
+
+
+@contextmanager
+def stage_timer(name: str):
+    """
+    구간 시간 측정
+    
+    사용법:
+        with stage_timer("search.build_query"):
+            query = self.build_query(request)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage(name).observe(time.perf_counter() - start)
+
+
+def observe_took(operation: str, result: dict):
+    """opensearch 응답의 took(ms) 기록"""
+    took = result.get('took')
+    if took is None:
+        return
+    metric = _tooks.get(operation)
+    if metric is None:
+        metric = _tooks[operation] = OPENSEARCH_TOOK.labels(operation)
+    metric.observe(took / 1000)
+
+
+def observe_request(method: str, route: str, status: int, duration: float):
+    """API 요청 기록"""
+    REQUEST_COUNT.labels(method, route, str(status)).inc()
+    REQUEST_LATENCY.labels(method, route).observe(duration)
+
+
+def register_pool_metrics(os_client):
+    """
+    커넥션 풀 사용량 게이지 등록 (수집 시점에 계산)
+    
+    :param os_client: AsyncOpenSearchClient
+    """
+    def count(state: str) -> int:
+        client = os_client.client
+        if client is None:
+            return 0
+        total = 0
+        for conn in client.transport.connection_pool.connections:
+            connector = getattr(getattr(conn, 'session', None), 'connector', None)
+            if connector is None:
+                continue
+            if state == 'in_use':
+                total += len(getattr(connector, '_acquired', ()))
+            else:
+                total += getattr(connector, 'limit', 0) or 0
+        return total
+    
+    POOL_CONNECTIONS.labels('in_use').set_function(lambda: count('in_use'))
+    POOL_CONNECTIONS.labels('limit').set_function(lambda: count('limit'))
+
+
+def render_metrics() -> tuple:
+    """/metrics 응답 본문과 content-type"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/상태/지연 시간 기록 (ASGI 미들웨어)
+    
+    - 라우트 템플릿 경로(/search/companies 등)를 라벨로 사용
+    - BaseHTTPMiddleware를 거치지 않아 요청당 부하가 작음
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get('route')
+            path = getattr(route, 'path', 'unmatched')
+            if path != '/metrics':
+                observe_request(scope['method'], path, status, time.perf_counter() - start)
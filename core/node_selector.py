@@ -0,0 +1,103 @@
+"""
+OpenSearch 노드 선택 모듈 (멀티 노드 로드 밸런싱)
+"""
+import random
+import time
+
+from opensearchpy import AIOHttpConnection, ConnectionSelector, RoundRobinSelector
+from opensearchpy.connection import Urllib3HttpConnection
+
+
+# 응답 시간 이동 평균 가중치 (최근 요청 비중)
+LATENCY_EWMA_ALPHA = 0.3
+
+# 최소 지연 선택기에서 다른 노드를 재측정할 확률
+LATENCY_EXPLORE_RATIO = 0.05
+
+# 연결 실패/타임아웃/5xx 응답 시 응답 시간에 더하는 벌점(초)
+# 빠르게 연결을 거부하는 노드가 가장 빠른 노드로 보이지 않도록 함
+LATENCY_FAILURE_PENALTY = 1.0
+
+
+class LatencyTrackingMixin:
+    """요청 응답 시간을 지수 이동 평균(EWMA)으로 기록"""
+    
+    latency = 0.0
+    
+    def record_latency(self, duration: float):
+        """응답 시간 기록 (초)"""
+        if self.latency == 0.0:
+            self.latency = duration
+        else:
+            self.latency += LATENCY_EWMA_ALPHA * (duration - self.latency)
+    
+    def record_failure(self, error: Exception, duration: float):
+        """
+        실패한 요청 기록
+        
+        - 노드가 응답한 4xx(잘못된 쿼리, 만료된 PIT 등)는 응답 시간 그대로
+        - 연결 실패/타임아웃(status_code 'N/A')과 5xx는 벌점을 더해 기록
+        """
+        status = getattr(error, 'status_code', None)
+        if isinstance(status, int) and status < 500:
+            self.record_latency(duration)
+        else:
+            self.record_latency(duration + LATENCY_FAILURE_PENALTY)
+
+
+class LatencyTrackingConnection(LatencyTrackingMixin, Urllib3HttpConnection):
+    """응답 시간을 기록하는 동기 커넥션"""
+    
+    def perform_request(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = super().perform_request(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e, time.perf_counter() - start)
+            raise
+        self.record_latency(time.perf_counter() - start)
+        return result
+
+
+class AsyncLatencyTrackingConnection(LatencyTrackingMixin, AIOHttpConnection):
+    """응답 시간을 기록하는 비동기 커넥션"""
+    
+    async def perform_request(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = await super().perform_request(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(e, time.perf_counter() - start)
+            raise
+        self.record_latency(time.perf_counter() - start)
+        return result
+
+
+class LeastLatencySelector(ConnectionSelector):
+    """
+    응답 시간 이동 평균이 가장 낮은 노드 선택
+    
+    - 느려졌던 노드가 회복되었는지 알 수 있도록 일정 비율은 임의 노드 선택
+    """
+    
+    def select(self, connections):
+        if len(connections) > 1 and random.random() < LATENCY_EXPLORE_RATIO:
+            return random.choice(connections)
+        return min(connections, key=lambda c: getattr(c, 'latency', 0.0))
+
+
+# OPENSEARCH_SELECTOR 값 → 선택기 클래스
+SELECTORS = {
+    'round_robin': RoundRobinSelector,
+    'least_latency': LeastLatencySelector,
+}
+
+
+def get_selector_class(name: str):
+    """선택기 이름으로 클래스 조회"""
+    if name not in SELECTORS:
+        raise ValueError(
+            f"지원하지 않는 OPENSEARCH_SELECTOR: {name} "
+            f"(가능한 값: {', '.join(SELECTORS)})"
+        )
+    return SELECTORS[name]
@@ -1,43 +1,218 @@
 """
 OpenSearch 클라이언트 모듈
 """
+import asyncio
 import os
-from typing import Generator
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+import threading
+from typing import Callable, Generator, Optional
+from opensearchpy import OpenSearch, AsyncOpenSearch
+from opensearchpy.exceptions import ConnectionError as TransportConnectionError, TransportError
+from opensearchpy.helpers import bulk, parallel_bulk, scan, streaming_bulk
 from dotenv import load_dotenv
 
+from core.logger import get_logger
+from core.node_selector import (
+    LeastLatencySelector, LatencyTrackingConnection,
+    AsyncLatencyTrackingConnection, get_selector_class
+)
+
+logger = get_logger("search_api.opensearch")
+
+# 프로세스 공용 클라이언트
+_shared_client = None
+_shared_async_client = None
+_shared_lock = threading.Lock()
+
+# 재연결로 교체된 클라이언트를 닫기까지 기다리는 시간(초)
+# 다른 스레드/코루틴이 교체 전에 보낸 요청이 끝나도록 요청 timeout(30초)보다 길게 둠
+RETIRED_CLIENT_CLOSE_DELAY = 60
+
+
+def get_hosts() -> list:
+    """
+    접속 노드 목록
+    
+    - OPENSEARCH_HOSTS="host1:9200,host2:9201,..." (멀티 노드)
+    - 없으면 OPENSEARCH_HOST/OPENSEARCH_PORT 단일 노드
+    """
+    load_dotenv()
+    default_port = int(os.getenv('OPENSEARCH_PORT', 9200))
+    hosts_env = os.getenv('OPENSEARCH_HOSTS', '').strip()
+    if not hosts_env:
+        return [{
+            'host': os.getenv('OPENSEARCH_HOST', 'localhost'),
+            'port': default_port
+        }]
+    
+    hosts = []
+    for item in hosts_env.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.partition(':')
+        hosts.append({'host': host, 'port': int(port) if port else default_port})
+    return hosts
+
+
+def get_client_options() -> dict:
+    """
+    동기/비동기 클라이언트 공통 접속 옵션
+    
+    - OPENSEARCH_SELECTOR: 노드 선택 방식 (round_robin, least_latency)
+    - OPENSEARCH_SNIFF: 노드 스니핑 사용 여부 (시작 시 + 연결 실패 시 + 주기적)
+    - OPENSEARCH_SNIFF_INTERVAL: 주기적 스니핑 간격(초)
+    - OPENSEARCH_DEAD_TIMEOUT: 실패한 노드를 제외하는 기본 시간(초, 연속 실패 시 지수 증가)
+    - OPENSEARCH_MAX_RETRIES: 다른 노드로 재시도하는 최대 횟수
+    """
+    load_dotenv()
+    sniff = os.getenv('OPENSEARCH_SNIFF', 'false').lower() == 'true'
+    return {
+        'hosts': get_hosts(),
+        'http_auth': (
+            os.getenv('OPENSEARCH_USERNAME', 'admin'),
+            os.getenv('OPENSEARCH_PASSWORD')
+        ),
+        'use_ssl': os.getenv('OPENSEARCH_USE_SSL', 'true').lower() == 'true',
+        'verify_certs': False,
+        'ssl_show_warn': False,
+        'timeout': 30,
+        # 노드 선택 및 장애 노드 처리
+        'selector_class': get_selector_class(os.getenv('OPENSEARCH_SELECTOR', 'round_robin')),
+        'dead_timeout': float(os.getenv('OPENSEARCH_DEAD_TIMEOUT', 60)),
+        'max_retries': int(os.getenv('OPENSEARCH_MAX_RETRIES', 3)),
+        'retry_on_timeout': True,
+        # 노드 스니핑
+        'sniff_on_start': sniff,
+        'sniff_on_connection_fail': sniff,
+        'sniffer_timeout': float(os.getenv('OPENSEARCH_SNIFF_INTERVAL', 60)) if sniff else None
+    }
+
+
+def uses_least_latency(options: dict) -> bool:
+    """응답 시간 기록용 커넥션이 필요한지 여부"""
+    return options['selector_class'] is LeastLatencySelector
+
+
+def get_pool_maxsize() -> int:
+    """노드당 커넥션 풀 크기 (OPENSEARCH_POOL_MAXSIZE)"""
+    load_dotenv()
+    return int(os.getenv('OPENSEARCH_POOL_MAXSIZE', 50))
+
+
+def get_health_check_interval() -> float:
+    """백그라운드 헬스 체크 주기(초) (OPENSEARCH_HEALTH_CHECK_INTERVAL)"""
+    load_dotenv()
+    return float(os.getenv('OPENSEARCH_HEALTH_CHECK_INTERVAL', 10))
+
+
+class PitExpiredError(ValueError):
+    """커서의 point-in-time이 만료되었거나 없음 (첫 페이지부터 다시 요청)"""
+
+
+class PitLimitError(RuntimeError):
+    """열 수 있는 point-in-time 수 초과 (search.max_open_pit_context 또는 워커별 제한)"""
+
+
+def translate_pit_error(e: TransportError) -> Optional[Exception]:
+    """PIT 요청 오류 → PitExpiredError/PitLimitError (해당하지 않으면 None)"""
+    text = f"{e.error} {e.info}"
+    if e.status_code == 404 or 'search_context_missing' in text:
+        return PitExpiredError("커서가 만료되었습니다. 첫 페이지부터 다시 요청하세요.")
+    if e.status_code == 429 or 'max_open_pit_context' in text:
+        return PitLimitError("열린 커서가 너무 많습니다. 잠시 후 첫 페이지부터 다시 요청하세요.")
+    return None
+
+
+def build_msearch_body(index_name: str, bodies: list) -> list:
+    """_msearch 요청 본문 (검색마다 헤더 + 쿼리)"""
+    operations = []
+    for body in bodies:
+        operations.append({"index": index_name})
+        operations.append(body)
+    return operations
+
+
+def get_opensearch_client() -> 'OpenSearchClient':
+    """프로세스 공용 동기 클라이언트"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = OpenSearchClient()
+    return _shared_client
+
+
+def get_async_opensearch_client() -> 'AsyncOpenSearchClient':
+    """프로세스 공용 비동기 클라이언트"""
+    global _shared_async_client
+    if _shared_async_client is None:
+        with _shared_lock:
+            if _shared_async_client is None:
+                _shared_async_client = AsyncOpenSearchClient()
+    return _shared_async_client
+
 
 class OpenSearchClient:
-    """opensearch 클라이언트 (자동 재연결)"""
+    """
+    opensearch 클라이언트 (자동 재연결)
+    
+    - 요청마다 ping 하지 않고 생성된 클라이언트를 재사용
+    - 연결 오류가 나면 클라이언트를 새로 만들어 한 번 재시도
+    """
     
     def __init__(self):
         load_dotenv()
         self.client = None
+        self.lock = threading.Lock()
     
     def create_client(self) -> OpenSearch:
         """opensearch 클라이언트 생성"""
-        return OpenSearch(
-            hosts=[{
-                'host': os.getenv('OPENSEARCH_HOST', 'localhost'),
-                'port': int(os.getenv('OPENSEARCH_PORT', 9200))
-            }],
-            http_auth=(
-                os.getenv('OPENSEARCH_USERNAME', 'admin'),
-                os.getenv('OPENSEARCH_PASSWORD')
-            ),
-            use_ssl=os.getenv('OPENSEARCH_USE_SSL', 'true').lower() == 'true',
-            verify_certs=False,
-            ssl_show_warn=False,
-            timeout=30
-        )
+        options = get_client_options()
+        if uses_least_latency(options):
+            options['connection_class'] = LatencyTrackingConnection
+        return OpenSearch(pool_maxsize=get_pool_maxsize(), **options)
     
     def get_client(self) -> OpenSearch:
-        """연결 확인 후 클라이언트 반환 (필요시 재연결)"""
-        if self.client is None or not self.ping():
-            self.client = self.create_client()
+        """클라이언트 반환 (없으면 생성)"""
+        if self.client is None:
+            with self.lock:
+                if self.client is None:
+                    self.client = self.create_client()
         return self.client
     
+    def reconnect(self, failed: OpenSearch = None):
+        """
+        기존 클라이언트를 버리고 새로 생성
+        
+        :param failed: 오류가 난 클라이언트 (이미 다른 요청이 교체했으면 스킵)
+        """
+        with self.lock:
+            if failed is not None and self.client is not failed:
+                return
+            old, self.client = self.client, self.create_client()
+        if old is not None:
+            self.close_later(old)
+    
+    def close_later(self, old: OpenSearch):
+        """
+        교체된 클라이언트를 RETIRED_CLIENT_CLOSE_DELAY 후에 닫기
+        
+        - 공용 클라이언트라 바로 닫으면 다른 스레드의 진행 중인 요청이 실패하고 연쇄 재연결됨
+        """
+        timer = threading.Timer(RETIRED_CLIENT_CLOSE_DELAY, old.close)
+        timer.daemon = True
+        timer.start()
+    
+    def run(self, func: Callable[[OpenSearch], dict]) -> dict:
+        """요청 실행 (연결 오류 시 재연결 후 1회 재시도)"""
+        client = self.get_client()
+        try:
+            return func(client)
+        except TransportConnectionError as e:
+            logger.warning("[OpenSearch] 연결 오류, 재연결 후 재시도: %s", e)
+            self.reconnect(client)
+            return func(self.get_client())
+    
     def ping(self) -> bool:
         """연결 상태 확인"""
         if self.client is None:
@@ -61,7 +236,7 @@ class OpenSearchClient:
     
     def index_exists(self, index_name: str) -> bool:
         """인덱스 존재 확인"""
-        return self.get_client().indices.exists(index=index_name)
+        return self.run(lambda client: client.indices.exists(index=index_name))
     
     def create_index(self, index_name: str, body: dict) -> dict:
         """인덱스 생성"""
@@ -76,19 +251,68 @@ class OpenSearchClient:
             "message": "Index does not exist"
         }
     
+    def list_indices(self, pattern: str) -> list:
+        """패턴(와일드카드)에 맞는 인덱스 이름"""
+        return list(self.run(lambda client: client.indices.get(index=pattern)).keys())
+    
+    def get_alias_indices(self, alias: str) -> list:
+        """별칭이 가리키는 인덱스 (별칭이 없으면 빈 목록)"""
+        if not self.run(lambda client: client.indices.exists_alias(name=alias)):
+            return []
+        return list(self.run(lambda client: client.indices.get_alias(name=alias)).keys())
+    
+    def update_aliases(self, actions: list) -> dict:
+        """별칭 변경 (actions 전체를 원자적으로 적용)"""
+        return self.run(lambda client: client.indices.update_aliases(body={"actions": actions}))
+    
     def refresh_index(self, index_name: str) -> dict:
         """인덱스 리프레시"""
         return self.get_client().indices.refresh(index=index_name)
     
     def search(self, index_name: str, body: dict) -> dict:
-        """검색 실행"""
-        return self.get_client().search(index=index_name, body=body)
+        """검색 실행 (PIT 검색이면 index_name=None, 만료된 PIT은 PitExpiredError)"""
+        try:
+            return self.run(lambda client: client.search(index=index_name, body=body))
+        except TransportError as e:
+            error = translate_pit_error(e) if index_name is None else None
+            if error is None:
+                raise
+            raise error from e
+    
+    def msearch(self, index_name: str, bodies: list) -> list:
+        """여러 검색을 요청 한 번으로 실행 (요청 순서대로 응답, 실패한 항목은 error/status 포함)"""
+        result = self.run(lambda client: client.msearch(body=build_msearch_body(index_name, bodies)))
+        return result['responses']
+    
+    def create_pit(self, index_name: str, keep_alive: str) -> str:
+        """point-in-time 생성 (열린 PIT 수 제한을 넘으면 PitLimitError)"""
+        try:
+            result = self.run(lambda client: client.create_pit(index=index_name, keep_alive=keep_alive))
+        except TransportError as e:
+            error = translate_pit_error(e)
+            if error is None:
+                raise
+            raise error from e
+        return result['pit_id']
+    
+    def delete_pit(self, pit_id: str) -> dict:
+        """point-in-time 삭제"""
+        return self.run(lambda client: client.delete_pit(body={"pit_id": [pit_id]}))
     
     def count(self, index_name: str) -> int:
         """문서 수 조회"""
-        result = self.get_client().count(index=index_name)
+        result = self.run(lambda client: client.count(index=index_name))
         return result['count']
     
+    def scan_documents(self, index_name: str, query: dict = None) -> Generator:
+        """전체 문서 순회 (scroll)"""
+        return scan(
+            self.get_client(),
+            index=index_name,
+            query=query or {"query": {"match_all": {}}},
+            size=1000
+        )
+    
     def bulk_insert(self, actions: Generator) -> tuple:
         """벌크 삽입"""
         return bulk(
@@ -97,3 +321,192 @@ class OpenSearchClient:
             raise_on_error=False,
             stats_only=False
         )
+    
+    def parallel_bulk_insert(self, actions: Generator, thread_count: int = 4,
+                             chunk_size: int = 500, max_chunk_bytes: int = 10 * 1024 * 1024) -> Generator:
+        """
+        벌크 삽입 (청크 단위 병렬 전송, 문서별 (성공 여부, 결과) 순회)
+        
+        - thread_count가 1이면 streaming_bulk, 2 이상이면 parallel_bulk
+        """
+        options = {
+            'chunk_size': chunk_size,
+            'max_chunk_bytes': max_chunk_bytes,
+            'raise_on_error': False,
+            'raise_on_exception': False
+        }
+        if thread_count <= 1:
+            return streaming_bulk(self.get_client(), actions, **options)
+        return parallel_bulk(
+            self.get_client(),
+            actions,
+            thread_count=thread_count,
+            queue_size=thread_count * 2,
+            **options
+        )
+    
+    def get_index_settings(self, index_name: str) -> dict:
+        """인덱스 설정 (index.* 하위, 기본값은 포함하지 않음)"""
+        result = self.get_client().indices.get_settings(index=index_name)
+        return next(iter(result.values()))['settings']['index']
+    
+    def update_index_settings(self, index_name: str, settings: dict) -> dict:
+        """인덱스 동적 설정 변경 (값이 None이면 기본값으로 되돌림)"""
+        return self.get_client().indices.put_settings(index=index_name, body={"index": settings})
+    
+    def force_merge(self, index_name: str, max_num_segments: int = 1) -> dict:
+        """세그먼트 병합 (적재 후 검색 성능용, 끝날 때까지 대기)"""
+        return self.get_client().indices.forcemerge(
+            index=index_name,
+            max_num_segments=max_num_segments,
+            request_timeout=600
+        )
+
+
+class AsyncOpenSearchClient:
+    """
+    opensearch 비동기 클라이언트 (API 요청 경로용)
+    
+    - AsyncOpenSearch(aiohttp) 기반으로 이벤트 루프를 막지 않음
+    - 스크립트(scripts/)는 동기 OpenSearchClient를 그대로 사용
+    - 요청 경로에서는 ping 하지 않고, 연결 오류 및 백그라운드 헬스 체크로 재연결
+    """
+    
+    def __init__(self):
+        load_dotenv()
+        self.client = None
+        self.health_task = None
+        # 교체된 클라이언트 → 닫기 대기 태스크
+        self.retired = {}
+    
+    def create_client(self) -> AsyncOpenSearch:
+        """opensearch 비동기 클라이언트 생성"""
+        options = get_client_options()
+        if uses_least_latency(options):
+            options['connection_class'] = AsyncLatencyTrackingConnection
+        return AsyncOpenSearch(maxsize=get_pool_maxsize(), **options)
+    
+    async def get_client(self) -> AsyncOpenSearch:
+        """클라이언트 반환 (없으면 생성)"""
+        if self.client is None:
+            self.client = self.create_client()
+        return self.client
+    
+    async def reconnect(self, failed: AsyncOpenSearch = None):
+        """
+        기존 클라이언트를 버리고 새로 생성
+        
+        :param failed: 오류가 난 클라이언트 (이미 다른 요청이 교체했으면 스킵)
+        """
+        if failed is not None and self.client is not failed:
+            return
+        old, self.client = self.client, self.create_client()
+        if old is not None:
+            self.close_later(old)
+    
+    def close_later(self, old: AsyncOpenSearch):
+        """
+        교체된 클라이언트를 RETIRED_CLIENT_CLOSE_DELAY 후에 닫기
+        
+        - 바로 닫으면 다른 코루틴이 쓰는 aiohttp 세션이 끊겨 요청이 실패하고 연쇄 재연결됨
+        """
+        self.retired[old] = asyncio.create_task(self.close_retired(old))
+    
+    async def close_retired(self, old: AsyncOpenSearch):
+        """대기 후 닫기"""
+        await asyncio.sleep(RETIRED_CLIENT_CLOSE_DELAY)
+        self.retired.pop(old, None)
+        await old.close()
+    
+    async def run(self, func: Callable[[AsyncOpenSearch], object]) -> dict:
+        """요청 실행 (연결 오류 시 재연결 후 1회 재시도)"""
+        client = await self.get_client()
+        try:
+            return await func(client)
+        except TransportConnectionError as e:
+            logger.warning("[OpenSearch] 연결 오류, 재연결 후 재시도: %s", e)
+            await self.reconnect(client)
+            return await func(await self.get_client())
+    
+    async def ping(self) -> bool:
+        """연결 상태 확인"""
+        if self.client is None:
+            return False
+        try:
+            return await self.client.ping()
+        except Exception:
+            return False
+    
+    async def health_check(self, interval: float):
+        """주기적으로 ping 하여 끊긴 연결을 백그라운드에서 재연결"""
+        while True:
+            await asyncio.sleep(interval)
+            client = self.client
+            if client is not None and not await self.ping():
+                logger.warning("[OpenSearch] 헬스 체크 실패, 재연결")
+                await self.reconnect(client)
+    
+    def start_health_check(self, interval: float = None):
+        """백그라운드 헬스 체크 시작 (이벤트 루프 안에서 호출)"""
+        if self.health_task is None:
+            if interval is None:
+                interval = get_health_check_interval()
+            self.health_task = asyncio.create_task(self.health_check(interval))
+    
+    async def search(self, index_name: str, body: dict) -> dict:
+        """검색 실행 (PIT 검색이면 index_name=None, 만료된 PIT은 PitExpiredError)"""
+        try:
+            return await self.run(lambda client: client.search(index=index_name, body=body))
+        except TransportError as e:
+            error = translate_pit_error(e) if index_name is None else None
+            if error is None:
+                raise
+            raise error from e
+    
+    async def msearch(self, index_name: str, bodies: list) -> list:
+        """여러 검색을 요청 한 번으로 실행 (요청 순서대로 응답, 실패한 항목은 error/status 포함)"""
+        result = await self.run(lambda client: client.msearch(body=build_msearch_body(index_name, bodies)))
+        return result['responses']
+    
+    async def create_pit(self, index_name: str, keep_alive: str) -> str:
+        """point-in-time 생성 (열린 PIT 수 제한을 넘으면 PitLimitError)"""
+        try:
+            result = await self.run(
+                lambda client: client.create_pit(index=index_name, keep_alive=keep_alive)
+            )
+        except TransportError as e:
+            error = translate_pit_error(e)
+            if error is None:
+                raise
+            raise error from e
+        return result['pit_id']
+    
+    async def delete_pit(self, pit_id: str) -> dict:
+        """point-in-time 삭제"""
+        return await self.run(lambda client: client.delete_pit(body={"pit_id": [pit_id]}))
+    
+    async def count(self, index_name: str) -> int:
+        """문서 수 조회"""
+        result = await self.run(lambda client: client.count(index=index_name))
+        return result['count']
+    
+    async def bulk(self, operations: list) -> dict:
+        """
+        벌크 요청 한 번 전송 (문서별 결과는 응답 items)
+        
+        - refresh 하지 않음 (index.refresh_interval 주기로 반영)
+        """
+        return await self.run(lambda client: client.bulk(body=operations))
+    
+    async def close(self):
+        """헬스 체크 중지 및 커넥션 풀 종료 (교체된 클라이언트 포함)"""
+        if self.health_task is not None:
+            self.health_task.cancel()
+            self.health_task = None
+        retired, self.retired = self.retired, {}
+        for old, task in retired.items():
+            task.cancel()
+            await old.close()
+        if self.client is not None:
+            client, self.client = self.client, None
+            await client.close()
@@ -0,0 +1,139 @@
+"""
+대시보드 롤업 (국가별/설립 연도별 집계를 적재 시점에 미리 계산)
+
+- 국가별 회사 수 + 지난주 주가 합계/개수, 설립 연도별 회사 분류별 회사 수
+- 데이터 로드(scripts/load_data.py, scripts/reindex.py)가 원본 문서를 읽으면서 계산하여 sqlite에 저장
+  (DASHBOARD_ROLLUP_DB, 기본 cache/dashboard_rollup.sqlite3)
+- 집계 서비스는 롤업이 있으면 전체 문서 집계 대신 롤업으로 응답하고, 없으면 집계 쿼리 실행
+- 적재 시작 시 지우고 끝나면 저장하므로 적재가 중간에 실패하면 집계 쿼리로 돌아감
+- 주가 틱(/prices/ticks)은 now_stock_price만 바꾸므로 롤업에 영향 없음
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from core.cache import CACHE_DIR
+
+
+def get_rollup_path() -> Path:
+    """롤업 파일 위치"""
+    load_dotenv()
+    return Path(os.getenv('DASHBOARD_ROLLUP_DB', CACHE_DIR / 'dashboard_rollup.sqlite3'))
+
+
+class DashboardRollup:
+    """
+    국가별/연도별 누적 집계
+    
+    - countries: 국가 → {"count", "price_sum", "price_count"} (주가 없는 문서는 평균에서 제외)
+    - years: 설립 연도 → {"count", "types": {회사 분류 → 회사 수}}
+    """
+    
+    def __init__(self, total: int = 0, countries: dict = None, years: dict = None):
+        self.total = total
+        self.countries = countries or {}
+        self.years = years or {}
+    
+    @classmethod
+    def from_documents(cls, docs: Iterable[dict]) -> 'DashboardRollup':
+        """문서 목록으로 계산"""
+        rollup = cls()
+        for doc in docs:
+            rollup.add(doc)
+        return rollup
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DashboardRollup':
+        """저장 형태 → 롤업"""
+        return cls(data['total'], data['countries'], data['years'])
+    
+    def add(self, doc: dict):
+        """문서 하나 반영 (집계 쿼리와 같이 값이 없는 필드는 해당 버킷에서 제외)"""
+        self.total += 1
+        
+        country = doc.get('country')
+        if country is not None:
+            item = self.countries.setdefault(country, {"count": 0, "price_sum": 0.0, "price_count": 0})
+            item['count'] += 1
+            price = doc.get('last_week_stock_price')
+            if price is not None:
+                item['price_sum'] += price
+                item['price_count'] += 1
+        
+        founded = doc.get('founded_date')
+        if founded:
+            item = self.years.setdefault(founded[:4], {"count": 0, "types": {}})
+            item['count'] += 1
+            company_type = doc.get('company_type')
+            if company_type is not None:
+                item['types'][company_type] = item['types'].get(company_type, 0) + 1
+    
+    def to_dict(self) -> dict:
+        """저장 형태"""
+        return {"total": self.total, "countries": self.countries, "years": self.years}
+
+
+def track_rollup(docs: Iterable[dict], rollup: DashboardRollup) -> Iterator[dict]:
+    """문서를 그대로 넘기면서 롤업에 반영 (적재 스트림에 끼워 사용)"""
+    for doc in docs:
+        rollup.add(doc)
+        yield doc
+
+
+class RollupStore:
+    """인덱스별 롤업 저장소"""
+    
+    def __init__(self, index_name: str, path: Path = None):
+        self.index_name = index_name
+        self.path = path or get_rollup_path()
+    
+    def connect(self) -> sqlite3.Connection:
+        """커넥션 (테이블 없으면 생성)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollup ("
+            "index_name TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        return conn
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """요청 하나용 커넥션 (트랜잭션 커밋/롤백 후 닫음)"""
+        conn = self.connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def load(self) -> Optional[DashboardRollup]:
+        """롤업 조회 (없으면 None)"""
+        if not self.path.exists():
+            return None
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM rollup WHERE index_name = ?", (self.index_name,)
+            ).fetchone()
+        return DashboardRollup.from_dict(json.loads(row[0])) if row else None
+    
+    def save(self, rollup: DashboardRollup):
+        """롤업 저장 (기존 값 교체)"""
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rollup (index_name, data, updated_at) VALUES (?, ?, ?)",
+                (self.index_name, json.dumps(rollup.to_dict(), ensure_ascii=False), time.time())
+            )
+    
+    def clear(self):
+        """롤업 삭제 (적재 시작/별칭 교체 시, 이후 집계 쿼리로 응답)"""
+        if not self.path.exists():
+            return
+        with self.connection() as conn:
+            conn.execute("DELETE FROM rollup WHERE index_name = ?", (self.index_name,))
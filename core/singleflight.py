@@ -0,0 +1,86 @@
+"""
+동일 요청 병합 (single-flight)
+
+같은 키의 요청이 진행 중이면 새로 실행하지 않고 진행 중인 결과를 함께 기다림
+- SingleFlight: 스레드 기반 (동기 경로)
+- AsyncSingleFlight: 이벤트 루프 기반 (비동기 경로)
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable
+
+
+class Call:
+    """진행 중인 동기 호출"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """스레드 간 동일 요청 병합"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+    
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        key 단위로 func 실행 (진행 중이면 그 결과를 공유)
+        
+        결과 객체는 여러 호출자가 공유하므로 수정하면 안 됨
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = Call()
+                self.calls[key] = call
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """코루틴 간 동일 요청 병합"""
+    
+    def __init__(self):
+        self.calls = {}
+    
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key 단위로 func 실행 (진행 중이면 그 결과를 공유)
+        
+        - 실행은 별도 태스크로 하여 먼저 요청한 쪽이 취소되어도 나머지는 결과를 받음
+        - 결과 객체는 여러 호출자가 공유하므로 수정하면 안 됨
+        """
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.calls[key] = task
+            task.add_done_callback(lambda t: self.finish(key, t))
+        return await asyncio.shield(task)
+    
+    def finish(self, key: str, task: asyncio.Future):
+        """완료된 태스크 정리"""
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        # 기다리는 쪽이 모두 취소된 경우 예외 미조회 경고 방지
+        if not task.cancelled():
+            task.exception()
@@ -2,11 +2,15 @@
 FastAPI 메인 애플리케이션
 """
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 from config import logger
+from core.backend import get_search_backend, get_async_search_client
+from core.opensearch import get_async_opensearch_client
+from core.metrics import MetricsMiddleware, register_pool_metrics, render_metrics
 from api.search_router import router as search_router
 from api.dashboard_router import router as dashboard_router
+from api.price_router import router as price_router, service as price_service
 
 
 @asynccontextmanager
@@ -19,8 +23,22 @@ async def lifespan(app: FastAPI):
     """
     # 서버 시작
     logger.info("=== Search API 서버 시작 ===")
+    client = get_async_search_client()
+    if get_search_backend() == 'memory':
+        # 메모리 인덱스는 첫 요청 전에 미리 읽음
+        await client.preload()
+    else:
+        client.start_health_check()
+        register_pool_metrics(client)
+    # 주가 틱 반영 (백그라운드)
+    price_service.start()
     yield
-    # 서버 종료
+    # 서버 종료 (남은 주가 반영, 헬스 체크 중지 및 커넥션 풀 정리)
+    await price_service.stop()
+    await client.close()
+    if get_search_backend() == 'memory':
+        # 주가 업데이트는 메모리 백엔드에서도 opensearch로 전송
+        await get_async_opensearch_client().close()
     logger.info("=== Search API 서버 종료 ===")
 
 
@@ -31,9 +49,13 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 라우트별 요청 메트릭
+app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(search_router)
 app.include_router(dashboard_router)
+app.include_router(price_router)
 
 
 @app.get("/health")
@@ -42,6 +64,13 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 메트릭"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,25 +1,100 @@
 """
 집계 Repository
 """
-from config import logger
-from core.opensearch import OpenSearchClient
+from core.logger import get_logger
+from core.metrics import stage_timer, observe_took
+from core.backend import get_search_client, get_async_search_client
+from core.singleflight import SingleFlight, AsyncSingleFlight
+
+logger = get_logger("search_api.repository")
+
+# 국가별 / 연도별 회사 분류 버킷 수
+COUNTRY_AGG_SIZE = 50
+COMPANY_TYPE_AGG_SIZE = 20
 
 
 class AggsRepository:
     """OpenSearch 집계 Repository"""
     
     def __init__(self):
-        self.os = OpenSearchClient()
+        # SEARCH_BACKEND에 따라 opensearch 또는 메모리 인덱스
+        self.os = get_search_client()
+        self.async_os = get_async_search_client()
         self.index_name = 'companies'
+        # 동일 집계 동시 요청 병합
+        self.singleflight = SingleFlight()
+        self.async_singleflight = AsyncSingleFlight()
     
     def get_aggs(self, include_country: bool = True, include_year: bool = True) -> dict:
         """
         집계 조회 (옵션에 따라 국가별/연도별 선택)
         """
         logger.info(
-            f"[Repository] 집계 요청: country={include_country}, year={include_year}"
+            "[Repository] 집계 요청: country=%s, year=%s",
+            include_country,
+            include_year
+        )
+        
+        query = self.build_query(include_country, include_year)
+        with stage_timer("aggs.opensearch"):
+            result = self.singleflight.do(
+                self.get_query_key(include_country, include_year),
+                lambda: self.os.search(self.index_name, query)
+            )
+        observe_took("aggs", result)
+        total = result.get('hits', {}).get('total', {}).get('value', 0)
+        logger.info("[Repository] 집계 결과: total=%s", total)
+        
+        return result
+    
+    async def get_aggs_async(self, include_country: bool = True, include_year: bool = True) -> dict:
+        """
+        집계 조회 (비동기)
+        """
+        logger.info(
+            "[Repository] 집계 요청: country=%s, year=%s",
+            include_country,
+            include_year
         )
         
+        query = self.build_query(include_country, include_year)
+        with stage_timer("aggs.opensearch"):
+            result = await self.async_singleflight.do(
+                self.get_query_key(include_country, include_year),
+                lambda: self.async_os.search(self.index_name, query)
+            )
+        observe_took("aggs", result)
+        total = result.get('hits', {}).get('total', {}).get('value', 0)
+        logger.info("[Repository] 집계 결과: total=%s", total)
+        
+        return result
+    
+    def get_total_count(self) -> int:
+        """전체 문서 수 조회 (_count API, 검색/집계 없이)"""
+        with stage_timer("count.opensearch"):
+            total = self.singleflight.do(
+                "count",
+                lambda: self.os.count(self.index_name)
+            )
+        logger.info("[Repository] 전체 문서 수: %s", total)
+        return total
+    
+    async def get_total_count_async(self) -> int:
+        """전체 문서 수 조회 (비동기)"""
+        with stage_timer("count.opensearch"):
+            total = await self.async_singleflight.do(
+                "count",
+                lambda: self.async_os.count(self.index_name)
+            )
+        logger.info("[Repository] 전체 문서 수: %s", total)
+        return total
+    
+    def get_query_key(self, include_country: bool, include_year: bool) -> str:
+        """동일 요청 병합용 키"""
+        return f"aggs:{int(include_country)}:{int(include_year)}"
+    
+    def build_query(self, include_country: bool, include_year: bool) -> dict:
+        """집계 쿼리 빌드"""
         aggs = {}
         
         # 국가별 집계
@@ -27,7 +102,7 @@ class AggsRepository:
             aggs["by_country"] = {
                 "terms": {
                     "field": "country",
-                    "size": 50
+                    "size": COUNTRY_AGG_SIZE
                 },
                 "aggs": {
                     "avg_last_week_stock": {
@@ -51,13 +126,13 @@ class AggsRepository:
                     "company_type_distribution": {
                         "terms": {
                             "field": "company_type",
-                            "size": 20
+                            "size": COMPANY_TYPE_AGG_SIZE
                         }
                     }
                 }
             }
         
-        query = {
+        return {
             "size": 0,
             "track_total_hits": True,
             "query": {
@@ -65,9 +140,3 @@ class AggsRepository:
             },
             "aggs": aggs
         }
-        
-        result = self.os.search(self.index_name, query)
-        total = result.get('hits', {}).get('total', {}).get('value', 0)
-        logger.info(f"[Repository] 집계 결과: total={total}")
-        
-        return result
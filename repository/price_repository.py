@@ -0,0 +1,41 @@
+"""
+주가 업데이트 Repository
+"""
+from core.logger import get_logger
+from core.metrics import stage_timer
+from core.opensearch import get_async_opensearch_client
+
+logger = get_logger("search_api.repository")
+
+
+class PriceRepository:
+    """
+    주가 부분 업데이트 Repository
+    
+    - 쓰기는 항상 opensearch로 전송 (SEARCH_BACKEND=memory여도 원본 인덱스에 반영)
+    - now_stock_price만 담은 partial doc 업데이트로 main_pipeline 등 다른 필드는 보내지 않음
+    """
+    
+    def __init__(self):
+        self.os = get_async_opensearch_client()
+        self.index_name = 'companies'
+    
+    def build_operations(self, prices: dict) -> list:
+        """id → 주가 → _bulk update 요청 본문"""
+        operations = []
+        for company_id, price in prices.items():
+            operations.append({
+                "update": {"_index": self.index_name, "_id": company_id, "retry_on_conflict": 3}
+            })
+            operations.append({"doc": {"now_stock_price": price}})
+        return operations
+    
+    async def update_prices_async(self, prices: dict) -> list:
+        """
+        주가 부분 업데이트 (벌크 요청 한 번)
+        
+        :return: 문서별 결과 (prices 순서, {"status", "result", "error"})
+        """
+        with stage_timer("prices.opensearch"):
+            response = await self.os.bulk(self.build_operations(prices))
+        return [item.get('update', {}) for item in response.get('items', [])]
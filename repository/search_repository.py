@@ -1,42 +1,381 @@
 """
 검색 Repository
 """
+import base64
+import binascii
+import json
+import os
+import threading
+import time
 from typing import Optional, List
 
-from config import logger
-from core.opensearch import OpenSearchClient
-from api.schema.search_request import SearchRequest, FilterSchema, OrderSchema
+from dotenv import load_dotenv
+
+from core.logger import get_logger, should_sample
+from core.metrics import stage_timer, observe_took
+from core.backend import get_search_client, get_async_search_client
+from core.opensearch import PitExpiredError, PitLimitError
+from core.singleflight import SingleFlight, AsyncSingleFlight
+from api.schema.search_request import SearchRequest, FilterSchema, OrderSchema, SuggestRequest
+
+logger = get_logger("search_api.repository")
+
+
+# 커서 모드 point-in-time 유지 시간 (다음 페이지 요청까지)
+# 마지막 페이지 전에 버려진 커서의 PIT은 마지막 요청 후 이 시간이 지나야 닫힘
+PIT_KEEP_ALIVE_SECONDS = 60
+PIT_KEEP_ALIVE = f"{PIT_KEEP_ALIVE_SECONDS}s"
+
+# 패싯 이름 → 필드 (stage는 main_pipeline nested)
+FACET_FIELDS = {
+    "country": "country",
+    "company_type": "company_type",
+    "stage": "main_pipeline.stage"
+}
+
+# 패싯별 최대 값 수
+FACET_SIZE = 50
+
+
+def get_search_options() -> dict:
+    """
+    검색 쿼리 옵션 (환경 변수)
+    
+    - SEARCH_TRACK_TOTAL_HITS: 정확히 셀 최대 검색 결과 수 (기본 10000, 넘으면 total은 하한값)
+    - SEARCH_MAX_OPEN_PITS: 워커 하나가 동시에 열어 둘 커서 PIT 수 (기본 50, 0이면 제한 없음)
+      워커 수 × 이 값이 클러스터의 search.max_open_pit_context(기본 300)보다 작게 설정
+    """
+    load_dotenv()
+    return {
+        "track_total_hits": int(os.getenv('SEARCH_TRACK_TOTAL_HITS', 10000)),
+        "max_open_pits": int(os.getenv('SEARCH_MAX_OPEN_PITS', 50))
+    }
+
+
+def encode_cursor(pit_id: str, search_after: list) -> str:
+    """PIT id + search_after 정렬 값 → 커서 토큰"""
+    payload = json.dumps({"pit": pit_id, "after": search_after}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> dict:
+    """커서 토큰 → {"pit": PIT id, "after": search_after 정렬 값}"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, binascii.Error) as e:
+        raise ValueError(f"잘못된 커서입니다: {e}")
+    if not isinstance(payload, dict) or not isinstance(payload.get("pit"), str) or not payload["pit"]:
+        raise ValueError("잘못된 커서입니다.")
+    after = payload.get("after")
+    if not isinstance(after, list) or not after:
+        raise ValueError("잘못된 커서입니다: 정렬 값이 없습니다.")
+    return payload
+
+
+class OpenPits:
+    """
+    이 워커가 연 커서 PIT 목록 (PIT id → 만료 시각)
+    
+    - 새 커서는 limit개까지만 열고, 넘으면 클러스터 제한에 닿기 전에 PitLimitError
+    - 다음 페이지 요청마다 만료 시각 연장, 마지막 페이지/만료 오류면 목록에서 제거
+    """
+    
+    def __init__(self, limit: int, keep_alive: float):
+        self.limit = limit
+        self.keep_alive = keep_alive
+        self.expires = {}
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """새 PIT을 열 수 있는지 확인 (만료된 항목 정리)"""
+        if self.limit <= 0:
+            return
+        now = time.monotonic()
+        with self.lock:
+            for pit_id, expires_at in list(self.expires.items()):
+                if expires_at <= now:
+                    del self.expires[pit_id]
+            if len(self.expires) >= self.limit:
+                raise PitLimitError("열린 커서가 너무 많습니다. 잠시 후 첫 페이지부터 다시 요청하세요.")
+    
+    def add(self, pit_id: str):
+        """새로 연 PIT 등록"""
+        with self.lock:
+            self.expires[pit_id] = time.monotonic() + self.keep_alive
+    
+    def touch(self, pit_id: str):
+        """다음 페이지 요청 (이 워커가 연 PIT이면 만료 시각 연장)"""
+        with self.lock:
+            if pit_id in self.expires:
+                self.expires[pit_id] = time.monotonic() + self.keep_alive
+    
+    def discard(self, pit_id: str):
+        """닫혔거나 만료된 PIT 제거"""
+        with self.lock:
+            self.expires.pop(pit_id, None)
 
 
 class SearchRepository:
     """OpenSearch 검색 Repository"""
     
     def __init__(self):
-        self.os = OpenSearchClient()
+        # SEARCH_BACKEND에 따라 opensearch 또는 메모리 인덱스
+        self.os = get_search_client()
+        self.async_os = get_async_search_client()
         self.index_name = 'companies'
+        self.options = get_search_options()
+        self.open_pits = OpenPits(self.options['max_open_pits'], PIT_KEEP_ALIVE_SECONDS)
+        # 동일 쿼리 동시 요청 병합
+        self.singleflight = SingleFlight()
+        self.async_singleflight = AsyncSingleFlight()
     
     def search(self, request: SearchRequest) -> dict:
         """검색 실행"""
-        query = self.build_query(request)
-        logger.info(f"[Repository] 검색 쿼리: {query}")
+        cursor = None
+        if request.is_cursor_mode():
+            cursor = self.open_cursor(request)
+            if cursor["pit"] is None:
+                self.open_pits.reserve()
+                cursor["pit"] = self.os.create_pit(self.index_name, PIT_KEEP_ALIVE)
+                self.open_pits.add(cursor["pit"])
+            else:
+                self.open_pits.touch(cursor["pit"])
         
-        result = self.os.search(self.index_name, query)
+        with stage_timer("search.build_query"):
+            query = self.build_query(request, cursor)
+        if should_sample('LOG_QUERY_SAMPLE_RATE', 0.01):
+            logger.info("[Repository] 검색 쿼리 (샘플): %s", query)
+        
+        # PIT 검색은 인덱스를 지정하지 않음 (커서 모드가 아니면 동일 쿼리 병합)
+        with stage_timer("search.opensearch"):
+            if cursor:
+                try:
+                    result = self.os.search(None, query)
+                except PitExpiredError:
+                    self.open_pits.discard(cursor["pit"])
+                    raise
+                # 응답의 pit_id는 생략될 수 있으므로 없으면 요청에 사용한 PIT 유지
+                result['pit_id'] = result.get('pit_id') or cursor["pit"]
+            else:
+                result = self.singleflight.do(
+                    self.get_query_key(query),
+                    lambda: self.os.search(self.index_name, query)
+                )
+        observe_took("search", result)
         hits_count = len(result.get('hits', {}).get('hits', []))
-        logger.info(f"[Repository] 검색 결과: {hits_count}건")
+        logger.info("[Repository] 검색 결과: %s건", hits_count)
+        
+        # 마지막 페이지면 PIT 정리
+        if cursor and self.is_last_page(result, request):
+            self.open_pits.discard(cursor["pit"])
+            try:
+                self.os.delete_pit(result['pit_id'])
+            except Exception as e:
+                logger.warning("[Repository] PIT 삭제 실패: %s", e)
         
         return result
     
-    def build_query(self, request: SearchRequest) -> dict:
-        """전체 쿼리 빌드"""
-        has_search = self.has_search_keyword(request)
+    async def search_async(self, request: SearchRequest) -> dict:
+        """검색 실행 (비동기)"""
+        cursor = None
+        if request.is_cursor_mode():
+            cursor = self.open_cursor(request)
+            if cursor["pit"] is None:
+                self.open_pits.reserve()
+                cursor["pit"] = await self.async_os.create_pit(self.index_name, PIT_KEEP_ALIVE)
+                self.open_pits.add(cursor["pit"])
+            else:
+                self.open_pits.touch(cursor["pit"])
+        
+        with stage_timer("search.build_query"):
+            query = self.build_query(request, cursor)
+        if should_sample('LOG_QUERY_SAMPLE_RATE', 0.01):
+            logger.info("[Repository] 검색 쿼리 (샘플): %s", query)
+        
+        # PIT 검색은 인덱스를 지정하지 않음 (커서 모드가 아니면 동일 쿼리 병합)
+        with stage_timer("search.opensearch"):
+            if cursor:
+                try:
+                    result = await self.async_os.search(None, query)
+                except PitExpiredError:
+                    self.open_pits.discard(cursor["pit"])
+                    raise
+                # 응답의 pit_id는 생략될 수 있으므로 없으면 요청에 사용한 PIT 유지
+                result['pit_id'] = result.get('pit_id') or cursor["pit"]
+            else:
+                result = await self.async_singleflight.do(
+                    self.get_query_key(query),
+                    lambda: self.async_os.search(self.index_name, query)
+                )
+        observe_took("search", result)
+        hits_count = len(result.get('hits', {}).get('hits', []))
+        logger.info("[Repository] 검색 결과: %s건", hits_count)
+        
+        # 마지막 페이지면 PIT 정리
+        if cursor and self.is_last_page(result, request):
+            self.open_pits.discard(cursor["pit"])
+            try:
+                await self.async_os.delete_pit(result['pit_id'])
+            except Exception as e:
+                logger.warning("[Repository] PIT 삭제 실패: %s", e)
+        
+        return result
+    
+    def msearch(self, requests: List[SearchRequest]) -> list:
+        """
+        여러 검색을 _msearch 한 번으로 실행 (page 모드만)
+        
+        :return: 요청 순서대로 opensearch 응답 (실패한 항목은 error/status 포함)
+        """
+        with stage_timer("search.build_query"):
+            queries = [self.build_query(request) for request in requests]
+        with stage_timer("search.opensearch"):
+            responses = self.os.msearch(self.index_name, queries)
+        for response in responses:
+            observe_took("search", response)
+        logger.info("[Repository] 배치 검색: %s건", len(queries))
+        return responses
+    
+    async def msearch_async(self, requests: List[SearchRequest]) -> list:
+        """여러 검색을 _msearch 한 번으로 실행 (비동기)"""
+        with stage_timer("search.build_query"):
+            queries = [self.build_query(request) for request in requests]
+        with stage_timer("search.opensearch"):
+            responses = await self.async_os.msearch(self.index_name, queries)
+        for response in responses:
+            observe_took("search", response)
+        logger.info("[Repository] 배치 검색: %s건", len(queries))
+        return responses
+    
+    async def suggest_async(self, request: SuggestRequest) -> dict:
+        """자동완성 조회 (_source 없이 id/표시 문자열만)"""
+        query = self.build_suggest_query(request)
+        with stage_timer("suggest.opensearch"):
+            result = await self.async_singleflight.do(
+                self.get_query_key(query),
+                lambda: self.async_os.search(self.index_name, query)
+            )
+        observe_took("suggest", result)
+        return result
+    
+    def build_suggest_query(self, request: SuggestRequest) -> dict:
+        """
+        자동완성 쿼리 (edge-ngram 접두어 필드, 단어마다 접두어 일치)
+        
+        - company_name: 일치한 회사의 id + company_name.keyword doc value
+        - drug_name/indication: nested 하위 문서의 keyword terms 집계 (같은 이름은 하나로)
+        """
+        field = request.type if request.type == "company_name" else f"main_pipeline.{request.type}"
+        match = {"match": {f"{field}.prefix": {"query": request.prefix, "operator": "and"}}}
+        
+        if request.type == "company_name":
+            return {
+                "size": request.size,
+                "_source": False,
+                "track_total_hits": False,
+                "query": match,
+                "docvalue_fields": [f"{field}.keyword"],
+                "sort": [{"_score": {"order": "desc"}}, {f"{field}.keyword": {"order": "asc"}}]
+            }
         
         return {
-            "from": (request.page - 1) * request.size,
-            "size": request.size,
-            "query": self.build_bool_query(request),
-            "sort": self.build_sort(request.order, has_search)
+            "size": 0,
+            "track_total_hits": False,
+            "query": {"nested": {"path": "main_pipeline", "query": match}},
+            "aggs": {
+                "suggest": {
+                    "nested": {"path": "main_pipeline"},
+                    "aggs": {
+                        "matched": {
+                            "filter": match,
+                            "aggs": {
+                                "names": {"terms": {"field": f"{field}.keyword", "size": request.size}}
+                            }
+                        }
+                    }
+                }
+            }
         }
     
+    def get_query_key(self, query: dict) -> str:
+        """동일 요청 병합용 쿼리 키"""
+        return json.dumps(query, sort_keys=True, ensure_ascii=False)
+    
+    def open_cursor(self, request: SearchRequest) -> dict:
+        """요청 커서 해석 (첫 페이지면 PIT 없이 시작, 정렬 값 수가 정렬 조건과 다르면 ValueError)"""
+        if request.cursor:
+            cursor = decode_cursor(request.cursor)
+            sort = self.build_sort(request.order, self.has_search_keyword(request))
+            if len(cursor["after"]) != len(sort):
+                raise ValueError("잘못된 커서입니다: 정렬 조건과 맞지 않습니다.")
+            return cursor
+        return {"pit": None, "after": None}
+    
+    def is_last_page(self, result: dict, request: SearchRequest) -> bool:
+        """요청 크기보다 적게 반환되면 마지막 페이지"""
+        return len(result.get('hits', {}).get('hits', [])) < request.size
+    
+    def build_next_cursor(self, result: dict, request: SearchRequest) -> Optional[str]:
+        """다음 페이지 커서 생성 (마지막 페이지면 None, pit_id는 search에서 채움)"""
+        hits = result.get('hits', {}).get('hits', [])
+        if not hits or self.is_last_page(result, request):
+            return None
+        return encode_cursor(result['pit_id'], hits[-1].get('sort'))
+    
+    def build_query(self, request: SearchRequest, cursor: Optional[dict] = None) -> dict:
+        """
+        전체 쿼리 빌드
+        
+        - cursor가 없으면 from/size 페이지네이션
+        - cursor가 있으면 PIT + search_after 페이지네이션
+        - facets가 켜져 있으면 필터를 post_filter로 옮기고 패싯 집계 추가
+          (커서 모드는 첫 페이지에서만 집계)
+        - total은 track_total_hits까지만 정확히 셈
+        """
+        has_search = self.has_search_keyword(request)
+        facets = request.facets and (cursor is None or not cursor["after"])
+        bool_query = self.build_bool_query(request, include_filters=not facets)
+        
+        if cursor is None:
+            query = {
+                "from": (request.page - 1) * request.size,
+                "size": request.size,
+                "query": bool_query,
+                "sort": self.build_sort(request.order, has_search)
+            }
+        else:
+            query = {
+                "size": request.size,
+                "query": bool_query,
+                "sort": self.build_sort(request.order, has_search),
+                "pit": {"id": cursor["pit"], "keep_alive": PIT_KEEP_ALIVE}
+            }
+            if cursor["after"]:
+                query["search_after"] = cursor["after"]
+        
+        query["track_total_hits"] = self.get_track_total_hits(request)
+        
+        # 패싯: 필터는 결과 목록에만 적용하고, 각 패싯은 자기 필터를 뺀 나머지 필터로 집계
+        if facets:
+            filters = self.build_filter_queries(request.filter) if request.filter else []
+            if filters:
+                query["post_filter"] = {"bool": {"filter": filters}}
+            query["aggs"] = self.build_facet_aggs(request.filter)
+        
+        # 필드 선택 (_source 필터링)
+        if request.fields is not None:
+            query["_source"] = {"includes": request.get_source_fields()}
+        elif request.compact:
+            query["_source"] = {"excludes": ["main_pipeline"]}
+        
+        return query
+    
+    def get_track_total_hits(self, request: SearchRequest) -> int:
+        """정확히 셀 최대 결과 수 (요청 값, 없으면 설정 값)"""
+        if request.track_total_hits is not None:
+            return request.track_total_hits
+        return self.options['track_total_hits']
+    
     def has_search_keyword(self, request: SearchRequest) -> bool:
         """검색어 유무 확인"""
         if request.filter is None:
@@ -45,8 +384,12 @@ class SearchRepository:
             return False
         return True
     
-    def build_bool_query(self, request: SearchRequest) -> dict:
-        """bool 쿼리 구성"""
+    def build_bool_query(self, request: SearchRequest, include_filters: bool = True) -> dict:
+        """
+        bool 쿼리 구성
+        
+        :param include_filters: False면 검색어만 (필터는 post_filter로 따로 적용할 때)
+        """
         if not request.filter:
             return {"match_all": {}}
         
@@ -60,7 +403,8 @@ class SearchRepository:
                 must.append(search_query)
         
         # 필터 (term 쿼리)
-        filters = self.build_filter_queries(request.filter)
+        if include_filters:
+            filters = self.build_filter_queries(request.filter)
         
         # must, filter 둘 다 비어있으면 match_all
         if not must and not filters:
@@ -109,31 +453,58 @@ class SearchRepository:
     
     def build_filter_queries(self, filter_schema: FilterSchema) -> list:
         """필터 쿼리 빌드 (term)"""
-        filters = []
+        return list(self.build_filter_clauses(filter_schema).values())
+    
+    def build_filter_clauses(self, filter_schema: Optional[FilterSchema]) -> dict:
+        """필터 이름(country/company_type/stage) → term 쿼리"""
+        clauses = {}
+        if filter_schema is None:
+            return clauses
         
         # 국가 필터
         if filter_schema.country:
-            filters.append({"terms": {"country": filter_schema.country}})
+            clauses["country"] = {"terms": {"country": filter_schema.country}}
         
         # 회사 분류 필터
         if filter_schema.company_type:
-            filters.append({"terms": {"company_type": filter_schema.company_type}})
+            clauses["company_type"] = {"terms": {"company_type": filter_schema.company_type}}
         
         # 파이프라인 단계 필터 (nested)
         if filter_schema.stage:
-            filters.append({
+            clauses["stage"] = {
                 "nested": {
                     "path": "main_pipeline",
                     "query": {
                         "terms": {"main_pipeline.stage": filter_schema.stage}
                     }
                 }
-            })
+            }
         
-        return filters
+        return clauses
+    
+    def build_facet_aggs(self, filter_schema: Optional[FilterSchema]) -> dict:
+        """
+        패싯 집계 (facet_{이름})
+        
+        - 각 패싯은 자기 필터를 제외한 나머지 필터를 filter 집계로 적용 (다중 선택 UI용)
+        - stage는 nested terms + reverse_nested로 파이프라인 수가 아닌 회사 수를 집계
+        """
+        clauses = self.build_filter_clauses(filter_schema)
+        aggs = {}
+        for name, field in FACET_FIELDS.items():
+            others = [clause for other, clause in clauses.items() if other != name]
+            values = {"terms": {"field": field, "size": FACET_SIZE}}
+            if name == "stage":
+                values["aggs"] = {"companies": {"reverse_nested": {}}}
+                values = {"nested": {"path": "main_pipeline"}, "aggs": {"values": values}}
+            aggs[f"facet_{name}"] = {
+                "filter": {"bool": {"filter": others}} if others else {"match_all": {}},
+                "aggs": {"values": values}
+            }
+        return aggs
     
     def build_sort(self, order: Optional[List[OrderSchema]], has_search: bool) -> list:
-        """정렬 조건 빌드"""
+        """정렬 조건 빌드 (항상 id를 마지막 타이브레이커로 추가)"""
         # 사용자가 정렬 조건을 지정한 경우
         if order:
             sort_list = []
@@ -142,11 +513,15 @@ class SearchRepository:
                 if field == "company_name":
                     field = "company_name.keyword"
                 sort_list.append({field: {"order": o.sortOrder}})
-            return sort_list
         
         # 검색어가 있으면 스코어 내림차순
-        if has_search:
-            return [{"_score": {"order": "desc"}}]
+        elif has_search:
+            sort_list = [{"_score": {"order": "desc"}}]
         
         # 검색어가 없으면 회사명 오름차순
-        return [{"company_name.keyword": {"order": "asc"}}]
+        else:
+            sort_list = [{"company_name.keyword": {"order": "asc"}}]
+        
+        # 동일 값 정렬 순서 고정 (search_after 커서 안정성)
+        sort_list.append({"id": {"order": "asc"}})
+        return sort_list
@@ -1,10 +1,32 @@
 """
 OpenSearch 인덱스 생성 스크립트
+
+사용법:
+    python -m scripts.create_index                # 샤드 수는 api/mock/data.xlsx 행 수 기준
+    python -m scripts.create_index data.parquet   # 적재할 원본 파일 기준
+
+- 샤드 수는 적재할 원본 행 수, 복제본 수는 데이터 노드 수로 결정
+
+옵션 (환경 변수)
+- INDEX_SHARD_TARGET_DOCS: 샤드당 목표 문서 수 (기본 5000000)
+- INDEX_MAX_SHARDS: 최대 샤드 수 (기본 30)
+- INDEX_MAX_REPLICAS: 최대 복제본 수 (기본 2, 데이터 노드 수 - 1을 넘지 않음)
+- INDEX_SHARDS / INDEX_REPLICAS: 지정하면 계산 대신 고정 값
 """
+import argparse
 import json
+import math
+import os
+from pathlib import Path
 
-from config import OPENSEARCH_SETTINGS, OPENSEARCH_MAPPINGS, logger
+from dotenv import load_dotenv
+
+from config import MOCK_DATA, OPENSEARCH_SETTINGS, OPENSEARCH_MAPPINGS, logger
+from core.cache import bump_index_generation
 from core.opensearch import OpenSearchClient
+from core.rollup import RollupStore
+from scripts.document_source import count_rows
+from scripts.manifest import LoadManifest
 
 
 def load_settings(settings_file=None):
@@ -23,54 +45,128 @@ def load_mappings(mappings_file=None):
         return json.load(f)
 
 
-def create_index(os_client, index_name='companies'):
-    """인덱스 생성"""
-    # 인덱스가 이미 존재하면 삭제
-    if os_client.index_exists(index_name):
-        os_client.delete_index(index_name)
-        logger.info(f"기존 인덱스 '{index_name}' 삭제")
+def get_index_options():
+    """샤드/복제본 옵션"""
+    load_dotenv()
+    return {
+        "shard_target_docs": int(os.getenv('INDEX_SHARD_TARGET_DOCS', 5000000)),
+        "max_shards": int(os.getenv('INDEX_MAX_SHARDS', 30)),
+        "max_replicas": int(os.getenv('INDEX_MAX_REPLICAS', 2)),
+        "shards": int(os.environ['INDEX_SHARDS']) if os.getenv('INDEX_SHARDS') else None,
+        "replicas": int(os.environ['INDEX_REPLICAS']) if os.getenv('INDEX_REPLICAS') else None
+    }
+
+
+def plan_shards(doc_count, data_nodes, options=None):
+    """
+    문서 수/데이터 노드 수 → 샤드/복제본 수
     
-    # 설정 및 매핑 파일 로드
+    - 샤드: 샤드당 shard_target_docs개 기준 (최소 1, 최대 max_shards)
+    - 복제본: 데이터 노드 수 - 1 (같은 노드에 배치할 수 없는 복제본은 만들지 않음), 최대 max_replicas
+    """
+    options = options or get_index_options()
+    shards = options['shards']
+    if shards is None:
+        shards = min(max(1, math.ceil(doc_count / options['shard_target_docs'])), options['max_shards'])
+    replicas = options['replicas']
+    if replicas is None:
+        replicas = min(options['max_replicas'], max(data_nodes - 1, 0))
+    return {"number_of_shards": shards, "number_of_replicas": replicas}
+
+
+def build_index_body(index_name='companies', doc_count=0, data_nodes=1):
+    """
+    인덱스 생성 요청 본문 (settings + mappings 결합, 정보가 없으면 None)
+    
+    :param doc_count: 예상 문서 수 (샤드 수 산정)
+    :param data_nodes: 데이터 노드 수 (복제본 수 산정)
+    """
     settings = load_settings()
     mappings = load_mappings()
+    options = get_index_options()
     
     if index_name not in settings:
-        logger.error(f"'{index_name}' 설정 정보를 찾을 수 없습니다.")
-        return False
+        logger.error("'%s' 설정 정보를 찾을 수 없습니다.", index_name)
+        return None
     
     if index_name not in mappings:
-        logger.error(f"'{index_name}' 매핑 정보를 찾을 수 없습니다.")
-        return False
+        logger.error("'%s' 매핑 정보를 찾을 수 없습니다.", index_name)
+        return None
+    
+    index_settings = {**plan_shards(doc_count, data_nodes, options), **settings[index_name]}
+    logger.info(
+        "인덱스 설정: 샤드 %s개, 복제본 %s개 (예상 문서 %s개, 데이터 노드 %s개)",
+        index_settings['number_of_shards'], index_settings['number_of_replicas'], doc_count, data_nodes
+    )
     
-    # 인덱스 생성 (settings + mappings 결합)
-    body = {
-        "settings": settings[index_name],
+    return {
+        "settings": index_settings,
         "mappings": mappings[index_name]
     }
+
+
+def get_data_nodes(os_client):
+    """데이터 노드 수"""
+    return os_client.cluster_health().get('number_of_data_nodes', 1)
+
+
+def create_index(os_client, index_name='companies', doc_count=0):
+    """
+    인덱스 생성
+    
+    :param doc_count: 적재할 문서 수 (샤드 수 산정, 원본 행 수)
+    """
+    # 버전 인덱스 + 별칭으로 운영 중이면 scripts.reindex로 교체
+    if os_client.get_alias_indices(index_name):
+        logger.error("'%s'는 별칭입니다. 'python -m scripts.reindex'로 새 버전을 만드세요.", index_name)
+        return False
+    
+    # 설정 및 매핑 파일 로드
+    body = build_index_body(index_name, doc_count, get_data_nodes(os_client))
+    if body is None:
+        return False
+    
+    # 인덱스가 이미 존재하면 삭제
+    if os_client.index_exists(index_name):
+        os_client.delete_index(index_name)
+        logger.info("기존 인덱스 '%s' 삭제", index_name)
     
     os_client.create_index(index_name, body)
-    logger.info(f"인덱스 '{index_name}' 생성 완료")
-    logger.info(f"설정 파일: {OPENSEARCH_SETTINGS}")
-    logger.info(f"매핑 파일: {OPENSEARCH_MAPPINGS}")
+    LoadManifest(index_name).clear()
+    RollupStore(index_name).clear()
+    bump_index_generation()
+    logger.info("인덱스 '%s' 생성 완료", index_name)
+    logger.info("설정 파일: %s", OPENSEARCH_SETTINGS)
+    logger.info("매핑 파일: %s", OPENSEARCH_MAPPINGS)
     
     return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description="OpenSearch 인덱스 생성")
+    parser.add_argument("path", nargs="?", default=str(MOCK_DATA), help="적재할 원본 파일 (샤드 수 산정용)")
+    args = parser.parse_args()
+    
     try:
         os = OpenSearchClient()
         
         # 연결 확인
         info = os.info()
-        logger.info(f"OpenSearch 연결 성공: {info['version']['number']}")
+        logger.info("OpenSearch 연결 성공: %s", info['version']['number'])
+        
+        # 샤드 수 산정용 원본 행 수
+        source_path = Path(args.path)
+        if not source_path.exists():
+            logger.error("원본 파일을 찾을 수 없습니다: %s", source_path)
+            return False
         
         # 인덱스 생성
-        create_index(os, index_name='companies')
+        create_index(os, index_name='companies', doc_count=count_rows(source_path))
         
         logger.info("인덱스 생성이 완료되었습니다.")
-        
+    
     except Exception as e:
-        logger.error(f"오류 발생: {e}")
+        logger.error("오류 발생: %s", e)
         import traceback
         traceback.print_exc()
         return False
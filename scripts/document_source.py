@@ -0,0 +1,228 @@
+"""
+원본 파일 → OpenSearch 문서 변환 (청크 단위 스트리밍)
+
+- 지원 형식: .xlsx(read-only 모드), .csv, .jsonl, .parquet (모두 Excel과 같은 컬럼 이름)
+- 파일 전체를 메모리에 올리지 않고 청크(DataFrame) 단위로 읽어 변환
+- 날짜/주가 변환은 청크 단위로 벡터화, 파이프라인 문자열은 미리 컴파일한 정규식으로 파싱
+- LOAD_PREPARE_WORKERS > 0 이면 청크 변환을 프로세스 풀에서 실행 (진행 중인 청크 수 제한)
+"""
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Generator, Iterator, List
+
+import pandas as pd
+from dotenv import load_dotenv
+from openpyxl import load_workbook
+
+from config import logger
+
+# 원본 컬럼
+COL_ID = 'ID'
+COL_COMPANY_NAME = '회사명'
+COL_COUNTRY = '국가'
+COL_COMPANY_TYPE = '회사 분류'
+COL_LAST_WEEK_PRICE = '지난주 주가'
+COL_NOW_PRICE = '실시간 주가'
+COL_FOUNDED_DATE = '설립 날짜'
+COL_PIPELINE = '주요 파이프라인\n약물명 (적응증, 단계)'
+
+# "약물명 (적응증, 단계)" 항목
+PIPELINE_ITEM = re.compile(r'(?P<drug>.+?)\s*\((?P<indication>.+?),\s*(?P<stage>[^)]+)')
+
+
+def get_prepare_options() -> dict:
+    """
+    문서 변환 옵션 (환경 변수)
+    
+    - LOAD_READ_CHUNK_SIZE: 한 번에 읽을 행 수 (기본 5000)
+    - LOAD_PREPARE_WORKERS: 변환 프로세스 수 (기본 0, 현재 프로세스에서 변환)
+    """
+    load_dotenv()
+    return {
+        "chunk_size": int(os.getenv('LOAD_READ_CHUNK_SIZE', 5000)),
+        "workers": int(os.getenv('LOAD_PREPARE_WORKERS', 0))
+    }
+
+
+def parse_pipeline(pipeline_str):
+    """
+    파이프라인 문자열을 파싱하여 리스트로 변환
+    예: "[ZL-6129 (Osteoporosis, Phase 3), DX-4259 (Atrial Fibrillation, Phase 2)]"
+    """
+    if not isinstance(pipeline_str, str) or not pipeline_str:
+        return []
+    
+    pipelines = []
+    # 대괄호 제거 후 각 항목을 "), " 기준으로 분리
+    for item in pipeline_str.strip('[]').strip().split("), "):
+        match = PIPELINE_ITEM.match(item.strip())
+        if match:
+            pipelines.append({
+                "drug_name": match.group('drug').strip(),
+                "indication": match.group('indication').strip(),
+                "stage": match.group('stage').strip()
+            })
+    
+    return pipelines
+
+
+def to_text(series: pd.Series) -> list:
+    """문자열 컬럼 (행 단위 str() 변환과 같은 결과)"""
+    return series.astype(str).tolist()
+
+
+def to_price(series: pd.Series) -> list:
+    """주가 컬럼 (숫자가 아니면 None)"""
+    values = pd.to_numeric(series, errors='coerce').astype(float)
+    return [None if v != v else v for v in values.tolist()]
+
+
+def to_founded_date(series: pd.Series, ids: list) -> list:
+    """설립 날짜 컬럼 → yyyy.MM.dd (변환할 수 없으면 None)"""
+    dates = pd.to_datetime(series, errors='coerce', format='mixed')
+    invalid = dates.isna() & series.notna()
+    if invalid.any():
+        bad_ids = [ids[i] for i in invalid.to_numpy().nonzero()[0][:5]]
+        logger.warning("날짜 변환 오류 %s건 (ID: %s ...)", int(invalid.sum()), bad_ids)
+    return [None if pd.isna(d) else d for d in dates.dt.strftime('%Y.%m.%d').tolist()]
+
+
+def prepare_chunk(df: pd.DataFrame) -> List[dict]:
+    """원본 청크 → OpenSearch 문서 목록"""
+    ids = df[COL_ID].astype('int64').tolist()
+    columns = zip(
+        ids,
+        to_text(df[COL_COMPANY_NAME]),
+        to_text(df[COL_COUNTRY]),
+        to_text(df[COL_COMPANY_TYPE]),
+        to_price(df[COL_LAST_WEEK_PRICE]),
+        to_price(df[COL_NOW_PRICE]),
+        to_founded_date(df[COL_FOUNDED_DATE], ids),
+        df[COL_PIPELINE].tolist()
+    )
+    
+    docs = []
+    for doc_id, name, country, company_type, last_week, now, founded, pipeline in columns:
+        doc = {
+            "id": doc_id,
+            "company_name": name,
+            "country": country,
+            "company_type": company_type,
+            "last_week_stock_price": last_week,
+            "now_stock_price": now
+        }
+        if founded is not None:
+            doc['founded_date'] = founded
+        doc['main_pipeline'] = parse_pipeline(pipeline)
+        docs.append(doc)
+    return docs
+
+
+def read_excel_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Excel을 read-only 모드로 행 단위 스트리밍"""
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        chunk = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def read_parquet_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Parquet을 row group 배치 단위로 읽기 (pyarrow 필요)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 파일을 읽으려면 pyarrow를 설치하세요: pip install pyarrow")
+    
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+def read_chunks(path, chunk_size: int = None) -> Iterator[pd.DataFrame]:
+    """원본 파일 → DataFrame 청크"""
+    path = Path(path)
+    if chunk_size is None:
+        chunk_size = get_prepare_options()['chunk_size']
+    suffix = path.suffix.lower()
+    
+    if suffix in ('.xlsx', '.xlsm'):
+        return read_excel_chunks(path, chunk_size)
+    if suffix == '.csv':
+        return pd.read_csv(path, chunksize=chunk_size)
+    if suffix == '.jsonl':
+        return pd.read_json(path, lines=True, chunksize=chunk_size)
+    if suffix == '.parquet':
+        return read_parquet_chunks(path, chunk_size)
+    raise ValueError(f"지원하지 않는 파일 형식: {path.suffix} (xlsx, csv, jsonl, parquet)")
+
+
+def count_rows(path) -> int:
+    """
+    원본 행 수 (인덱스 샤드 수 산정용)
+    
+    - xlsx는 시트 범위, parquet는 메타데이터로 (파일 전체를 읽지 않음)
+    - csv/jsonl은 빈 줄을 뺀 줄 수 (csv는 헤더 제외, 값 안의 줄바꿈 때문에 근사치)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    
+    if suffix in ('.xlsx', '.xlsm'):
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return max(workbook.active.max_row - 1, 0)
+        finally:
+            workbook.close()
+    if suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet 파일을 읽으려면 pyarrow를 설치하세요: pip install pyarrow")
+        return pq.ParquetFile(path).metadata.num_rows
+    if suffix in ('.csv', '.jsonl'):
+        with open(path, 'rb') as f:
+            lines = sum(1 for line in f if line.strip())
+        return max(lines - 1, 0) if suffix == '.csv' else lines
+    raise ValueError(f"지원하지 않는 파일 형식: {path.suffix} (xlsx, csv, jsonl, parquet)")
+
+
+def prepare_documents(path, chunk_size: int = None, workers: int = None) -> Generator[dict, None, None]:
+    """
+    원본 파일 → 문서 (필요할 때마다 한 청크씩 읽어 변환)
+    
+    :param workers: 변환 프로세스 수 (0이면 현재 프로세스)
+    """
+    options = get_prepare_options()
+    if workers is None:
+        workers = options['workers']
+    chunks = read_chunks(path, chunk_size or options['chunk_size'])
+    
+    if workers <= 0:
+        for chunk in chunks:
+            yield from prepare_chunk(chunk)
+        return
+    
+    # 진행 중인 청크를 workers * 2개로 제한하여 메모리 사용량 유지
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(prepare_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -1,129 +1,323 @@
 """
-Excel 데이터를 OpenSearch에 로드하는 스크립트
+원본 데이터(Excel/CSV/JSONL/Parquet)를 OpenSearch에 로드하는 스크립트
+
+사용법:
+    python -m scripts.load_data                # api/mock/data.xlsx
+    python -m scripts.load_data data.parquet   # 다른 원본 파일
+    python -m scripts.load_data --incremental  # 변경분만 (추가/변경/삭제)
+
+적재 옵션 (환경 변수)
+- LOAD_THREADS: 벌크 전송 스레드 수 (기본 4, 1이면 순차 전송)
+- LOAD_CHUNK_SIZE: 벌크 요청당 문서 수 (기본 1000)
+- LOAD_MAX_CHUNK_BYTES: 벌크 요청 최대 크기 (기본 10MB)
+- LOAD_TUNE_INDEX: 적재 중 refresh 중지 + replica 0 (기본 true, 끝나면 원래 설정 복원)
+- LOAD_FORCE_MERGE: 적재 후 세그먼트 병합 (기본 true)
+- LOAD_MANIFEST_DB: 증분 로드용 문서 해시 목록 위치 (기본 cache/load_manifest.sqlite3)
+- DASHBOARD_ROLLUP_DB: 대시보드 롤업 위치 (기본 cache/dashboard_rollup.sqlite3, 적재하면서 계산)
 """
-import re
+import argparse
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
 
-import pandas as pd
+from dotenv import load_dotenv
 
 from config import MOCK_DATA, logger
+from core.cache import bump_index_generation
 from core.opensearch import OpenSearchClient
+from core.rollup import DashboardRollup, RollupStore, track_rollup
+from scripts.document_source import prepare_documents
+from scripts.manifest import LoadManifest, content_hash
+
+
+def generate_actions(docs, index_name='companies'):
+    """Bulk API용 액션 생성 (문서를 하나씩 꺼내 전송, 전체를 메모리에 두지 않음)"""
+    for doc in docs:
+        yield {
+            "_index": index_name,
+            "_id": doc['id'],
+            "_source": doc
+        }
 
 
-def parse_pipeline(pipeline_str):
+def generate_delta_actions(docs, hashes, index_name, stats, pending):
     """
-    파이프라인 문자열을 파싱하여 리스트로 변환
-    예: "[ZL-6129 (Osteoporosis, Phase 3), DX-4259 (Atrial Fibrillation, Phase 2)]"
+    변경분 액션 생성 (해시가 같은 문서는 건너뜀)
+    
+    - 새 문서/바뀐 문서: index (문서 전체 교체)
+    - 원본에서 사라진 id: delete
+    - pending에 전송한 id → 새 해시(삭제는 None)를 기록하여 성공한 것만 manifest에 반영
     """
-    if pd.isna(pipeline_str) or not pipeline_str:
-        return []
+    seen = set()
+    for doc in docs:
+        doc_id = str(doc['id'])
+        seen.add(doc_id)
+        digest = content_hash(doc)
+        previous = hashes.get(doc_id)
+        if previous == digest:
+            stats['unchanged'] += 1
+            continue
+        stats['added' if previous is None else 'changed'] += 1
+        pending[doc_id] = digest
+        yield {
+            "_op_type": "index",
+            "_index": index_name,
+            "_id": doc['id'],
+            "_source": doc
+        }
     
-    # 대괄호 제거
-    pipeline_str = pipeline_str.strip('[]').strip()
+    for doc_id in hashes.keys() - seen:
+        stats['removed'] += 1
+        pending[doc_id] = None
+        yield {
+            "_op_type": "delete",
+            "_index": index_name,
+            "_id": doc_id
+        }
+
+
+def get_load_options():
+    """벌크 적재 옵션"""
+    load_dotenv()
+    return {
+        "thread_count": int(os.getenv('LOAD_THREADS', 4)),
+        "chunk_size": int(os.getenv('LOAD_CHUNK_SIZE', 1000)),
+        "max_chunk_bytes": int(os.getenv('LOAD_MAX_CHUNK_BYTES', 10 * 1024 * 1024)),
+        "tune_index": os.getenv('LOAD_TUNE_INDEX', 'true').lower() == 'true',
+        "force_merge": os.getenv('LOAD_FORCE_MERGE', 'true').lower() == 'true'
+    }
+
+
+@contextmanager
+def bulk_load_settings(os_client, index_name, enabled=True):
+    """
+    적재 중 인덱스 설정 (refresh 중지, replica 0)
     
-    # 각 항목을 "), " 기준으로 분리
-    items = pipeline_str.split("), ")
+    끝나면(실패해도) 원래 refresh_interval/number_of_replicas로 복원
+    """
+    if not enabled:
+        yield
+        return
     
-    pipelines = []
-    for item in items:
-        # "약물명 (적응증, 단계)" 파싱
-        match = re.match(
-            r'(?P<drug>.+?)\s*\((?P<indication>.+?),\s*(?P<stage>[^)]+)',
-            item.strip()
-        )
-        if match:
-            pipelines.append({
-                "drug_name": match.group('drug').strip(),
-                "indication": match.group('indication').strip(),
-                "stage": match.group('stage').strip()
-            })
-    
-    return pipelines
-
-
-def prepare_document(row):
-    """DataFrame 행을 OpenSearch 문서로 변환"""
-    doc = {
-        "id": int(row['ID']),
-        "company_name": str(row['회사명']),
-        "country": str(row['국가']),
-        "company_type": str(row['회사 분류']),
-        "last_week_stock_price": float(row['지난주 주가']),
-        "now_stock_price": float(row['실시간 주가'])
+    original = os_client.get_index_settings(index_name)
+    restore = {
+        # 설정한 적 없으면 None → 기본값으로 복원
+        "refresh_interval": original.get('refresh_interval'),
+        "number_of_replicas": original.get('number_of_replicas')
     }
-    
-    # 날짜 변환
+    os_client.update_index_settings(index_name, {
+        "refresh_interval": "-1",
+        "number_of_replicas": 0
+    })
+    logger.info("적재용 설정 적용 (refresh_interval=-1, number_of_replicas=0)")
     try:
-        if pd.notna(row['설립 날짜']):
-            founded_date = pd.to_datetime(row['설립 날짜'])
-            doc['founded_date'] = founded_date.strftime('%Y.%m.%d')
-    except Exception as e:
-        logger.warning(f"날짜 변환 오류 (ID: {row['ID']}): {e}")
+        yield
+    finally:
+        os_client.update_index_settings(index_name, restore)
+        logger.info("인덱스 설정 복원: %s", restore)
+
+
+def bulk_index(os_client, actions, options):
+    """
+    벌크 전송 (병렬)
+    
+    :return: (성공 수, 실패 항목 목록)
+    """
+    success = 0
+    failed = []
+    results = os_client.parallel_bulk_insert(
+        actions,
+        thread_count=options['thread_count'],
+        chunk_size=options['chunk_size'],
+        max_chunk_bytes=options['max_chunk_bytes']
+    )
+    for ok, item in results:
+        if ok:
+            success += 1
+        else:
+            failed.append(item)
+            if len(failed) <= 5:
+                logger.warning("적재 실패: %s", item)
+    return success, failed
+
+
+def save_rollup(os_client, index_name, rollup, failed=0, store_name=None):
+    """
+    적재하면서 계산한 대시보드 롤업 저장
     
-    # 파이프라인 파싱
-    pipeline_str = row['주요 파이프라인\n약물명 (적응증, 단계)']
-    doc['main_pipeline'] = parse_pipeline(pipeline_str)
+    - 실패한 문서가 있거나 문서 수가 인덱스와 다르면(중복 id 등) 인덱스 문서로 다시 계산
     
-    return doc
+    :param store_name: 저장할 이름 (기본 index_name, 재색인은 별칭)
+    """
+    if failed or rollup.total != os_client.count(index_name):
+        logger.info("롤업이 인덱스와 달라 인덱스에서 다시 계산합니다.")
+        rollup = DashboardRollup.from_documents(
+            hit['_source'] for hit in os_client.scan_documents(index_name)
+        )
+    RollupStore(store_name or index_name).save(rollup)
+    logger.info("대시보드 롤업 저장: 문서 %s개, 국가 %s개, 연도 %s개", rollup.total, len(rollup.countries), len(rollup.years))
 
 
-def generate_actions(df, index_name='companies'):
-    """Bulk API용 액션 생성"""
-    for idx, row in df.iterrows():
-        doc = prepare_document(row)
-        yield {
-            "_index": index_name,
-            "_id": doc['id'],
-            "_source": doc
-        }
+def bulk_load_file(os_client, source_path, index_name, options, rollup=None):
+    """
+    원본 파일 전체를 인덱스에 적재 (적재용 설정 → 전송 → refresh → 병합)
+    
+    :param rollup: 전달하면 읽은 문서를 대시보드 롤업에 반영
+    :return: (성공 수, 실패 항목 목록)
+    """
+    logger.info("원본 파일 읽는 중: %s", source_path)
+    logger.info(
+        "데이터를 '%s' 인덱스에 로드 중... (threads=%s, chunk=%s)",
+        index_name, options['thread_count'], options['chunk_size']
+    )
+    with bulk_load_settings(os_client, index_name, options['tune_index']):
+        start = time.perf_counter()
+        docs = prepare_documents(source_path)
+        if rollup is not None:
+            docs = track_rollup(docs, rollup)
+        success, failed = bulk_index(os_client, generate_actions(docs, index_name), options)
+        elapsed = time.perf_counter() - start
+        
+        logger.info(
+            "로드 완료 - 성공: %s개, %.1f초 (%.0f docs/sec)",
+            success, elapsed, success / elapsed if elapsed > 0 else 0
+        )
+        if failed:
+            logger.warning("실패: %s개", len(failed))
+        
+        # 인덱스 리프레시 후 세그먼트 병합 (replica 복원 전에 병합하여 복제본은 병합된 세그먼트를 받음)
+        os_client.refresh_index(index_name)
+        if options['force_merge']:
+            start = time.perf_counter()
+            os_client.force_merge(index_name)
+            logger.info("세그먼트 병합 완료: %.1f초", time.perf_counter() - start)
+    
+    return success, failed
 
 
 def load_excel_to_opensearch(excel_path, index_name='companies'):
-    """Excel 데이터를 OpenSearch에 로드"""
+    """원본 파일(Excel/CSV/JSONL/Parquet)을 OpenSearch에 로드 (청크 단위 스트리밍)"""
     os_client = OpenSearchClient()
-    
-    # Excel 파일 읽기
-    logger.info(f"Excel 파일 읽는 중: {excel_path}")
-    df = pd.read_excel(excel_path)
-    logger.info(f"총 {len(df)}개 행 로드됨")
+    options = get_load_options()
     
     # 인덱스 존재 확인
     if not os_client.index_exists(index_name):
-        logger.error(f"인덱스 '{index_name}'가 존재하지 않습니다.")
+        logger.error("인덱스 '%s'가 존재하지 않습니다.", index_name)
         logger.info("먼저 'python -m scripts.create_index'를 실행하세요.")
         return False
     
-    # Bulk 인덱싱
-    logger.info(f"데이터를 '{index_name}' 인덱스에 로드 중...")
-    success, failed = os_client.bulk_insert(generate_actions(df, index_name))
+    # 적재 중에는 롤업 대신 집계 쿼리로 응답 (중간에 실패해도 잘못된 롤업이 남지 않도록)
+    RollupStore(index_name).clear()
     
-    logger.info(f"로드 완료 - 성공: {success}개")
-    if failed:
-        logger.warning(f"실패: {len(failed)}개")
+    # Bulk 인덱싱 (파일을 읽으면서 변환한 문서를 바로 전송, 롤업도 함께 계산)
+    rollup = DashboardRollup()
+    _, failed = bulk_load_file(os_client, excel_path, index_name, options, rollup)
+    save_rollup(os_client, index_name, rollup, len(failed))
     
-    # 인덱스 리프레시
-    os_client.refresh_index(index_name)
+    # 전체 로드 후에는 manifest를 비워 다음 증분 로드에서 인덱스 기준으로 다시 계산
+    LoadManifest(index_name).clear()
+    
+    # API 캐시 무효화 (인덱스 세대 증가)
+    generation = bump_index_generation()
+    logger.info("인덱스 세대: %s", generation)
     
     # 결과 확인
     count = os_client.count(index_name)
-    logger.info(f"현재 인덱스 문서 수: {count}개")
+    logger.info("현재 인덱스 문서 수: %s개", count)
     
     return True
 
 
+def load_incremental(source_path, index_name='companies'):
+    """
+    증분 로드 (원본과 manifest의 문서 해시를 비교하여 변경분만 전송)
+    
+    - 변경분이 적으므로 인덱스 설정 변경/세그먼트 병합 없이 전송 후 refresh 한 번
+    - 실패한 문서는 manifest에 반영하지 않아 다음 실행에서 다시 전송
+    - 대시보드 롤업은 원본 전체(유지 문서 포함)를 읽는 김에 다시 계산
+    """
+    os_client = OpenSearchClient()
+    options = get_load_options()
+    
+    if not os_client.index_exists(index_name):
+        logger.error("인덱스 '%s'가 존재하지 않습니다.", index_name)
+        logger.info("먼저 'python -m scripts.create_index'를 실행하세요.")
+        return False
+    
+    manifest = LoadManifest(index_name)
+    hashes = manifest.load()
+    if len(hashes) != os_client.count(index_name):
+        logger.info("manifest가 인덱스 문서 수와 달라 인덱스에서 다시 계산합니다.")
+        hashes = manifest.rebuild(os_client)
+    
+    logger.info("증분 로드: %s → '%s' (기존 %s건)", source_path, index_name, len(hashes))
+    RollupStore(index_name).clear()
+    start = time.perf_counter()
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    pending = {}
+    applied = {}
+    failed = 0
+    rollup = DashboardRollup()
+    docs = track_rollup(prepare_documents(source_path), rollup)
+    actions = generate_delta_actions(docs, hashes, index_name, stats, pending)
+    results = os_client.parallel_bulk_insert(
+        actions,
+        thread_count=options['thread_count'],
+        chunk_size=options['chunk_size'],
+        max_chunk_bytes=options['max_chunk_bytes']
+    )
+    for ok, item in results:
+        op_type, result = next(iter(item.items()))
+        doc_id = str(result.get('_id'))
+        # 이미 없는 문서 삭제(404)는 성공으로 처리
+        if ok or (op_type == 'delete' and result.get('status') == 404):
+            applied[doc_id] = pending[doc_id]
+        else:
+            failed += 1
+            if failed <= 5:
+                logger.warning("적재 실패: %s", item)
+    
+    if applied:
+        os_client.refresh_index(index_name)
+        manifest.apply(applied)
+    save_rollup(os_client, index_name, rollup, failed)
+    if applied:
+        generation = bump_index_generation()
+        logger.info("인덱스 세대: %s", generation)
+    
+    logger.info(
+        "증분 로드 완료 - 추가: %s개, 변경: %s개, 삭제: %s개, 유지: %s개, 실패: %s개, %.1f초",
+        stats['added'], stats['changed'], stats['removed'], stats['unchanged'],
+        failed, time.perf_counter() - start
+    )
+    logger.info("현재 인덱스 문서 수: %s개", os_client.count(index_name))
+    
+    return failed == 0
+
+
 def main():
+    parser = argparse.ArgumentParser(description="원본 데이터를 OpenSearch에 로드")
+    parser.add_argument("path", nargs="?", default=str(MOCK_DATA), help="원본 파일 (xlsx, csv, jsonl, parquet)")
+    parser.add_argument("--incremental", action="store_true", help="변경분만 로드 (추가/변경/삭제)")
+    args = parser.parse_args()
+    
     try:
-        excel_path = MOCK_DATA
+        source_path = Path(args.path)
         
-        if not excel_path.exists():
-            logger.error(f"Excel 파일을 찾을 수 없습니다: {excel_path}")
+        if not source_path.exists():
+            logger.error("원본 파일을 찾을 수 없습니다: %s", source_path)
             return False
         
-        load_excel_to_opensearch(str(excel_path))
+        if args.incremental:
+            load_incremental(str(source_path))
+        else:
+            load_excel_to_opensearch(str(source_path))
         
         logger.info("데이터 로드가 완료되었습니다.")
-        
+    
     except Exception as e:
-        logger.error(f"오류 발생: {e}")
+        logger.error("오류 발생: %s", e)
         import traceback
         traceback.print_exc()
         return False
@@ -0,0 +1,88 @@
+"""
+증분 로드용 문서 해시 목록 (manifest)
+
+- 문서 id → 내용 해시를 sqlite에 보관 (LOAD_MANIFEST_DB, 기본 cache/load_manifest.sqlite3)
+- 파일이 없거나 인덱스 문서 수와 맞지 않으면 인덱스의 _source로 다시 계산하므로 지워도 안전
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from config import ROOT_DIR, logger
+
+
+def content_hash(doc: dict) -> str:
+    """문서 내용 해시 (키 순서와 무관)"""
+    payload = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def get_manifest_path() -> Path:
+    """manifest 파일 위치"""
+    load_dotenv()
+    return Path(os.getenv('LOAD_MANIFEST_DB', ROOT_DIR / 'cache' / 'load_manifest.sqlite3'))
+
+
+class LoadManifest:
+    """인덱스별 문서 해시 목록"""
+    
+    def __init__(self, index_name: str, path: Path = None):
+        self.index_name = index_name
+        self.path = path or get_manifest_path()
+    
+    def connect(self) -> sqlite3.Connection:
+        """커넥션 (테이블 없으면 생성)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "index_name TEXT NOT NULL, id TEXT NOT NULL, hash TEXT NOT NULL, "
+            "PRIMARY KEY (index_name, id))"
+        )
+        return conn
+    
+    def load(self) -> dict:
+        """id → 해시"""
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT id, hash FROM manifest WHERE index_name = ?", (self.index_name,)
+            ).fetchall()
+        return dict(rows)
+    
+    def rebuild(self, os_client) -> dict:
+        """인덱스 문서로 해시 목록 다시 계산"""
+        hashes = {
+            str(hit['_id']): content_hash(hit['_source'])
+            for hit in os_client.scan_documents(self.index_name)
+        }
+        with self.connect() as conn:
+            conn.execute("DELETE FROM manifest WHERE index_name = ?", (self.index_name,))
+            conn.executemany(
+                "INSERT INTO manifest (index_name, id, hash) VALUES (?, ?, ?)",
+                ((self.index_name, doc_id, digest) for doc_id, digest in hashes.items())
+            )
+        logger.info("manifest 재계산: %s건", len(hashes))
+        return hashes
+    
+    def apply(self, changes: dict):
+        """변경 반영 (해시가 None이면 삭제)"""
+        with self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest (index_name, id, hash) VALUES (?, ?, ?)",
+                ((self.index_name, doc_id, digest) for doc_id, digest in changes.items() if digest is not None)
+            )
+            conn.executemany(
+                "DELETE FROM manifest WHERE index_name = ? AND id = ?",
+                ((self.index_name, doc_id) for doc_id, digest in changes.items() if digest is None)
+            )
+    
+    def clear(self):
+        """인덱스의 해시 목록 삭제 (전체 로드/인덱스 재생성 후)"""
+        if not self.path.exists():
+            return
+        with self.connect() as conn:
+            conn.execute("DELETE FROM manifest WHERE index_name = ?", (self.index_name,))
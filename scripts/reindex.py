@@ -0,0 +1,252 @@
+"""
+무중단 재색인 (버전 인덱스 + 별칭 교체)
+
+사용법:
+    python -m scripts.reindex                 # api/mock/data.xlsx로 새 버전 생성 후 별칭 교체
+    python -m scripts.reindex data.parquet    # 다른 원본 파일
+    python -m scripts.reindex --list          # 버전 목록
+    python -m scripts.reindex --rollback      # 직전 버전으로 별칭 되돌리기
+
+- 물리 인덱스 companies_v{n}을 새로 만들어 적재 → 워밍 → 검증한 뒤 companies 별칭을 원자적으로 교체
+- 교체 전까지 검색/집계는 기존 버전으로 계속 응답 (리포지토리는 별칭 이름으로 조회)
+- 별칭이 아닌 기존 companies 인덱스는 교체 요청 안에서 함께 삭제하여 별칭으로 전환
+- 재색인 중 실행한 증분 로드(load_data --incremental)는 기존 버전에만 반영되므로 교체 후 다시 실행
+
+옵션 (환경 변수)
+- REINDEX_RETAIN: 교체 후 남겨 둘 이전 버전 수 (기본 2, 롤백용)
+- REINDEX_MAX_COUNT_DROP: 현재 버전 대비 허용하는 문서 수 감소 비율 (기본 0.1)
+- REINDEX_SAMPLE_SIZE: 검증용 샘플 검색 수 (기본 20)
+"""
+import argparse
+import os
+import re
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from api.schema.search_request import FilterSchema, OrderSchema, SearchKeyword, SearchRequest
+from config import MOCK_DATA, logger
+from core.cache import bump_index_generation
+from core.opensearch import OpenSearchClient
+from core.rollup import DashboardRollup, RollupStore
+from repository.aggs_repository import AggsRepository
+from repository.search_repository import SearchRepository
+from scripts.create_index import build_index_body, get_data_nodes
+from scripts.document_source import count_rows
+from scripts.load_data import bulk_load_file, get_load_options, save_rollup
+from scripts.manifest import LoadManifest
+
+
+def get_reindex_options():
+    """재색인 옵션"""
+    load_dotenv()
+    return {
+        "retain": int(os.getenv('REINDEX_RETAIN', 2)),
+        "max_count_drop": float(os.getenv('REINDEX_MAX_COUNT_DROP', 0.1)),
+        "sample_size": int(os.getenv('REINDEX_SAMPLE_SIZE', 20))
+    }
+
+
+def version_name(alias, version):
+    """버전 인덱스 이름 (companies_v3)"""
+    return f"{alias}_v{version}"
+
+
+def list_versions(os_client, alias):
+    """버전 인덱스 목록 [(버전, 인덱스 이름)] (오래된 순)"""
+    pattern = re.compile(rf'^{re.escape(alias)}_v(\d+)$')
+    versions = []
+    for index_name in os_client.list_indices(f"{alias}_v*"):
+        match = pattern.match(index_name)
+        if match:
+            versions.append((int(match.group(1)), index_name))
+    return sorted(versions)
+
+
+def warm_up(os_client, index_name):
+    """
+    새 인덱스 워밍 (API와 같은 쿼리로 정렬/집계용 자료구조를 미리 로드)
+    """
+    search_repository = SearchRepository()
+    queries = [AggsRepository().build_query(True, True)]
+    queries.append(search_repository.build_query(SearchRequest()))
+    for field in ("company_name", "now_stock_price", "last_week_stock_price"):
+        request = SearchRequest(order=[OrderSchema(sortBy=field, sortOrder="desc")])
+        queries.append(search_repository.build_query(request))
+    
+    start = time.perf_counter()
+    for query in queries:
+        os_client.search(index_name, query)
+    logger.info("워밍 완료: 쿼리 %s개, %.2f초", len(queries), time.perf_counter() - start)
+
+
+def validate(os_client, index_name, loaded, current_count, options):
+    """
+    새 인덱스 검증
+    
+    - 문서 수가 적재 성공 수와 같고, 현재 버전보다 max_count_drop 이상 줄지 않았는지
+    - 무작위 샘플 문서가 회사명 검색 결과에 나오는지
+    """
+    count = os_client.count(index_name)
+    if count != loaded:
+        logger.error("검증 실패: 문서 수 %s개 (적재 %s개)", count, loaded)
+        return False
+    if current_count and count < current_count * (1 - options['max_count_drop']):
+        logger.error("검증 실패: 문서 수 %s개 (현재 버전 %s개)", count, current_count)
+        return False
+    
+    samples = os_client.search(index_name, {
+        "size": options['sample_size'],
+        "query": {"function_score": {"query": {"match_all": {}}, "random_score": {}}},
+        "_source": ["company_name"]
+    })['hits']['hits']
+    search_repository = SearchRepository()
+    for hit in samples:
+        name = hit['_source'].get('company_name')
+        if not name:
+            continue
+        request = SearchRequest(
+            size=100,
+            filter=FilterSchema(search=SearchKeyword(type="company_name", keyword=name))
+        )
+        result = os_client.search(index_name, search_repository.build_query(request))
+        if hit['_id'] not in {h['_id'] for h in result['hits']['hits']}:
+            logger.error("검증 실패: 샘플 검색 '%s'에서 문서 %s를 찾지 못했습니다.", name, hit['_id'])
+            return False
+    
+    logger.info("검증 완료: 문서 %s개, 샘플 검색 %s건", count, len(samples))
+    return True
+
+
+def swap_alias(os_client, alias, index_name, rollup=None):
+    """
+    별칭을 index_name으로 원자적 교체 (별칭이 아닌 같은 이름의 인덱스는 함께 삭제)
+    
+    :param rollup: 새 버전의 대시보드 롤업 (없으면 롤업을 지워 집계 쿼리로 응답)
+    """
+    current = os_client.get_alias_indices(alias)
+    actions = [{"remove": {"index": name, "alias": alias}} for name in current if name != index_name]
+    if not current and os_client.index_exists(alias):
+        actions.append({"remove_index": {"index": alias}})
+    actions.append({"add": {"index": index_name, "alias": alias}})
+    os_client.update_aliases(actions)
+    
+    # 별칭 대상이 바뀌었으므로 증분 로드 manifest 초기화, 롤업 교체 + API 캐시 무효화
+    LoadManifest(alias).clear()
+    if rollup is None:
+        RollupStore(alias).clear()
+    else:
+        save_rollup(os_client, index_name, rollup, store_name=alias)
+    generation = bump_index_generation()
+    logger.info("별칭 교체: %s → %s (이전: %s, 인덱스 세대: %s)", alias, index_name, current or alias, generation)
+
+
+def prune_versions(os_client, alias, retain):
+    """현재 버전을 제외하고 최근 retain개만 남기고 삭제"""
+    current = set(os_client.get_alias_indices(alias))
+    others = [name for _, name in list_versions(os_client, alias) if name not in current]
+    for index_name in others[:max(len(others) - retain, 0)]:
+        os_client.delete_index(index_name)
+        logger.info("이전 버전 삭제: %s", index_name)
+
+
+def reindex(source_path, alias='companies'):
+    """새 버전 인덱스 생성 → 적재 → 워밍 → 검증 → 별칭 교체 → 이전 버전 정리"""
+    os_client = OpenSearchClient()
+    options = get_reindex_options()
+    load_options = get_load_options()
+    
+    # 샤드 수는 원본 행 수 기준 (버전마다 다시 계산)
+    body = build_index_body(alias, count_rows(source_path), get_data_nodes(os_client))
+    if body is None:
+        return False
+    
+    versions = list_versions(os_client, alias)
+    index_name = version_name(alias, versions[-1][0] + 1 if versions else 1)
+    current_count = os_client.count(alias) if os_client.index_exists(alias) else 0
+    
+    os_client.create_index(index_name, body)
+    logger.info("새 버전 인덱스 생성: %s (현재 문서 수: %s개)", index_name, current_count)
+    rollup = DashboardRollup()
+    try:
+        success, failed = bulk_load_file(os_client, source_path, index_name, load_options, rollup)
+        warm_up(os_client, index_name)
+        valid = not failed and validate(os_client, index_name, success, current_count, options)
+    except Exception:
+        os_client.delete_index(index_name)
+        raise
+    
+    if not valid:
+        os_client.delete_index(index_name)
+        logger.error("재색인 중단: %s 삭제, '%s'는 기존 버전 유지", index_name, alias)
+        return False
+    
+    swap_alias(os_client, alias, index_name, rollup)
+    prune_versions(os_client, alias, options['retain'])
+    return True
+
+
+def rollback(alias='companies'):
+    """별칭을 현재 버전 직전의 남아 있는 버전으로 되돌림"""
+    os_client = OpenSearchClient()
+    current = os_client.get_alias_indices(alias)
+    versions = list_versions(os_client, alias)
+    current_versions = [version for version, name in versions if name in current]
+    if not current_versions:
+        logger.error("'%s' 별칭이 버전 인덱스를 가리키지 않습니다.", alias)
+        return False
+    
+    previous = [name for version, name in versions if version < min(current_versions)]
+    if not previous:
+        logger.error("되돌릴 이전 버전이 없습니다. (현재: %s)", current)
+        return False
+    
+    swap_alias(os_client, alias, previous[-1])
+    return True
+
+
+def show_versions(alias='companies'):
+    """버전 목록 출력"""
+    os_client = OpenSearchClient()
+    current = set(os_client.get_alias_indices(alias))
+    for version, index_name in list_versions(os_client, alias):
+        marker = " (현재)" if index_name in current else ""
+        logger.info("v%s: %s, 문서 %s개%s", version, index_name, os_client.count(index_name), marker)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="버전 인덱스로 무중단 재색인")
+    parser.add_argument("path", nargs="?", default=str(MOCK_DATA), help="원본 파일 (xlsx, csv, jsonl, parquet)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--list", action="store_true", help="버전 목록")
+    group.add_argument("--rollback", action="store_true", help="직전 버전으로 별칭 되돌리기")
+    args = parser.parse_args()
+    
+    try:
+        if args.list:
+            show_versions()
+            return True
+        if args.rollback:
+            return rollback()
+        
+        source_path = Path(args.path)
+        if not source_path.exists():
+            logger.error("원본 파일을 찾을 수 없습니다: %s", source_path)
+            return False
+        
+        if not reindex(str(source_path)):
+            return False
+        logger.info("재색인이 완료되었습니다.")
+    
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        import traceback
+        traceback.print_exc()
+        return False
+    
+    return True
+
+
+if __name__ == "__main__":
+    main()
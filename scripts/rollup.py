@@ -0,0 +1,103 @@
+"""
+대시보드 롤업 확인/재계산
+
+사용법:
+    python -m scripts.rollup            # 롤업과 집계 쿼리 결과 비교 (다르면 종료 코드 1)
+    python -m scripts.rollup --rebuild  # 인덱스 문서로 롤업 다시 계산
+
+- 롤업은 데이터 로드/재색인 때 자동으로 계산되므로 평소에는 실행할 필요 없음
+- 롤백(scripts.reindex --rollback) 후에는 롤업이 지워지므로 --rebuild로 다시 만들 수 있음
+"""
+import argparse
+import sys
+
+from api.schema.aggs_request import AggsRequest
+from config import logger
+from core.cache import bump_index_generation
+from core.opensearch import OpenSearchClient
+from core.rollup import DashboardRollup, RollupStore
+from repository.aggs_repository import AggsRepository
+from service.dashboard.aggs_service import AggsService
+
+# 평균 주가 비교 허용 오차 (응답은 소수 둘째 자리 반올림)
+AVG_TOLERANCE = 0.011
+
+
+def rebuild(index_name='companies'):
+    """인덱스 문서로 롤업 다시 계산 후 저장"""
+    os_client = OpenSearchClient()
+    rollup = DashboardRollup.from_documents(
+        hit['_source'] for hit in os_client.scan_documents(index_name)
+    )
+    RollupStore(index_name).save(rollup)
+    generation = bump_index_generation()
+    logger.info("롤업 재계산: 문서 %s개 (인덱스 세대: %s)", rollup.total, generation)
+    return True
+
+
+def diff_aggs(expected, actual) -> list:
+    """집계 쿼리 응답과 롤업 응답의 차이 목록"""
+    diffs = []
+    if expected.total != actual.total:
+        diffs.append(f"total: {expected.total} != {actual.total}")
+    
+    countries = {item.country: item for item in actual.country_aggs}
+    for item in expected.country_aggs:
+        other = countries.pop(item.country, None)
+        if other is None:
+            diffs.append(f"country {item.country}: 롤업에 없음")
+        elif other.company_count != item.company_count:
+            diffs.append(f"country {item.country}: {item.company_count} != {other.company_count}")
+        elif abs(other.avg_last_week_stock - item.avg_last_week_stock) > AVG_TOLERANCE:
+            diffs.append(f"country {item.country} 평균: {item.avg_last_week_stock} != {other.avg_last_week_stock}")
+    diffs.extend(f"country {country}: 집계 쿼리에 없음" for country in countries)
+    
+    years = {item.year: item for item in actual.year_aggs}
+    for item in expected.year_aggs:
+        other = years.pop(item.year, None)
+        if other is None:
+            diffs.append(f"year {item.year}: 롤업에 없음")
+        elif other.model_dump() != item.model_dump():
+            diffs.append(f"year {item.year}: {item.model_dump()} != {other.model_dump()}")
+    diffs.extend(f"year {year}: 집계 쿼리에 없음" for year in years)
+    return diffs
+
+
+def check(index_name='companies'):
+    """롤업과 집계 쿼리 결과 비교"""
+    rollup = RollupStore(index_name).load()
+    if rollup is None:
+        logger.error("'%s' 롤업이 없습니다. (집계 쿼리로 응답 중)", index_name)
+        return False
+    
+    service = AggsService()
+    request = AggsRequest()
+    expected = service.transform_aggs(AggsRepository().get_aggs(), request)
+    actual = service.transform_rollup(rollup, request)
+    
+    diffs = diff_aggs(expected, actual)
+    for line in diffs[:20]:
+        logger.error("불일치 - %s", line)
+    if diffs:
+        logger.error("롤업 불일치 %s건: 'python -m scripts.rollup --rebuild'로 다시 계산하세요.", len(diffs))
+        return False
+    logger.info("롤업 일치: 문서 %s개, 국가 %s개, 연도 %s개", rollup.total, len(actual.country_aggs), len(actual.year_aggs))
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 롤업 확인/재계산")
+    parser.add_argument("--rebuild", action="store_true", help="인덱스 문서로 롤업 다시 계산")
+    args = parser.parse_args()
+    
+    try:
+        return rebuild() if args.rebuild else check()
+    except Exception as e:
+        logger.error("오류 발생: %s", e)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,8 +1,9 @@
 """
 OpenSearch 인덱스 생성 및 데이터 로드
+
+- 버전 인덱스(companies_v{n})를 만들어 적재한 뒤 companies 별칭을 교체 (scripts/reindex.py)
 """
-from scripts.create_index import create_index
-from scripts.load_data import load_excel_to_opensearch
+from scripts.reindex import reindex
 from core.opensearch import OpenSearchClient
 from config import MOCK_DATA, logger
 
@@ -13,34 +14,22 @@ def setup_connection():
     info = os.info()
     health = os.cluster_health()
     
-    logger.info(f"클러스터: {info['cluster_name']}")
-    logger.info(f"버전: {info['version']['number']}")
-    logger.info(f"상태: {health['status']}")
-    logger.info(f"노드: {health['number_of_nodes']}개")
+    logger.info("클러스터: %s", info['cluster_name'])
+    logger.info("버전: %s", info['version']['number'])
+    logger.info("상태: %s", health['status'])
+    logger.info("노드: %s개", health['number_of_nodes'])
     
     return os
 
 
-def setup_index(os_client):
-    """인덱스 생성"""
-    result = create_index(os_client, index_name='companies')
-    
-    if result:
-        logger.info("인덱스 생성 완료")
-    else:
-        logger.error("인덱스 생성 실패")
-    
-    return result
-
-
-def setup_data():
-    """데이터 로드"""
-    result = load_excel_to_opensearch(str(MOCK_DATA))
+def setup_index():
+    """버전 인덱스 생성 + 데이터 로드 + 별칭 교체"""
+    result = reindex(str(MOCK_DATA), alias='companies')
     
     if result:
-        logger.info("데이터 로드 완료")
+        logger.info("인덱스 생성 및 데이터 로드 완료")
     else:
-        logger.error("데이터 로드 실패")
+        logger.error("인덱스 생성 또는 데이터 로드 실패")
     
     return result
 
@@ -55,7 +44,7 @@ def verify_data(os_client):
     hits = result['hits']['hits']
     if hits:
         doc = hits[0]['_source']
-        logger.info(f"샘플: {doc['company_name']} ({doc['country']})")
+        logger.info("샘플: %s (%s)", doc['company_name'], doc['country'])
         return True
     return False
 
@@ -67,23 +56,19 @@ def main():
         # 1. 연결 확인
         os_client = setup_connection()
         
-        # 2. 인덱스 생성
-        if not setup_index(os_client):
-            return False
-        
-        # 3. 데이터 로드
-        if not setup_data():
+        # 2. 인덱스 생성 및 데이터 로드
+        if not setup_index():
             return False
         
-        # 4. 검증
+        # 3. 검증
         if not verify_data(os_client):
             return False
         
         logger.info("=== 설정 완료 ===")
         return True
-        
+    
     except Exception as e:
-        logger.error(f"오류 발생: {e}")
+        logger.error("오류 발생: %s", e)
         import traceback
         traceback.print_exc()
         return False
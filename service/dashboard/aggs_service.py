@@ -1,51 +1,198 @@
 """
 집계 Service
 """
+import asyncio
+import os
 from typing import List, Optional
 
-from config import logger
+from dotenv import load_dotenv
+
+from core.logger import get_logger
+from core.metrics import stage_timer
 from api.schema.aggs_request import AggsRequest
 from api.schema.aggs_response import (
     TotalCountResponse,
     AggsResponse, CountryAggItem,
     YearAggItem, CompanyTypeCount
 )
-from repository.aggs_repository import AggsRepository
+from repository.aggs_repository import AggsRepository, COUNTRY_AGG_SIZE, COMPANY_TYPE_AGG_SIZE
+from core.cache import TTLCache, SqliteCache, TwoTierCache, get_cache_ttl, get_cache_size
+from core.rollup import DashboardRollup, RollupStore
+
+logger = get_logger("search_api.service")
 
 
 class AggsService:
-    """집계 서비스"""
+    """
+    집계 서비스
+    
+    - 결과는 2단계 캐시(프로세스 내 + 워커 간 공유)에 DASHBOARD_CACHE_TTL초 동안 보관
+    - 데이터 로드가 끝나 인덱스 세대가 바뀌면 캐시 무효화
+    - 적재 시점에 계산한 롤업(core/rollup.py)이 있으면 집계 쿼리 없이 롤업으로 응답
+      (DASHBOARD_ROLLUP=false면 항상 집계 쿼리)
+    """
     
     def __init__(self):
+        load_dotenv()
         self.repository = AggsRepository()
+        self.rollups = None
+        if os.getenv('DASHBOARD_ROLLUP', 'true').lower() == 'true':
+            self.rollups = RollupStore(self.repository.index_name)
+        ttl = get_cache_ttl('DASHBOARD_CACHE_TTL', 60)
+        self.cache = TwoTierCache(
+            'dashboard',
+            TTLCache(maxsize=get_cache_size('DASHBOARD_CACHE_LOCAL_MAXSIZE', 64), ttl=ttl),
+            SqliteCache(maxsize=get_cache_size('DASHBOARD_CACHE_SHARED_MAXSIZE', 256), ttl=ttl)
+        )
     
     def get_total_count(self) -> TotalCountResponse:
         """전체 회사 수 조회"""
         logger.info("[Service] 전체 회사 수 조회 시작")
         
-        result = self.repository.get_aggs(include_country=False, include_year=False)
-        total = self.extract_total(result)
+        cached = self.cache.get("total")
+        if cached is not None:
+            return TotalCountResponse(**cached)
+        
+        total = self.repository.get_total_count()
+        
+        logger.info("[Service] 전체 회사 수: %s", total)
+        response = TotalCountResponse(total=total)
+        self.cache.set("total", response.model_dump())
+        return response
+    
+    async def get_total_count_async(self) -> TotalCountResponse:
+        """전체 회사 수 조회 (비동기)"""
+        logger.info("[Service] 전체 회사 수 조회 시작")
         
-        logger.info(f"[Service] 전체 회사 수: {total}")
-        return TotalCountResponse(total=total)
+        cached = self.cache.get("total")
+        if cached is not None:
+            return TotalCountResponse(**cached)
+        
+        total = await self.repository.get_total_count_async()
+        
+        logger.info("[Service] 전체 회사 수: %s", total)
+        response = TotalCountResponse(total=total)
+        self.cache.set("total", response.model_dump())
+        return response
     
     def get_aggs(self, request: AggsRequest) -> AggsResponse:
         """집계 조회 (옵션에 따라 국가별/연도별 선택)"""
         logger.info(
-            f"[Service] 집계 시작: country={request.include_country}, "
-            f"year={request.include_year}"
+            "[Service] 집계 시작: country=%s, year=%s",
+            request.include_country,
+            request.include_year
         )
         
+        cache_key = self.get_cache_key(request)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return AggsResponse(**cached)
+        
+        rollup = self.load_rollup()
+        if rollup is not None:
+            response = self.transform_rollup(rollup, request)
+            self.cache.set(cache_key, response.model_dump())
+            return response
+        
         result = self.repository.get_aggs(
             include_country=request.include_country,
             include_year=request.include_year
         )
         
+        with stage_timer("aggs.transform"):
+            response = self.transform_aggs(result, request)
+        self.cache.set(cache_key, response.model_dump())
+        return response
+    
+    async def get_aggs_async(self, request: AggsRequest) -> AggsResponse:
+        """집계 조회 (비동기)"""
+        logger.info(
+            "[Service] 집계 시작: country=%s, year=%s",
+            request.include_country,
+            request.include_year
+        )
+        
+        cache_key = self.get_cache_key(request)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return AggsResponse(**cached)
+        
+        rollup = await self.load_rollup_async()
+        if rollup is not None:
+            response = self.transform_rollup(rollup, request)
+            self.cache.set(cache_key, response.model_dump())
+            return response
+        
+        result = await self.repository.get_aggs_async(
+            include_country=request.include_country,
+            include_year=request.include_year
+        )
+        
+        with stage_timer("aggs.transform"):
+            response = self.transform_aggs(result, request)
+        self.cache.set(cache_key, response.model_dump())
+        return response
+    
+    def load_rollup(self) -> Optional[DashboardRollup]:
+        """적재 시점 롤업 (비활성화했거나 없으면 None)"""
+        if self.rollups is None:
+            return None
+        with stage_timer("aggs.rollup"):
+            return self.rollups.load()
+    
+    async def load_rollup_async(self) -> Optional[DashboardRollup]:
+        """적재 시점 롤업 (비동기, sqlite 조회는 이벤트 루프를 막지 않도록 스레드에서)"""
+        if self.rollups is None:
+            return None
+        with stage_timer("aggs.rollup"):
+            return await asyncio.to_thread(self.rollups.load)
+    
+    def transform_rollup(self, rollup: DashboardRollup, request: AggsRequest) -> AggsResponse:
+        """
+        롤업 → api 응답 변환
+        
+        - 버킷 순서/개수는 집계 쿼리와 같게 (회사 수 내림차순, 같으면 키 오름차순 / 연도 오름차순)
+        """
+        country_aggs = None
+        if request.include_country:
+            countries = sorted(rollup.countries.items(), key=lambda item: (-item[1]['count'], item[0]))
+            country_aggs = [
+                CountryAggItem(
+                    country=country,
+                    company_count=item['count'],
+                    avg_last_week_stock=round(item['price_sum'] / item['price_count'], 2) if item['price_count'] else 0.0
+                )
+                for country, item in countries[:COUNTRY_AGG_SIZE]
+            ]
+        
+        year_aggs = None
+        if request.include_year:
+            year_aggs = []
+            for year, item in sorted(rollup.years.items(), key=lambda item: int(item[0])):
+                types = sorted(item['types'].items(), key=lambda t: (-t[1], t[0]))
+                year_aggs.append(YearAggItem(
+                    year=int(year),
+                    company_count=item['count'],
+                    company_type_distribution=[
+                        CompanyTypeCount(company_type=company_type, company_count=count)
+                        for company_type, count in types[:COMPANY_TYPE_AGG_SIZE]
+                    ]
+                ))
+        
+        logger.info("[Service] 롤업 집계: total=%s", rollup.total)
+        return AggsResponse(total=rollup.total, country_aggs=country_aggs, year_aggs=year_aggs)
+    
+    def get_cache_key(self, request: AggsRequest) -> str:
+        """집계 캐시 키"""
+        return f"aggs:{int(request.include_country)}:{int(request.include_year)}"
+    
+    def transform_aggs(self, result: dict, request: AggsRequest) -> AggsResponse:
+        """opensearch 집계 응답 → api 응답 변환"""
         total = self.extract_total(result)
         country_aggs = self.get_country_aggs(result, request.include_country)
         year_aggs = self.get_year_aggs(result, request.include_year)
         
-        logger.info(f"[Service] 집계 완료: total={total}")
+        logger.info("[Service] 집계 완료: total=%s", total)
         
         return AggsResponse(
             total=total,
@@ -63,7 +210,7 @@ class AggsService:
             return None
         
         country_aggs = self.transform_country_aggs(result)
-        logger.info(f"[Service] 국가별 집계: {len(country_aggs)}개국")
+        logger.info("[Service] 국가별 집계: %s개국", len(country_aggs))
         return country_aggs
     
     def get_year_aggs(self, result: dict, include: bool) -> Optional[List[YearAggItem]]:
@@ -72,7 +219,7 @@ class AggsService:
             return None
         
         year_aggs = self.transform_year_aggs(result)
-        logger.info(f"[Service] 연도별 집계: {len(year_aggs)}개년")
+        logger.info("[Service] 연도별 집계: %s개년", len(year_aggs))
         return year_aggs
     
     def transform_country_aggs(self, result: dict) -> List[CountryAggItem]:
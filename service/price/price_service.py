@@ -0,0 +1,169 @@
+"""
+주가 틱 반영 Service
+"""
+import asyncio
+import os
+import time
+from typing import List
+
+from dotenv import load_dotenv
+
+from core.logger import get_logger
+from core.metrics import PRICE_TICKS, PRICE_UPDATES, PRICE_PENDING, PRICE_LAG
+from api.schema.price_request import PriceTick
+from repository.price_repository import PriceRepository
+from core.cache import IndexGeneration, get_generation_store
+
+logger = get_logger("search_api.service")
+
+
+# 다음 주기에 다시 보낼 오류 상태 (과부하/일시 장애)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def get_price_options() -> dict:
+    """
+    주가 반영 옵션 (환경 변수)
+    
+    - PRICE_FLUSH_INTERVAL: 반영 주기(초, 기본 0.5)
+    - PRICE_MAX_PENDING: 대기 회사 수가 이만큼 쌓이면 주기 전에 반영 (기본 5000)
+    - PRICE_BULK_SIZE: 벌크 요청당 업데이트 수 (기본 2000)
+    """
+    load_dotenv()
+    return {
+        "flush_interval": float(os.getenv('PRICE_FLUSH_INTERVAL', 0.5)),
+        "max_pending": int(os.getenv('PRICE_MAX_PENDING', 5000)),
+        "bulk_size": int(os.getenv('PRICE_BULK_SIZE', 2000))
+    }
+
+
+class PriceUpdateService:
+    """
+    주가 틱 반영 서비스
+    
+    - 틱은 id별로 병합하여 가장 최근 주가만 보관하고 flush_interval마다 벌크 부분 업데이트
+    - 마지막으로 반영한 주가와 같으면 보내지 않음 (변경 없는 문서의 nested 재색인 방지)
+    - 429/5xx로 실패한 업데이트는 더 새로운 틱이 없으면 다음 주기에 다시 전송
+    - refresh는 요청하지 않음 (index.refresh_interval 주기로 검색에 반영)
+    """
+    
+    def __init__(self):
+        self.repository = PriceRepository()
+        options = get_price_options()
+        self.flush_interval = options['flush_interval']
+        self.max_pending = options['max_pending']
+        self.bulk_size = options['bulk_size']
+        # id → (주가, 틱 발생 시각)
+        self.pending = {}
+        # id → 마지막으로 반영한 주가 (데이터 로드로 인덱스 세대가 바뀌면 비움)
+        self.applied = {}
+        self.generation = IndexGeneration(get_generation_store(), self.applied)
+        self.wakeup = None
+        self.task = None
+    
+    def submit(self, ticks: List[PriceTick]) -> int:
+        """
+        틱 수신 (대기 목록에 병합)
+        
+        :return: 반영 대기 중인 회사 수
+        """
+        now = time.time()
+        for tick in ticks:
+            ts = tick.ts or now
+            current = self.pending.get(tick.id)
+            # 늦게 도착한 이전 틱은 무시
+            if current is not None and current[1] > ts:
+                continue
+            self.pending[tick.id] = (tick.now_stock_price, ts)
+        
+        PRICE_TICKS.inc(len(ticks))
+        PRICE_PENDING.set(len(self.pending))
+        if len(self.pending) >= self.max_pending and self.wakeup is not None:
+            self.wakeup.set()
+        return len(self.pending)
+    
+    async def flush(self) -> int:
+        """
+        대기 중인 주가 반영
+        
+        :return: 반영한 회사 수
+        """
+        if not self.pending:
+            return 0
+        self.generation.current()
+        batch, self.pending = self.pending, {}
+        
+        prices = {}
+        for company_id, (price, _) in batch.items():
+            if self.applied.get(company_id) != price:
+                prices[company_id] = price
+        PRICE_UPDATES.labels('noop').inc(len(batch) - len(prices))
+        
+        applied = retried = failed = 0
+        ids = list(prices)
+        for start in range(0, len(ids), self.bulk_size):
+            chunk = ids[start:start + self.bulk_size]
+            try:
+                results = await self.repository.update_prices_async({i: prices[i] for i in chunk})
+            except Exception as e:
+                logger.warning("[Service] 주가 벌크 업데이트 실패: %s", e)
+                results = [{"status": 503, "error": str(e)}] * len(chunk)
+            
+            now = time.time()
+            for company_id, result in zip(chunk, results):
+                status = result.get('status', 500)
+                if status < 300:
+                    self.applied[company_id] = prices[company_id]
+                    PRICE_LAG.observe(now - batch[company_id][1])
+                    applied += 1
+                elif status in RETRY_STATUSES:
+                    # 그 사이 더 새로운 틱이 들어왔으면 그 틱을 보냄
+                    self.pending.setdefault(company_id, batch[company_id])
+                    retried += 1
+                else:
+                    failed += 1
+                    if failed <= 5:
+                        logger.warning("[Service] 주가 업데이트 실패: id=%s, %s", company_id, result.get('error'))
+        
+        PRICE_UPDATES.labels('applied').inc(applied)
+        PRICE_UPDATES.labels('retried').inc(retried)
+        PRICE_UPDATES.labels('failed').inc(failed)
+        PRICE_PENDING.set(len(self.pending))
+        if retried or failed:
+            logger.info("[Service] 주가 반영: 성공 %s, 재시도 %s, 실패 %s", applied, retried, failed)
+        return applied
+    
+    async def run(self):
+        """flush_interval마다(또는 대기 목록이 가득 차면) 반영, stop() 후 마지막 반영을 마치고 종료"""
+        while self.task is not None:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("[Service] 주가 반영 오류: %s", e)
+    
+    def start(self):
+        """백그라운드 반영 시작 (이벤트 루프 안에서 호출)"""
+        if self.task is None:
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        """백그라운드 반영 중지 (진행 중인 반영을 기다린 뒤 남은 주가를 한 번 더 반영)"""
+        if self.task is not None:
+            task, self.task = self.task, None
+            self.wakeup.set()
+            await task
+        await self.flush()
+    
+    def get_stats(self) -> dict:
+        """대기/반영 현황"""
+        return {
+            "pending": len(self.pending),
+            "applied_companies": len(self.applied),
+            "flush_interval": self.flush_interval
+        }
@@ -1,74 +1,309 @@
 """
 검색 Service
 """
+import json
 import math
-from typing import List
+from typing import List, Optional
 
-from config import logger
+from core.logger import get_logger
+from core.metrics import stage_timer
 from api.schema.search_request import SearchRequest
-from api.schema.search_response import SearchResponse, CompanyData, PipelineInfo
-from repository.search_repository import SearchRepository
+from repository.search_repository import SearchRepository, FACET_FIELDS
+from core.cache import TTLCache, SqliteCache, IndexGeneration, get_cache_ttl, get_cache_size
+
+logger = get_logger("search_api.service")
+
+
+# _source에 값이 없을 때 기본값
+HIT_DEFAULTS = {
+    'id': 0,
+    'company_name': '',
+    'country': '',
+    'company_type': '',
+    'last_week_stock_price': 0.0,
+    'now_stock_price': 0.0
+}
+
+
+def to_float(value) -> Optional[float]:
+    """숫자 → float (int 값도 스키마 검증을 거친 것과 같이 float로 직렬화되도록)"""
+    return None if value is None else float(value)
+
+
+# 스키마 검증 없이 응답을 만들 때 타입 맞춤이 필요한 필드
+HIT_CONVERTERS = {
+    'id': int,
+    'last_week_stock_price': to_float,
+    'now_stock_price': to_float
+}
 
 
 class SearchService:
-    """검색 서비스"""
+    """
+    검색 서비스
+    
+    - 검색 결과는 정규화한 요청을 키로 LRU+TTL 캐시에 보관 (SEARCH_CACHE_TTL, SEARCH_CACHE_MAXSIZE)
+    - 인덱스 세대가 바뀌면 캐시 무효화, 커서 모드는 캐시하지 않음
+    """
     
     def __init__(self):
         self.repository = SearchRepository()
+        self.cache = TTLCache(
+            maxsize=get_cache_size('SEARCH_CACHE_MAXSIZE', 1024),
+            ttl=get_cache_ttl('SEARCH_CACHE_TTL', 30)
+        )
+        self.generation = IndexGeneration(SqliteCache(maxsize=0, ttl=0), self.cache)
     
-    def search(self, request: SearchRequest) -> SearchResponse:
-        """검색 실행 및 응답 변환"""
-        logger.info(f"[Service] 검색 시작: page={request.page}, size={request.size}")
+    def search(self, request: SearchRequest) -> dict:
+        """검색 실행 및 응답 변환 (SearchResponse 구조 dict)"""
+        logger.info("[Service] 검색 시작: page=%s, size=%s", request.page, request.size)
+        
+        cache_key = self.get_cache_key(request)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         # Repository 호출
         result = self.repository.search(request)
         
         # 응답 변환
-        response = self.transform_response(result, request)
-        logger.info(f"[Service] 검색 완료: total={response.total}, data={len(response.data)}건")
+        with stage_timer("search.transform"):
+            response = self.transform_response(result, request)
+        logger.info("[Service] 검색 완료: total=%s, data=%s건", response['total'], len(response['data']))
         
+        if cache_key is not None:
+            self.cache.set(cache_key, response)
         return response
     
-    def transform_response(self, result: dict, request: SearchRequest) -> SearchResponse:
-        """opensearch 응답 → api 응답 변환"""
+    async def search_async(self, request: SearchRequest) -> dict:
+        """검색 실행 및 응답 변환 (비동기)"""
+        logger.info("[Service] 검색 시작: page=%s, size=%s", request.page, request.size)
+        
+        cache_key = self.get_cache_key(request)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Repository 호출
+        result = await self.repository.search_async(request)
+        
+        # 응답 변환
+        with stage_timer("search.transform"):
+            response = self.transform_response(result, request)
+        logger.info("[Service] 검색 완료: total=%s, data=%s건", response['total'], len(response['data']))
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, response)
+        return response
+    
+    def search_batch(self, requests: List[SearchRequest]) -> List[dict]:
+        """여러 검색 실행 (캐시에 없는 요청만 _msearch 한 번으로 조회, SearchBatchItem 구조 dict 목록)"""
+        logger.info("[Service] 배치 검색 시작: %s건", len(requests))
+        items, misses = self.prepare_batch(requests)
+        if misses:
+            results = self.repository.msearch([group[0] for group in misses.values()])
+            self.complete_batch(items, misses, results)
+        return items
+    
+    async def search_batch_async(self, requests: List[SearchRequest]) -> List[dict]:
+        """여러 검색 실행 (비동기)"""
+        logger.info("[Service] 배치 검색 시작: %s건", len(requests))
+        items, misses = self.prepare_batch(requests)
+        if misses:
+            results = await self.repository.msearch_async([group[0] for group in misses.values()])
+            self.complete_batch(items, misses, results)
+        return items
+    
+    def prepare_batch(self, requests: List[SearchRequest]) -> tuple:
+        """
+        배치 항목 준비 (커서 모드는 오류, 캐시 hit은 바로 채움)
+        
+        :return: (항목 목록, 캐시 키 → (요청, 항목 위치 목록)) - 같은 요청은 한 번만 조회
+        """
+        items = [None] * len(requests)
+        misses = {}
+        for i, request in enumerate(requests):
+            if request.is_cursor_mode():
+                items[i] = self.batch_item(400, error="배치 검색은 cursor 모드를 지원하지 않습니다.")
+                continue
+            cache_key = self.get_cache_key(request)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                items[i] = self.batch_item(200, response=cached)
+                continue
+            misses.setdefault(cache_key, (request, []))[1].append(i)
+        return items, misses
+    
+    def complete_batch(self, items: List[dict], misses: dict, results: list):
+        """_msearch 응답으로 남은 항목 채움 (성공한 응답은 캐시)"""
+        for (cache_key, (request, positions)), result in zip(misses.items(), results):
+            if 'error' in result:
+                error = result['error']
+                reason = error.get('reason') or error.get('type') if isinstance(error, dict) else str(error)
+                item = self.batch_item(result.get('status', 500), error=reason)
+            else:
+                with stage_timer("search.transform"):
+                    response = self.transform_response(result, request)
+                self.cache.set(cache_key, response)
+                item = self.batch_item(200, response=response)
+            for i in positions:
+                items[i] = item
+    
+    def batch_item(self, status: int, response: dict = None, error: str = None) -> dict:
+        """SearchBatchItem 구조 dict"""
+        return {"status": status, "response": response, "error": error}
+    
+    def get_cache_key(self, request: SearchRequest) -> Optional[str]:
+        """
+        정규화한 요청 → 캐시 키 (커서 모드면 None)
+        
+        - 필터 목록은 중복 제거 후 정렬
+        - 검색어는 앞뒤/연속 공백 정리 후 소문자 (분석기가 lowercase 처리)
+        - 빈 필터와 필터 없음은 같은 키
+        """
+        if request.is_cursor_mode():
+            return None
+        
+        canonical = {
+            "generation": self.generation.current(),
+            "page": request.page,
+            "size": request.size,
+            "order": [[o.sortBy, o.sortOrder] for o in request.order or []],
+            "fields": request.get_source_fields()
+        }
+        if request.facets:
+            canonical["facets"] = True
+        if request.track_total_hits is not None:
+            canonical["track_total_hits"] = request.track_total_hits
+        
+        f = request.filter
+        if f is not None:
+            for name in ("country", "company_type", "stage"):
+                values = sorted(set(getattr(f, name) or []))
+                if values:
+                    canonical[name] = values
+            if f.search is not None:
+                keyword = " ".join(f.search.keyword.split()).lower()
+                canonical["search"] = [f.search.type, keyword]
+        
+        return json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    
+    def get_cache_stats(self) -> dict:
+        """검색 결과 캐시 통계"""
+        return self.cache.stats()
+    
+    def transform_response(self, result: dict, request: SearchRequest) -> dict:
+        """
+        opensearch 응답 → api 응답 변환
+        
+        - SearchResponse 스키마와 같은 구조(필드 순서 포함)의 dict를 바로 생성
+        - Pydantic 모델 생성/재검증 없이 FastJSONResponse로 직렬화
+        """
         hits = result.get('hits', {})
-        total = hits.get('total', {}).get('value', 0)
+        total_info = hits.get('total', {})
+        total = total_info.get('value', 0)
+        total_relation = total_info.get('relation', 'eq')
+        
+        # 데이터 변환
+        fields = request.get_source_fields()
+        data = [self.transform_hit(hit, fields) for hit in hits.get('hits', [])]
         
         # 페이지 계산
-        total_pages = math.ceil(total / request.size) if total > 0 else 0
+        if total_relation == 'gte':
+            total, total_pages = self.estimate_pages(total, len(data), request)
+        else:
+            total_pages = math.ceil(total / request.size) if total > 0 else 0
         
-        # 데이터 변환
-        data = [self.transform_hit(hit) for hit in hits.get('hits', [])]
-        
-        return SearchResponse(
-            page=request.page,
-            size=request.size,
-            totalPages=total_pages,
-            total=total,
-            data=data
-        )
+        # 커서 모드면 다음 페이지 커서
+        next_cursor = None
+        if request.is_cursor_mode():
+            next_cursor = self.repository.build_next_cursor(result, request)
+        
+        # 패싯은 요청했을 때만 (커서 모드 다음 페이지는 집계하지 않음)
+        facets = None
+        if 'aggregations' in result:
+            facets = self.transform_facets(result['aggregations'])
+        
+        return {
+            "page": request.page,
+            "size": request.size,
+            "totalPages": total_pages,
+            "total": total,
+            "total_relation": total_relation,
+            "data": data,
+            "next_cursor": next_cursor,
+            "facets": facets
+        }
+    
+    def estimate_pages(self, total: int, count: int, request: SearchRequest) -> tuple:
+        """
+        total이 하한값(gte)일 때 (total, totalPages) 하한
+        
+        - track_total_hits보다 뒤 페이지를 보고 있으면 지금까지 본 결과 수로 올림
+        - 현재 페이지가 가득 찼으면 다음 페이지가 있을 수 있으므로 최소 page + 1
+        """
+        total = max(total, (request.page - 1) * request.size + count)
+        total_pages = math.ceil(total / request.size)
+        if count == request.size:
+            total_pages = max(total_pages, request.page + 1)
+        return total, total_pages
+    
+    def transform_facets(self, aggregations: dict) -> dict:
+        """패싯 집계 → {패싯 이름: [FacetBucket 구조]}"""
+        facets = {}
+        for name in FACET_FIELDS:
+            values = aggregations.get(f"facet_{name}", {}).get('values', {})
+            if name == "stage":
+                buckets = values.get('values', {}).get('buckets', [])
+                facets[name] = [
+                    {"value": b['key'], "count": b['companies']['doc_count']} for b in buckets
+                ]
+            else:
+                facets[name] = [
+                    {"value": b['key'], "count": b['doc_count']} for b in values.get('buckets', [])
+                ]
+        return facets
     
-    def transform_hit(self, hit: dict) -> CompanyData:
-        """개별 hit → CompanyData 변환"""
+    def transform_hit(self, hit: dict, fields: Optional[List[str]] = None) -> dict:
+        """
+        개별 hit → CompanyData 구조 dict 변환
+        
+        :param fields: 응답에 포함할 필드 (None이면 전체)
+        """
         source = hit.get('_source', {})
         
-        # 파이프라인 변환
-        pipelines = [
-            PipelineInfo(
-                drug_name=p.get('drug_name', ''),
-                indication=p.get('indication', ''),
-                stage=p.get('stage', '')
-            )
+        if fields is None:
+            return {
+                "id": int(source.get('id', 0)),
+                "company_name": source.get('company_name', ''),
+                "founded_date": source.get('founded_date'),
+                "country": source.get('country', ''),
+                "company_type": source.get('company_type', ''),
+                "last_week_stock_price": to_float(source.get('last_week_stock_price', 0.0)),
+                "now_stock_price": to_float(source.get('now_stock_price', 0.0)),
+                "main_pipeline": self.transform_pipelines(source)
+            }
+        
+        # 선택한 필드만 포함
+        data = {}
+        for name in fields:
+            if name == 'main_pipeline':
+                data[name] = self.transform_pipelines(source)
+            else:
+                value = source.get(name, HIT_DEFAULTS.get(name))
+                converter = HIT_CONVERTERS.get(name)
+                data[name] = converter(value) if converter else value
+        return data
+    
+    def transform_pipelines(self, source: dict) -> List[dict]:
+        """파이프라인 변환 (PipelineInfo 구조)"""
+        return [
+            {
+                "drug_name": p.get('drug_name', ''),
+                "indication": p.get('indication', ''),
+                "stage": p.get('stage', '')
+            }
             for p in source.get('main_pipeline', [])
         ]
-        
-        return CompanyData(
-            id=source.get('id', 0),
-            company_name=source.get('company_name', ''),
-            founded_date=source.get('founded_date'),
-            country=source.get('country', ''),
-            company_type=source.get('company_type', ''),
-            last_week_stock_price=source.get('last_week_stock_price', 0.0),
-            now_stock_price=source.get('now_stock_price', 0.0),
-            main_pipeline=pipelines
-        )
@@ -0,0 +1,64 @@
+"""
+자동완성 Service
+"""
+from typing import List
+
+from core.logger import get_logger
+from api.schema.search_request import SuggestRequest
+from repository.search_repository import SearchRepository
+from core.cache import TTLCache, SqliteCache, IndexGeneration, get_cache_ttl, get_cache_size
+
+logger = get_logger("search_api.service")
+
+
+class SuggestService:
+    """
+    자동완성 서비스
+    
+    - 후보는 (대상, size, 정규화한 접두어)를 키로 작은 TTL 캐시에 보관 (SUGGEST_CACHE_TTL, SUGGEST_CACHE_MAXSIZE)
+    - 인덱스 세대가 바뀌면 캐시 무효화
+    """
+    
+    def __init__(self):
+        self.repository = SearchRepository()
+        self.cache = TTLCache(
+            maxsize=get_cache_size('SUGGEST_CACHE_MAXSIZE', 2048),
+            ttl=get_cache_ttl('SUGGEST_CACHE_TTL', 60)
+        )
+        self.generation = IndexGeneration(SqliteCache(maxsize=0, ttl=0), self.cache)
+    
+    async def suggest_async(self, request: SuggestRequest) -> dict:
+        """자동완성 후보 조회 (SuggestResponse 구조 dict)"""
+        # 앞뒤/연속 공백 정리 후 소문자 (분석기가 lowercase 처리)
+        prefix = " ".join(request.prefix.split()).lower()
+        suggestions = []
+        if prefix:
+            cache_key = f"{self.generation.current()}:{request.type}:{request.size}:{prefix}"
+            suggestions = self.cache.get(cache_key)
+            if suggestions is None:
+                result = await self.repository.suggest_async(request.model_copy(update={"prefix": prefix}))
+                suggestions = self.transform_suggestions(result, request.type)
+                self.cache.set(cache_key, suggestions)
+        
+        return {
+            "type": request.type,
+            "prefix": request.prefix,
+            "suggestions": suggestions
+        }
+    
+    def transform_suggestions(self, result: dict, suggest_type: str) -> List[dict]:
+        """opensearch 응답 → SuggestItem 구조 dict 목록"""
+        if suggest_type == "company_name":
+            suggestions = []
+            for hit in result.get('hits', {}).get('hits', []):
+                values = hit.get('fields', {}).get('company_name.keyword')
+                if values:
+                    suggestions.append({"text": values[0], "id": int(hit['_id']), "count": None})
+            return suggestions
+        
+        buckets = result.get('aggregations', {}).get('suggest', {}).get('matched', {}).get('names', {}).get('buckets', [])
+        return [{"text": b['key'], "id": None, "count": b['doc_count']} for b in buckets]
+    
+    def get_cache_stats(self) -> dict:
+        """자동완성 캐시 통계"""
+        return self.cache.stats()